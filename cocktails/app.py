@@ -1,13 +1,32 @@
+import hmac
+import io
+import math
+from typing import Optional
+
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, jsonify, make_response, Response, request, stream_with_context
+from sqlalchemy.engine import make_url
 from werkzeug.exceptions import BadRequest, Unauthorized
 # from flask_cors import CORS
 
 from config import ProductionConfig
-from cocktail_maker.models.user_model import Users
-from cocktail_maker.db import db
-from cocktail_maker.models.drink_model import Drink
-from cocktail_maker.models.drink_list_model import DrinkListModel
+from cocktail_maker.models.user_model import Users, read_user_records, write_user_records
+from cocktail_maker.cli import register_commands
+from cocktail_maker import instrumentation, migrations
+from cocktail_maker.db import configure_engine, db, engine_options, normalize_database_url
+from cocktail_maker.models.drink_model import (
+    Drink, alcoholic_index, cache_warmer, catalog_stats, drink_fetches, in_memory_data, ingredient_index,
+    name_index, revalidator, stale_served
+)
+from cocktail_maker.models.drink_list_model import DrinkListModel, list_bodies
+from cocktail_maker.utils import http_cache, passwords
+from cocktail_maker.utils.http_cache import SerializedBody
+from cocktail_maker.utils.lazy import LazyModule
+from cocktail_maker.utils.logger import configure as configure_logging
+from cocktail_maker.utils.passwords import PasswordHasherBusy
+from cocktail_maker.utils.rate_limit import ClientRateLimiter
+
+http_client = LazyModule("cocktail_maker.utils.http_client")
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,11 +34,27 @@ load_dotenv()
 def create_app(config_class=ProductionConfig):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    configure_logging(app.config)
 
+    app.config['SQLALCHEMY_DATABASE_URI'] = normalize_database_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     db.init_app(app)  # Initialize db with app
-    print("Database URI:", app.config['SQLALCHEMY_DATABASE_URI'])
+    app.logger.info("Database URI: %s",
+                    make_url(app.config['SQLALCHEMY_DATABASE_URI']).render_as_string(hide_password=True))
     with app.app_context():
-        db.create_all()  # Recreate all tables
+        configure_engine(db.engine, app.config)
+        if app.config.get('DB_MIGRATE_ON_START'):
+            migrations.upgrade(db.engine)
+    register_commands(app)
+    passwords.configure(app.config)
+    if app.config.get('REQUEST_METRICS_ENABLED'):
+        with app.app_context():
+            instrumentation.init_app(app)
+
+    if app.config.get('ALCOHOLIC_INDEX_REFRESH_SECONDS'):
+        alcoholic_index.start(app.config['ALCOHOLIC_INDEX_REFRESH_SECONDS'])
+    if app.config.get('DRINK_WARMER_INTERVAL'):
+        cache_warmer.start(app.config['DRINK_WARMER_INTERVAL'])
 
     ####################################################
     #
@@ -40,7 +75,7 @@ def create_app(config_class=ProductionConfig):
         Returns:
             JSON response indicating the health status of the service.
         """
-        app.logger.info('Health check')
+        app.logger.debug('Health check')
         return make_response(jsonify({'status': 'healthy'}), 200)
 
     ####################################################
@@ -49,6 +84,29 @@ def create_app(config_class=ProductionConfig):
     #
     ####################################################
 
+    def client_limiter() -> Optional[ClientRateLimiter]:
+        """A per-client limiter for the password-hashing routes, unless AUTH_RATE_LIMIT_PER_MINUTE is 0."""
+        per_minute = app.config.get('AUTH_RATE_LIMIT_PER_MINUTE')
+        if not per_minute:
+            return None
+        return ClientRateLimiter(rate=per_minute / 60, capacity=app.config['AUTH_RATE_LIMIT_BURST'])
+
+    # Every attempt hashes a password, so each route has its own budget per client address
+    auth_limiters = {'login': client_limiter(), 'create_account': client_limiter()}
+
+    def rate_limited(route: str) -> Optional[Response]:
+        """
+        Count a request against the client's budget for ``route``; a 429 response if it is exhausted.
+        """
+        limiter = auth_limiters[route]
+        client = request.remote_addr or 'unknown'
+        if limiter is None or limiter.try_acquire(client):
+            return None
+        retry_after = math.ceil(limiter.wait_time(client))
+        app.logger.warning("Rate limited %s from %s", route, client)
+        return make_response(jsonify({"error": "Too many requests, please retry later"}), 429,
+                             {"Retry-After": str(max(1, retry_after))})
+
     # Define routes
     @app.route("/create-account", methods=["POST"])
     def create_account():
@@ -65,10 +123,15 @@ def create_app(config_class=ProductionConfig):
         Response Format:
             201 success if account created successfully.
             400 error if username and password not entered or if username already exists. 
+            429 error if the client made too many attempts; Retry-After says when to retry.
+            503 error if the password hashing pool is saturated.
     
         Returns:
             A JSON response indicating success or failure of the account creation process.
         """
+        limited = rate_limited('create_account')
+        if limited is not None:
+            return limited
         data = request.get_json()
         username = data.get("username")
         password = data.get("password")
@@ -81,6 +144,9 @@ def create_app(config_class=ProductionConfig):
             return jsonify({"message": "Account created successfully"}), 201
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
+        except PasswordHasherBusy as e:
+            app.logger.warning("Rejected account creation: %s", e)
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
 
     @app.route("/login", methods=["POST"])
     def login():
@@ -99,10 +165,15 @@ def create_app(config_class=ProductionConfig):
             400 error if username and password aren't entered.
             401 error for invalid credentials.
             404 error if username not found.
+            429 error if the client made too many attempts; Retry-After says when to retry.
+            503 error if the password hashing pool is saturated.
     
         Returns:
             A JSON response indicating whether the login was successful or why it failed.
         """
+        limited = rate_limited('login')
+        if limited is not None:
+            return limited
         data = request.get_json()
         username = data.get("username")
         password = data.get("password")
@@ -117,6 +188,9 @@ def create_app(config_class=ProductionConfig):
                 return jsonify({"error": "Invalid credentials"}), 401
         except ValueError as e:
             return jsonify({"error": str(e)}), 404
+        except PasswordHasherBusy as e:
+            app.logger.warning("Rejected login: %s", e)
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
 
     @app.route("/update-password", methods=["POST"])
     def update_password():
@@ -134,6 +208,7 @@ def create_app(config_class=ProductionConfig):
             200 success message if password updated successfully.
             400 error if username and/or new password not entered.
             404 error if username not found.
+            503 error if the password hashing pool is saturated.
     
         Returns:
             A JSON response indicating success or failure of the password update process.
@@ -150,6 +225,80 @@ def create_app(config_class=ProductionConfig):
             return jsonify({"message": "Password updated successfully"}), 200
         except ValueError as e:
             return jsonify({"error": str(e)}), 404
+        except PasswordHasherBusy as e:
+            app.logger.warning("Rejected password update: %s", e)
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+
+    # Media types of the bulk user formats
+    bulk_formats = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+    def bulk_access_denied() -> Optional[Response]:
+        """
+        None if the request carries the USER_BULK_TOKEN bearer token; otherwise a 404
+        (bulk endpoints disabled because no token is configured) or 401 response.
+        """
+        token = app.config.get('USER_BULK_TOKEN')
+        if not token:
+            return make_response(jsonify({"error": "Bulk user endpoints are disabled"}), 404)
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+            return make_response(jsonify({"error": "A valid bulk access token is required"}), 401,
+                                 {"WWW-Authenticate": "Bearer"})
+        return None
+
+    @app.route("/users/bulk", methods=["POST"])
+    def bulk_import_users():
+        """
+        Create many users from an NDJSON or CSV body, streamed row by row.
+
+        Records hold ``username`` and either ``password`` or the ``salt`` and
+        ``password_hash`` written by the export. Rows that are malformed or
+        whose username exists are reported and skipped; the rest are imported.
+
+        Request Format:
+            Content-Type application/x-ndjson (one JSON object per line) or
+            text/csv (header row: username,password or username,salt,password_hash),
+            or ?format=ndjson|csv. Authorization: Bearer <USER_BULK_TOKEN>.
+
+        Response Format:
+            200 with the number of users created and the rows that failed.
+            400 error if the format is not supported.
+            401 error without a valid token; 404 if no token is configured.
+
+        Returns:
+            A JSON response summarising the import.
+        """
+        denied = bulk_access_denied()
+        if denied is not None:
+            return denied
+        fmt = request.args.get('format') or {v: k for k, v in bulk_formats.items()}.get(request.mimetype)
+        if fmt not in bulk_formats:
+            return jsonify({"error": f"Send one of {', '.join(bulk_formats.values())} or pass ?format="}), 400
+
+        stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+        result = Users.bulk_create(read_user_records(stream, fmt), batch_size=app.config['USER_BULK_BATCH_SIZE'])
+        return jsonify({"status": "success", **result}), 200
+
+    @app.route("/users/bulk", methods=["GET"])
+    def bulk_export_users():
+        """
+        Stream every user, with salt and password hash, as NDJSON (default) or CSV (?format=csv).
+
+        The output can be imported into another instance with POST /users/bulk.
+
+        Response Format:
+            200 with the records, streamed.
+            400 error if the format is not supported.
+            401 error without a valid token; 404 if no token is configured.
+        """
+        denied = bulk_access_denied()
+        if denied is not None:
+            return denied
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in bulk_formats:
+            return jsonify({"error": f"Unsupported format '{fmt}'"}), 400
+        app.logger.info("Exporting users as %s", fmt)
+        return Response(stream_with_context(write_user_records(Users.export(), fmt)), mimetype=bulk_formats[fmt])
 
 
     ####################################################
@@ -158,14 +307,37 @@ def create_app(config_class=ProductionConfig):
     #
     ####################################################
 
+    def serialized_response(payload: SerializedBody, compress: bool = False,
+                            stale_age: Optional[float] = None) -> Response:
+        """
+        Send a pre-serialized body with its validators, answering a matching
+        If-None-Match (or If-Modified-Since) with 304 and no body.
+        """
+        status, body, headers = http_cache.respond(payload, request.headers, compress=compress, stale_age=stale_age)
+        return Response(body, status=status, headers=headers)
+
+    def drink_response(drink: Drink) -> Response:
+        """Send a drink's cached body; a stale one says so in the body and in Age and Warning headers."""
+        stale_age = drink.stale_age()
+        return serialized_response(drink.serialized(stale_age is not None), stale_age=stale_age)
+
+    def limit_arg(default: int, maximum: int = 100) -> int:
+        """
+        Read the ``limit`` query parameter; 0 if it is not an integer between 1 and ``maximum``.
+        """
+        try:
+            limit = int(request.args.get('limit', default))
+        except ValueError:
+            return 0
+        return limit if 1 <= limit <= maximum else 0
+
     @app.route('/random-drink', methods=['GET'])
     def fetch_random_drink():
         """
-        Fetch a random drink from the CocktailDB API.
+        Fetch a random drink from the CocktailDB API, or a locally known one if the API fails.
         """
         try:
-            random_drink = Drink.get_random_drink()
-            return jsonify({'status': 'success', 'drink': random_drink}), 200
+            return drink_response(Drink.fetch_random())
         except RuntimeError as e:
             app.logger.error("Failed to fetch random drink: %s", e)
             return jsonify({'error': str(e)}), 500
@@ -174,10 +346,13 @@ def create_app(config_class=ProductionConfig):
     def fetch_drink_by_name(drink_name: str):
         """
         Fetch a drink by name from the CocktailDB API.
+
+        Drinks past their TTL are served stale, with ``"stale": true`` and Age and
+        Warning headers, while they are refetched or when the API fails.
         """
         try:
-            drink = Drink.get_drink_by_name(drink_name)
-            return jsonify({'status': 'success', 'drink': drink}), 200
+            # Cached drinks carry their serialized body and ETag
+            return drink_response(Drink.fetch_by_name(drink_name))
         except ValueError as e:
             app.logger.warning("Drink not found: %s", e)
             return jsonify({'error': str(e)}), 404
@@ -185,31 +360,281 @@ def create_app(config_class=ProductionConfig):
             app.logger.error("Failed to fetch drink by name: %s", e)
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/drink/<string:drink_name>/similar', methods=['GET'])
+    def similar_drinks(drink_name: str) -> Response:
+        """
+        List the known drinks with the most similar ingredients.
+
+        Query Parameters:
+            limit (int): Maximum number of drinks, 1 to 100; defaults to 10.
+
+        Response Format:
+            200 with the drinks, their similarity score and the ingredients they share, most similar first.
+            400 error if limit is not an integer between 1 and 100.
+            404 error if the drink is not found.
+            500 error if the drink is not known locally and the API request fails.
+        """
+        limit = limit_arg(10)
+        if not limit:
+            return make_response(jsonify({'error': 'limit must be an integer between 1 and 100.'}), 400)
+
+        try:
+            similar = Drink.find_similar(drink_name, limit)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 404)
+        except RuntimeError as e:
+            app.logger.error("Failed to find drinks similar to '%s': %s", drink_name, e)
+            return make_response(jsonify({'error': str(e)}), 500)
+        return make_response(jsonify({'status': 'success', 'drink': drink_name, 'similar': similar}), 200)
+
     @app.route('/drink/<string:drink_name>/alcoholic', methods=['GET'])
     def check_drink_alcoholic(drink_name: str):
         """
         Check if a drink is alcoholic based on its name.
         """
         try:
-            app.logger.info(f"Checking if drink '{drink_name}' is alcoholic.")
+            app.logger.info("Checking if drink '%s' is alcoholic.", drink_name)
             is_alcoholic = Drink.is_drink_alcoholic(drink_name)
-            app.logger.info(f"Alcoholic status for '{drink_name}': {is_alcoholic}")
+            app.logger.info("Alcoholic status for '%s': %s", drink_name, is_alcoholic)
             return jsonify({'status': 'success', 'is_alcoholic': is_alcoholic}), 200
         except ValueError as e:
-            app.logger.warning(f"Drink not found or invalid data: {e}")
+            app.logger.warning("Drink not found or invalid data: %s", e)
             return jsonify({'error': str(e)}), 404
         except RuntimeError as e:
-            app.logger.error(f"Failed to determine if drink is alcoholic: {e}")
+            app.logger.error("Failed to determine if drink is alcoholic: %s", e)
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/drinks/alcoholic-count', methods=['POST'])
+    def count_alcoholic_drinks() -> Response:
+        """
+        Check a batch of drink names and count how many are alcoholic.
+
+        Request Format:
+            JSON:
+            {
+                "names": ["string", ...]
+            }
+
+        Response Format:
+            200 with the count and the status of every name (null if not found).
+            400 error if names is missing, not a list of strings or longer than ALCOHOLIC_COUNT_MAX_NAMES.
+            500 error if the statuses could not be determined.
+        """
+        data = request.get_json(silent=True) or {}
+        names = data.get('names')
+        if not isinstance(names, list) or not all(isinstance(name, str) and name for name in names):
+            return make_response(jsonify({'error': 'A list of drink names is required.'}), 400)
+        max_names = app.config.get('ALCOHOLIC_COUNT_MAX_NAMES')
+        if max_names and len(names) > max_names:
+            return make_response(jsonify({'error': f'At most {max_names} drink names can be checked at once.'}), 400)
+
+        try:
+            statuses = Drink.get_alcoholic_statuses(names)
+            count = sum(1 for name in names if statuses[name])
+            app.logger.info("Counted %d alcoholic drinks out of %d", count, len(names))
+            return make_response(jsonify({
+                'status': 'success',
+                'count': count,
+                'total': len(names),
+                'statuses': statuses
+            }), 200)
+        except RuntimeError as e:
+            app.logger.error("Failed to count alcoholic drinks: %s", e)
+            return make_response(jsonify({'error': str(e)}), 500)
+
+    @app.route('/drinks/search', methods=['GET'])
+    def search_drinks() -> Response:
+        """
+        Autocomplete and fuzzy-match drink names against the locally known drinks.
+
+        Query Parameters:
+            q (str): A full or partial drink name, possibly misspelled.
+            limit (int): Maximum number of results, 1 to 100; defaults to 10.
+
+        Response Format:
+            200 with the matches, exact first, then prefix matches, then fuzzy matches.
+            400 error if q is missing or limit is not an integer between 1 and 100.
+        """
+        query = request.args.get('q', '').strip()
+        if not query:
+            return make_response(jsonify({'error': 'A search query is required.'}), 400)
+        limit = limit_arg(10)
+        if not limit:
+            return make_response(jsonify({'error': 'limit must be an integer between 1 and 100.'}), 400)
+
+        results = Drink.search_names(query, limit)
+        return make_response(jsonify({'status': 'success', 'query': query, 'results': results}), 200)
+
+    @app.route('/drinks/containing', methods=['GET'])
+    def drinks_containing() -> Response:
+        """
+        List the known drinks that contain all of the given ingredients.
+
+        Query Parameters:
+            ingredients (str): Comma-separated ingredient names.
+
+        Response Format:
+            200 with the matching drink names in alphabetical order.
+            400 error if no ingredients are given.
+        """
+        ingredients = [i.strip() for i in request.args.get('ingredients', '').split(',') if i.strip()]
+        if not ingredients:
+            return make_response(jsonify({'error': 'At least one ingredient is required.'}), 400)
+
+        drinks = Drink.find_by_ingredients(ingredients)
+        return make_response(jsonify({'status': 'success', 'ingredients': ingredients, 'drinks': drinks}), 200)
+
+    @app.route('/drinks/makeable', methods=['POST'])
+    def makeable_drinks() -> Response:
+        """
+        List the known drinks that can be made from a pantry, allowing a few missing ingredients.
+
+        Request Format:
+            JSON:
+            {
+                "pantry": ["string", ...],
+                "max_missing": 0
+            }
+
+        Response Format:
+            200 with the drinks and the ingredients each one is missing, fewest missing first.
+            400 error if the pantry is not a list of strings or max_missing is not a
+            non-negative integer.
+        """
+        data = request.get_json(silent=True) or {}
+        pantry = data.get('pantry')
+        max_missing = data.get('max_missing', 0)
+        if not isinstance(pantry, list) or not all(isinstance(item, str) and item for item in pantry):
+            return make_response(jsonify({'error': 'A list of pantry ingredients is required.'}), 400)
+        if isinstance(max_missing, bool) or not isinstance(max_missing, int) or max_missing < 0:
+            return make_response(jsonify({'error': 'max_missing must be a non-negative integer.'}), 400)
+
+        drinks = Drink.find_makeable(pantry, max_missing)
+        return make_response(jsonify({'status': 'success', 'max_missing': max_missing, 'drinks': drinks}), 200)
+
+    ####################################################
+    #
+    # Catalog statistics
+    #
+    ####################################################
+
+    @app.route('/stats', methods=['GET'])
+    def stats_overview() -> Response:
+        """
+        Count the known drinks by category, alcoholic status and glass.
+
+        Response Format:
+            200 with the counts and the distribution of ingredients per drink.
+        """
+        return make_response(jsonify({'status': 'success', **Drink.catalog_overview()}), 200)
+
+    @app.route('/stats/ingredients', methods=['GET'])
+    def stats_ingredients() -> Response:
+        """
+        List the most used ingredients.
+
+        Query Parameters:
+            limit (int): Maximum number of ingredients, 1 to 100; defaults to 20.
+
+        Response Format:
+            200 with the ingredients and the number of drinks using each, most used first.
+            400 error if limit is not an integer between 1 and 100.
+        """
+        limit = limit_arg(20)
+        if not limit:
+            return make_response(jsonify({'error': 'limit must be an integer between 1 and 100.'}), 400)
+
+        ingredients = Drink.ingredient_frequency(limit)
+        return make_response(jsonify({'status': 'success', 'ingredients': ingredients}), 200)
+
+    @app.route('/stats/ingredient-pairs', methods=['GET'])
+    def stats_ingredient_pairs() -> Response:
+        """
+        List the ingredient pairs used together most often.
+
+        Query Parameters:
+            ingredient (str, optional): Only list the pairs with this ingredient.
+            limit (int): Maximum number of pairs, 1 to 100; defaults to 20.
+
+        Response Format:
+            200 with the pairs and the number of drinks using both, most frequent first.
+            400 error if limit is not an integer between 1 and 100.
+            404 error if no known drink uses the ingredient.
+        """
+        ingredient = request.args.get('ingredient', '').strip() or None
+        limit = limit_arg(20)
+        if not limit:
+            return make_response(jsonify({'error': 'limit must be an integer between 1 and 100.'}), 400)
+
+        try:
+            pairs = Drink.ingredient_pairs(ingredient, limit)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 404)
+        return make_response(jsonify({'status': 'success', 'ingredient': ingredient, 'pairs': pairs}), 200)
+
+    @app.route('/cache-stats', methods=['GET'])
+    def cache_stats() -> Response:
+        """
+        Report hit/miss/eviction counters for the in-memory drink cache, the
+        size and age of the alcoholic index, how many concurrent drink
+        lookups were coalesced into a single upstream request, and what the
+        cache warmer prefetched and refreshed, and the stale drinks served
+        and revalidated.
+
+        Returns:
+            JSON response containing the cache statistics.
+        """
+        return make_response(jsonify({
+            'status': 'success',
+            'drink_cache': in_memory_data.stats(),
+            'alcoholic_index': alcoholic_index.stats(),
+            'drink_fetches': drink_fetches.stats(),
+            'ingredient_index': ingredient_index.stats(),
+            'name_index': name_index.stats(),
+            'catalog_stats': catalog_stats.stats(),
+            'warmer': cache_warmer.stats(),
+            'stale_served': stale_served.snapshot(),
+            'revalidator': revalidator.stats(),
+            'list_bodies': list_bodies.stats()
+        }), 200)
+
+    @app.route('/upstream-stats', methods=['GET'])
+    def upstream_stats() -> Response:
+        """
+        Report the CocktailDB circuit breaker state and per-endpoint latency histograms.
+
+        Returns:
+            JSON response containing the upstream client statistics.
+        """
+        return make_response(jsonify({'status': 'success', 'upstream': http_client.stats()}), 200)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics() -> Response:
+        """
+        Expose request, upstream, cache and database metrics in the Prometheus text format.
+        """
+        return Response(instrumentation.render(), status=200, content_type=instrumentation.CONTENT_TYPE)
+
+    @app.route('/rate-limit-stats', methods=['GET'])
+    def rate_limit_stats() -> Response:
+        """
+        Report the upstream request budget and the per-client limits on the password-hashing routes.
+        """
+        return make_response(jsonify({
+            'status': 'success',
+            'upstream': http_client.throttle.stats() if http_client.throttle is not None else None,
+            'inbound': {route: limiter.stats() if limiter is not None else None
+                        for route, limiter in auth_limiters.items()},
+        }), 200)
+
     @app.route('/init-db', methods=['POST'])
     def init_db():
         """
         Initialize or recreate database tables.
 
-        This route initializes the database tables defined in the SQLAlchemy models.
-        If the tables already exist, they are dropped and recreated to ensure a clean
-        slate. Use this with caution as all existing data will be deleted.
+        This route drops the tables defined in the SQLAlchemy models and
+        recreates them by running every migration, to ensure a clean slate.
+        Use this with caution as all existing data will be deleted.
 
         Returns:
             Response: A JSON response indicating the success or failure of the operation.
@@ -219,10 +644,8 @@ def create_app(config_class=ProductionConfig):
         """
         try:
             with app.app_context():
-                app.logger.info("Dropping all existing tables.")
-                db.drop_all()  # Drop all existing tables
-                app.logger.info("Creating all tables from models.")
-                db.create_all()  # Recreate all tables
+                app.logger.info("Dropping all existing tables and migrating from scratch.")
+                migrations.reset(db.engine, db.metadata)
             app.logger.info("Database initialized successfully.")
             return jsonify({"status": "success", "message": "Database initialized successfully."}), 200
         except Exception as e:
@@ -234,49 +657,87 @@ def create_app(config_class=ProductionConfig):
     # Drink List management
     #
     ####################################################
-    app.drink_list = DrinkListModel()
+    def drink_list_for(username: str) -> DrinkListModel:
+        """Return the persistent drink list of a user; raises ValueError if the user does not exist."""
+        return DrinkListModel(Users.get_id_by_username(username))
 
     @app.route('/create-drink', methods=['POST'])
     def add_drink() -> Response:
+        """
+        Add a drink to a user's drink list.
+
+        Request Format:
+            JSON:
+            {
+                "username": "string",
+                "name": "string"
+            }
+
+        Response Format:
+            201 with the drink if it was added, 200 if it was already in the list.
+            400 error if the drink name or username is missing.
+            404 error if the user or the drink does not exist.
+        """
         app.logger.info('Creating new drink')
         try:
             data = request.get_json()
             drink_name = data.get('name')
+            username = data.get('username')
 
             if not drink_name:
                 return make_response(jsonify({'error': 'Drink name is required.'}), 400)
+            if not username:
+                return make_response(jsonify({'error': 'Username is required.'}), 400)
 
-            add_response = app.drink_list.add_drink(drink_name)
+            try:
+                drink_list = drink_list_for(username)
+            except ValueError as e:
+                return make_response(jsonify({'error': str(e)}), 404)
 
-            if "not found" in add_response:
+            drink = drink_list.fetch_drink_by_name(drink_name)
+            if drink is None:
                 return make_response(jsonify({'error': 'Drink not found in the external API.'}), 404)
 
-            # Get the drink from the list
-            drink = next((d for d in app.drink_list.drinks if d.name.lower() == drink_name.lower()), None)
-            if not drink:
-                raise RuntimeError("Failed to add drink due to an unexpected error.")
-
+            if not drink_list.add(drink):
+                return make_response(jsonify({'status': 'Drink already in list', 'drink': drink.to_dict()}), 200)
             return make_response(jsonify({'status': 'Drink added', 'drink': drink.to_dict()}), 201)
 
         except Exception as e:
-            app.logger.error(f"Failed to add drink: {str(e)}")
+            app.logger.error("Failed to add drink: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
         
     @app.route('/remove-drink', methods=['POST'])
     def remove_drink() -> Response:
-        """Remove a drink from the drink list."""
+        """
+        Remove a drink from a user's drink list.
+
+        Request Format:
+            JSON:
+            {
+                "username": "string",
+                "name": "string"
+            }
+        """
         app.logger.info('Removing drink')
         try:
             data = request.get_json()
             drink_name = data.get('name')
+            username = data.get('username')
 
             # Check for missing drink name
             if not drink_name:
                 return make_response(jsonify({'error': 'Drink name is required.'}), 400)
+            if not username:
+                return make_response(jsonify({'error': 'Username is required.'}), 400)
+
+            try:
+                drink_list = drink_list_for(username)
+            except ValueError as e:
+                return make_response(jsonify({'error': str(e)}), 404)
 
             # Attempt to remove the drink
-            result = app.drink_list.remove_drink(drink_name)
+            result = drink_list.remove_drink(drink_name)
 
             # Handle 'not found' case
             if "not found" in result.lower():
@@ -285,22 +746,30 @@ def create_app(config_class=ProductionConfig):
             return make_response(jsonify({'status': 'Drink removed', 'id': drink_name}), 200)
 
         except Exception as e:
-            app.logger.error(f"Failed to remove drink: {str(e)}")
+            app.logger.error("Failed to remove drink: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
-
-
-
-        
     @app.route('/list-drinks', methods=['GET'])
     def list_drinks() -> Response:
+        """
+        List the drinks in a user's drink list in alphabetical order.
+
+        Query Parameters:
+            username (str): The owner of the list.
+        """
         app.logger.info('Listing all drinks in alphabetical order')
+        username = request.args.get('username')
+        if not username:
+            return make_response(jsonify({'error': 'Username is required.'}), 400)
+
         try:
-            drinks_json = DrinkListModel.list_drinks_in_alphabetical_order()
-            return jsonify(drinks_json)
-        
+            # Large lists are sent gzip/brotli-compressed from a precompressed cache
+            return serialized_response(drink_list_for(username).serialized_list(), compress=True)
+
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 404)
         except Exception as e:
-            app.logger.error(f"Failed to list drinks: {str(e)}")
+            app.logger.error("Failed to list drinks: %s", e)
             return make_response(jsonify({'error': 'Failed to retrieve drinks'}), 500)
     
     return app
@@ -308,4 +777,6 @@ def create_app(config_class=ProductionConfig):
 
 if __name__ == '__main__':
     app = create_app()
+    with app.app_context():
+        migrations.upgrade(db.engine)  # the single development process migrates its own database
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""ASGI serving mode.
+
+The drink lookup routes, which spend nearly all of their time waiting on the
+CocktailDB API, are served by coroutines that await the upstream without
+tying up a worker thread. Every other route is handed to the regular Flask
+app through a WSGI adapter, so both modes share models, caches and config.
+
+Run with:
+    uvicorn asgi:create_asgi_app --factory --host 0.0.0.0 --port 5000
+"""
+import logging
+import re
+import time
+from typing import Optional
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+from config import ProductionConfig
+from cocktail_maker import instrumentation
+from cocktail_maker.models.drink_model import Drink
+from cocktail_maker.utils import async_http_client, http_cache
+from cocktail_maker.utils.http_cache import SerializedBody
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class AsyncDrinkApp:
+    """
+    ASGI application serving the drink lookup routes asynchronously.
+
+    Requests it does not handle itself are delegated to the wrapped Flask app.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+        # (path pattern, handler, the Flask rule it stands in for, used as the metrics route label)
+        self.routes = [
+            (re.compile(r"^/random-drink$"), self.random_drink, "/random-drink"),
+            (re.compile(r"^/drink/([^/]+)$"), self.drink_by_name, "/drink/<string:drink_name>"),
+            (re.compile(r"^/drink/([^/]+)/alcoholic$"), self.drink_alcoholic, "/drink/<string:drink_name>/alcoholic"),
+        ]
+        self.metrics_enabled = flask_app.config.get("REQUEST_METRICS_ENABLED")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, handler, rule in self.routes:
+                match = pattern.match(scope["path"])
+                if match:
+                    if not self.metrics_enabled:
+                        await self.handle(handler, match, scope, send)
+                        return
+                    start = time.perf_counter()
+                    instrumentation.requests_in_flight.inc()
+                    status = 500
+                    try:
+                        status = await self.handle(handler, match, scope, send)
+                    finally:
+                        instrumentation.requests_in_flight.dec()
+                        instrumentation.observe_request(rule, "GET", status, time.perf_counter() - start)
+                    return
+
+        await self.wsgi_app(scope, receive, send)
+
+    async def handle(self, handler, match, scope, send) -> int:
+        """Run a drink route handler and send its response; returns the status sent."""
+        with self.flask_app.app_context():
+            status, body = await handler(*match.groups())
+        if isinstance(body, Drink):
+            # Drinks carry their serialized body and ETag
+            stale_age = body.stale_age()
+            return await self.send_serialized(send, scope, body.serialized(stale_age is not None), stale_age)
+        await self.send_json(send, status, body)
+        return status
+
+    async def lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_http_client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def send_json(self, send, status: int, body: dict) -> None:
+        payload = self.flask_app.json.dumps(body, separators=(",", ":")).encode() + b"\n"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def send_serialized(self, send, scope, payload: SerializedBody, stale_age: Optional[float] = None) -> int:
+        """Send a pre-serialized body, answering conditional requests with 304; returns the status sent."""
+        request_headers = {name.decode("latin-1").lower(): value.decode("latin-1")
+                           for name, value in scope.get("headers", [])}
+        status, body, headers = http_cache.respond(payload, request_headers, stale_age=stale_age)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+        return status
+
+    ####################################################
+    #
+    # Drinks
+    #
+    ####################################################
+
+    async def random_drink(self):
+        try:
+            return 200, await Drink.fetch_random_async()
+        except RuntimeError as e:
+            logger.error("Failed to fetch random drink: %s", e)
+            return 500, {'error': str(e)}
+
+    async def drink_by_name(self, drink_name: str):
+        try:
+            return 200, await Drink.fetch_by_name_async(drink_name)
+        except ValueError as e:
+            logger.warning("Drink not found: %s", e)
+            return 404, {'error': str(e)}
+        except RuntimeError as e:
+            logger.error("Failed to fetch drink by name: %s", e)
+            return 500, {'error': str(e)}
+
+    async def drink_alcoholic(self, drink_name: str):
+        try:
+            is_alcoholic = await Drink.is_drink_alcoholic_async(drink_name)
+            return 200, {'status': 'success', 'is_alcoholic': is_alcoholic}
+        except ValueError as e:
+            logger.warning("Drink not found or invalid data: %s", e)
+            return 404, {'error': str(e)}
+        except RuntimeError as e:
+            logger.error("Failed to determine if drink is alcoholic: %s", e)
+            return 500, {'error': str(e)}
+
+
+def create_asgi_app(config_class=ProductionConfig) -> AsyncDrinkApp:
+    return AsyncDrinkApp(create_app(config_class))
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(create_asgi_app(), host='0.0.0.0', port=5000)
@@ -0,0 +1,17 @@
+"""Performance benchmarks for the Cocktail Maker service.
+
+Run from the ``cocktails`` directory:
+
+    python -m benchmarks --output-dir results/   # every suite, one JSON report each
+    python -m benchmarks.bench_micro             # in-process hot paths
+    python -m benchmarks.bench_drink_memory      # memory per cached drink, parse throughput
+    python -m benchmarks.bench_load              # every route, end to end
+    python -m benchmarks.bench_passwords         # password hashing cost settings
+    python -m benchmarks.load_async_vs_sync      # sync Flask vs the ASGI mode
+    python -m benchmarks.stub_upstream           # the stub CocktailDB API on its own
+
+Load benchmarks run against ``benchmarks.stub_upstream``, a local stand-in
+for the CocktailDB API that serves recorded responses with configurable
+latency and error rates. Every benchmark prints a JSON report (see
+``benchmarks.report``) that can be kept per release to track regressions.
+"""
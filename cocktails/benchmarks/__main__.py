@@ -0,0 +1,51 @@
+"""Run every benchmark suite with quick settings and write one JSON report per suite.
+
+Usage:
+    python -m benchmarks [--output-dir benchmark-results] [--only micro,load]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.report import ROOT
+
+SUITES = {
+    "micro": ["benchmarks.bench_micro", "--rounds", "3"],
+    "drink_memory": ["benchmarks.bench_drink_memory", "--rounds", "3"],
+    "load": ["benchmarks.bench_load", "--requests", "200"],
+    "passwords": ["benchmarks.bench_passwords", "--seconds", "1"],
+    "user_queries": ["benchmarks.bench_user_queries", "--repeat", "50"],
+    "user_import": ["benchmarks.bench_user_import", "--users", "200"],
+    "db_concurrency": ["benchmarks.bench_db_concurrency", "--seconds", "2"],
+    "startup": ["benchmarks.bench_startup", "--rounds", "3"],
+    "outage": ["benchmarks.bench_outage", "--requests", "200"],
+    "load_async_vs_sync": ["benchmarks.load_async_vs_sync", "--requests", "1000", "--concurrency", "50"],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default="benchmark-results")
+    parser.add_argument("--only", help=f"Comma-separated suites: {', '.join(SUITES)}.")
+    args = parser.parse_args()
+    only = set(args.only.split(",")) if args.only else set(SUITES)
+
+    output_dir = Path(args.output_dir).resolve()
+    failed = []
+    for name, command in SUITES.items():
+        if name not in only:
+            continue
+        output = output_dir / f"{name}.json"
+        print(f"Running {name} -> {output}", file=sys.stderr)
+        # Each suite runs in its own interpreter so module-level state does not leak between them
+        result = subprocess.run([sys.executable, "-m", *command, "--output", str(output)],
+                                cwd=ROOT, stdout=subprocess.DEVNULL)
+        if result.returncode != 0:
+            failed.append(name)
+    if failed:
+        sys.exit(f"Failed suites: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
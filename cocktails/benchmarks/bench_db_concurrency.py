@@ -0,0 +1,140 @@
+"""Database throughput with several worker processes sharing one database.
+
+Each worker process builds the app like a gunicorn worker would and runs a
+mix of single-row writes (an INSERT into users, one transaction each) and
+indexed reads (a user's credentials by username) for a fixed time. SQLite is
+measured with its defaults (rollback journal, synchronous=FULL) and with the
+production pragmas (WAL, synchronous=NORMAL, mmap); --database-url measures
+another database (e.g. Postgres) with the production settings instead.
+
+Usage:
+    python -m benchmarks.bench_db_concurrency [--workers 4] [--seconds 3] [--write-ratio 0.2]
+                                              [--database-url postgresql://...]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional
+
+from benchmarks import report
+
+SEED_USERS = 1000
+
+# Config overrides per mode; None drops the pragma so SQLite's default applies
+MODES = {
+    "sqlite_default": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_MMAP_SIZE": None},
+    "sqlite_tuned": {},
+}
+
+
+def _app(database_url: str, overrides: dict):
+    from app import create_app
+    from config import ProductionConfig
+
+    attributes = dict(overrides, SQLALCHEMY_DATABASE_URI=database_url, ALCOHOLIC_INDEX_REFRESH_SECONDS=0,
+                      DRINK_WARMER_INTERVAL=0, REQUEST_METRICS_ENABLED=False, LOG_LEVEL="WARNING")
+    with redirect_stdout(sys.stderr):  # keep stdout for the JSON report
+        return create_app(type("BenchConfig", (ProductionConfig,), attributes))
+
+
+def _worker(database_url: str, overrides: dict, seconds: float, write_ratio: float, worker: int,
+            results: "multiprocessing.Queue") -> None:
+    from sqlalchemy import insert, select
+    from sqlalchemy.exc import OperationalError
+    from cocktail_maker.db import db
+    from cocktail_maker.models.user_model import Users
+
+    app = _app(database_url, overrides)
+    rng = random.Random(worker)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    latencies: List[float] = []
+    with app.app_context():
+        deadline = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if rng.random() < write_ratio:
+                    db.session.execute(insert(Users), [
+                        {"username": f"w{worker}-{os.getpid()}-{i}", "salt": "00" * 16, "password": "x"}])
+                    db.session.commit()
+                    counts["writes"] += 1
+                else:
+                    db.session.execute(select(Users.id, Users.salt, Users.password)
+                                       .where(Users.username == f"seed{rng.randrange(SEED_USERS)}")).first()
+                    db.session.commit()  # end the read transaction, as the end of a request would
+                    counts["reads"] += 1
+            except OperationalError:  # e.g. "database is locked" once busy_timeout runs out
+                db.session.rollback()
+                counts["errors"] += 1
+            latencies.append(time.perf_counter() - start)
+            i += 1
+    latencies.sort()
+    counts["p99_ms"] = 1000 * latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+    results.put(counts)
+
+
+def run_mode(database_url: str, overrides: dict, workers: int, seconds: float, write_ratio: float) -> dict:
+    from sqlalchemy import insert
+    from cocktail_maker.db import db
+    from cocktail_maker.models.user_model import Users
+
+    app = _app(database_url, overrides)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(Users), [
+            {"username": f"seed{i}", "salt": "00" * 16, "password": "x"} for i in range(SEED_USERS)])
+        db.session.commit()
+        db.engine.dispose()  # no inherited connections in the workers
+
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_worker, args=(database_url, overrides, seconds, write_ratio,
+                                                               worker, results)) for worker in range(workers)]
+    for process in processes:
+        process.start()
+    per_worker = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "reads_per_sec": round(sum(counts["reads"] for counts in per_worker) / seconds, 1),
+        "writes_per_sec": round(sum(counts["writes"] for counts in per_worker) / seconds, 1),
+        "errors": sum(counts["errors"] for counts in per_worker),
+        "worst_worker_p99_ms": round(max(counts["p99_ms"] for counts in per_worker), 2),
+    }
+
+
+def run(workers: int, seconds: float, write_ratio: float, database_url: Optional[str]) -> Dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if database_url:
+            modes = {"configured": (database_url, {})}
+        else:
+            modes = {name: (f"sqlite:///{tmp}/{name}.db", overrides) for name, overrides in MODES.items()}
+        for name, (url, overrides) in modes.items():
+            results[name] = run_mode(url, overrides, workers, seconds, write_ratio)
+            print(f"{name:<16} {results[name]['reads_per_sec']:>9.1f} reads/s {results[name]['writes_per_sec']:>8.1f} "
+                  f"writes/s {results[name]['errors']:>4} errors p99 {results[name]['worst_worker_p99_ms']:.2f} ms",
+                  file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes.")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Run time per mode.")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of operations that write.")
+    parser.add_argument("--database-url", help="Measure this database instead of the two SQLite modes.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("db_concurrency", run(args.workers, args.seconds, args.write_ratio, args.database_url),
+                args.output, workers=args.workers, seconds=args.seconds, write_ratio=args.write_ratio)
+
+
+if __name__ == "__main__":
+    main()
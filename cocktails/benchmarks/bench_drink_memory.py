@@ -0,0 +1,81 @@
+"""Memory per cached drink and parse throughput of the drink model.
+
+Each drink is parsed from its own freshly decoded JSON document, as it would
+be from an upstream response, and kept in a TTLCache; tracemalloc reports
+what the cache retains once the raw documents are gone. The same drinks cached
+in their ``to_dict()`` wire shape are measured alongside for comparison.
+
+Usage:
+    python -m benchmarks.bench_drink_memory [--drinks 2000] [--rounds 5]
+"""
+import argparse
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks import report
+from benchmarks.stub_upstream import build_catalog
+
+
+def retained_bytes(documents: List[str], build: Callable[[dict], object]) -> float:
+    """Bytes per drink retained by a cache filled with ``build(json.loads(document))``."""
+    from cocktail_maker.utils.cache import TTLCache
+
+    cache = TTLCache(maxsize=len(documents), ttl=3600)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i, document in enumerate(documents):
+            cache.set(str(i), build(json.loads(document)))
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return retained / len(documents)
+
+
+def throughput(fn: Callable[[], object], items: int, rounds: int) -> dict:
+    """Time ``fn``, which handles ``items`` drinks per call, and keep the fastest round."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=rounds, number=number)) / number
+    return {"ns_per_drink": round(best / items * 1e9, 1), "drinks_per_sec": round(items / best, 1)}
+
+
+def run(drinks: int, rounds: int) -> dict:
+    from cocktail_maker.models.drink_model import Drink
+
+    records = build_catalog(drinks, seed=1)
+    documents = [json.dumps(record) for record in records]
+    parsed = [Drink.from_api(record) for record in records]
+
+    results = {
+        "bytes_per_cached_drink": {
+            "drink": round(retained_bytes(documents, Drink.from_api), 1),
+            "dict": round(retained_bytes(documents, lambda record: Drink.from_api(record).to_dict()), 1),
+        },
+        "parse": throughput(lambda: [Drink.from_api(record) for record in records], drinks, rounds),
+        "to_dict": throughput(lambda: [drink.to_dict() for drink in parsed], drinks, rounds),
+    }
+    print(f"{'bytes/drink (Drink)':<24} {results['bytes_per_cached_drink']['drink']:>10,.1f}", file=sys.stderr)
+    print(f"{'bytes/drink (dict)':<24} {results['bytes_per_cached_drink']['dict']:>10,.1f}", file=sys.stderr)
+    print(f"{'parse':<24} {results['parse']['ns_per_drink']:>10,.1f} ns/drink", file=sys.stderr)
+    print(f"{'to_dict':<24} {results['to_dict']['ns_per_drink']:>10,.1f} ns/drink", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drinks", type=int, default=2000, help="Catalog size to parse and cache.")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds; the best one is kept.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("drink_memory", run(args.drinks, args.rounds), args.output, drinks=args.drinks, rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    main()
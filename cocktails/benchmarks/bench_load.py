@@ -0,0 +1,100 @@
+"""End-to-end load scenarios for every route of the service.
+
+The service runs as a subprocess (threaded Flask, or uvicorn with --server
+asgi) against a local stub upstream. Scenarios run in order because later
+ones reuse the accounts and drink lists created by earlier ones.
+
+Usage:
+    python -m benchmarks.bench_load [--requests 200] [--concurrency 20] [--latency 0.02]
+                                    [--error-rate 0] [--server sync] [--warmer-interval 0]
+                                    [--only health,login]
+"""
+import argparse
+import sys
+from typing import Callable, List, NamedTuple
+
+from benchmarks import harness, report
+from benchmarks.harness import RequestFactory
+from benchmarks.stub_upstream import StubUpstream
+
+PASSWORD = "bench-password"
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Builds the request factory from the recorded drink names and the number of accounts
+    build: Callable[[List[str], int], RequestFactory]
+
+
+def _names(names: List[str]) -> Callable[[int], str]:
+    return lambda i: names[i % len(names)]
+
+
+SCENARIOS = [
+    Scenario("health", lambda names, users: lambda i: ("GET", "/health", None)),
+    Scenario("random_drink", lambda names, users: lambda i: ("GET", "/random-drink", None)),
+    Scenario("drink_by_name_hot", lambda names, users: lambda i: ("GET", f"/drink/{_names(names)(i)}", None)),
+    Scenario("drink_by_name_cold", lambda names, users: lambda i: ("GET", f"/drink/Cold Drink {i}", None)),
+    Scenario("drink_alcoholic", lambda names, users: lambda i: ("GET", f"/drink/{_names(names)(i)}/alcoholic", None)),
+    Scenario("alcoholic_count", lambda names, users: lambda i: ("POST", "/drinks/alcoholic-count", {"names": names})),
+    Scenario("create_account", lambda names, users: lambda i: (
+        "POST", "/create-account", {"username": f"bench{i}", "password": PASSWORD})),
+    Scenario("login", lambda names, users: lambda i: (
+        "POST", "/login", {"username": f"bench{i % users}", "password": PASSWORD})),
+    Scenario("update_password", lambda names, users: lambda i: (
+        "POST", "/update-password", {"username": f"bench{i % users}", "new_password": PASSWORD})),
+    Scenario("create_drink", lambda names, users: lambda i: (
+        "POST", "/create-drink", {"username": f"bench{i % users}", "name": _names(names)(i // users)})),
+    Scenario("list_drinks", lambda names, users: lambda i: ("GET", f"/list-drinks?username=bench{i % users}", None)),
+    Scenario("remove_drink", lambda names, users: lambda i: (
+        "POST", "/remove-drink", {"username": f"bench{i % users}", "name": _names(names)(i // users)})),
+    Scenario("cache_stats", lambda names, users: lambda i: ("GET", "/cache-stats", None)),
+    Scenario("upstream_stats", lambda names, users: lambda i: ("GET", "/upstream-stats", None)),
+]
+
+
+def run(args: argparse.Namespace) -> dict:
+    only = set(args.only.split(",")) if args.only else None
+    results = {}
+    with StubUpstream(latency=args.latency, error_rate=args.error_rate, catalog_size=args.catalog_size) as stub:
+        names = [drink["strDrink"] for drink in stub.drinks]
+        # Accounts made by create_account; later scenarios spread over them
+        users = max(1, min(args.requests, args.users))
+        env = {"DRINK_WARMER_INTERVAL": str(args.warmer_interval)}
+        with harness.running_server(args.server, args.port, stub.base_url, env) as base_url:
+            for scenario in SCENARIOS:
+                if only and scenario.name not in only:
+                    continue
+                total = users if scenario.name == "create_account" else args.requests
+                results[scenario.name] = harness.drive(
+                    base_url, scenario.build(names, users), total, args.concurrency
+                )
+                print(f"{scenario.name:<20} {results[scenario.name]['requests_per_sec']:8.1f} req/s "
+                      f"p99 {results[scenario.name]['latency_ms']['p99']:8.1f} ms "
+                      f"{results[scenario.name]['statuses']}", file=sys.stderr)
+        results["upstream_requests"] = stub.stats()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=20, help="Accounts created and used by the user scenarios.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub upstream delay in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of upstream requests that fail.")
+    parser.add_argument("--catalog-size", type=int, default=0, help="Pad the recorded drinks to this many.")
+    parser.add_argument("--server", choices=sorted(harness.SERVERS), default="sync")
+    parser.add_argument("--port", type=int, default=5060)
+    parser.add_argument("--warmer-interval", type=float, default=0,
+                        help="Run the cache warmer with this refresh interval in seconds; 0 disables it.")
+    parser.add_argument("--only", help=f"Comma-separated scenarios: {', '.join(s.name for s in SCENARIOS)}.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("load", run(args), args.output, requests=args.requests, concurrency=args.concurrency,
+                users=args.users, upstream_latency_s=args.latency, error_rate=args.error_rate,
+                catalog_size=args.catalog_size, server=args.server, warmer_interval=args.warmer_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""Microbenchmarks for the service's in-process hot paths.
+
+Covers drink parsing and serialization, the drink cache, drink list
+operations against an in-memory database, rate limiting, request metrics,
+logging and password hashing. Nothing here
+leaves the machine; the one case that needs upstream data reads it from a
+local stub. Each case reports the best of several timed rounds.
+
+Usage:
+    python -m benchmarks.bench_micro [--rounds 5] [--only parse_drink,to_dict]
+"""
+import argparse
+import itertools
+import json
+import sys
+import timeit
+from contextlib import ExitStack, redirect_stdout
+from typing import Callable, Dict
+
+from benchmarks import report
+from benchmarks.stub_upstream import StubUpstream, build_catalog, load_recorded
+
+SALT = "00112233445566778899aabbccddeeff"
+
+
+def _app_context(stack: ExitStack, metrics: bool = True):
+    """Push an app context on a fresh in-memory database."""
+    from app import create_app
+    from config import TestConfig
+
+    config = type("BenchConfig", (TestConfig,), {"REQUEST_METRICS_ENABLED": metrics})
+    with redirect_stdout(sys.stderr):  # keep stdout for the JSON report
+        app = create_app(config)
+    stack.enter_context(app.app_context())
+    return app
+
+
+def _user_drink_list(stack: ExitStack, size: int):
+    """A DrinkListModel for a new user, pre-filled with ``size`` drinks."""
+    from cocktail_maker.db import db
+    from cocktail_maker.models.drink_list_model import DrinkListModel
+    from cocktail_maker.models.drink_model import Drink
+    from cocktail_maker.models.user_model import Users
+
+    _app_context(stack)
+    db.session.add(Users(username="bench", salt=SALT, password="x"))
+    db.session.commit()
+    drink_list = DrinkListModel(Users.get_id_by_username("bench"))
+    for record in build_catalog(size)[:size]:
+        drink_list.add(Drink.from_api(record))
+    return drink_list
+
+
+def case_parse_drink(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink
+
+    record = load_recorded()[0]
+    return lambda: Drink.from_api(record)
+
+
+def case_to_dict(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink
+
+    drink = Drink.from_api(load_recorded()[0])
+    return drink.to_dict
+
+
+def case_drink_json(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink
+
+    drink = Drink.from_api(load_recorded()[0])
+    return lambda: json.dumps({"status": "success", "drink": drink.to_dict()})
+
+
+def case_drink_response_cached(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink
+    from cocktail_maker.utils import http_cache
+
+    drink = Drink.from_api(load_recorded()[0])
+    return lambda: http_cache.respond(drink.serialized(), {})
+
+
+def case_drink_response_304(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink
+    from cocktail_maker.utils import http_cache
+
+    drink = Drink.from_api(load_recorded()[0])
+    headers = {"if-none-match": drink.serialized().etag}
+    return lambda: http_cache.respond(drink.serialized(), headers)
+
+
+def case_list_body_gzip_cached(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.utils import http_cache
+
+    cache = http_cache.BodyCache()
+    names = [record["strDrink"] for record in build_catalog(500)]
+    headers = {"accept-encoding": "gzip"}
+    return lambda: http_cache.respond(cache.get(1, list(names)), headers, compress=True)
+
+
+def _ingredient_index(size: int, vocabulary: int = 500):
+    """An index over ``size`` random drinks, with ingredient popularity skewed like the real catalog."""
+    import random
+
+    from cocktail_maker.utils.ingredient_index import IngredientIndex
+
+    rng = random.Random(1)
+    pool = [f"Ingredient {i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    index = IngredientIndex()
+    for drink_id in range(size):
+        index.add(drink_id, f"Drink {drink_id}", set(rng.choices(pool, weights, k=rng.randint(2, 7))))
+    return index
+
+
+def case_ingredients_containing_5000(stack: ExitStack) -> Callable[[], object]:
+    index = _ingredient_index(5000)
+    return lambda: index.containing_all(["Ingredient 0", "Ingredient 3"])
+
+
+def case_ingredients_makeable_5000(stack: ExitStack) -> Callable[[], object]:
+    index = _ingredient_index(5000)
+    pantry = [f"Ingredient {i}" for i in range(0, 60, 3)]
+    return lambda: index.makeable(pantry, max_missing=1)
+
+
+def _catalog_stats(size: int, vocabulary: int = 500):
+    """Statistics over ``size`` random drinks with the same skewed ingredients as ``_ingredient_index``."""
+    import random
+
+    from cocktail_maker.models.drink_model import Drink
+    from cocktail_maker.utils.catalog_stats import CatalogStats
+
+    rng = random.Random(1)
+    pool = [f"Ingredient {i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    glasses = [f"Glass {i}" for i in range(40)]
+    stats = CatalogStats(categories=Drink.VALID_CATEGORIES)
+    for drink_id in range(size):
+        stats.add(drink_id, f"Drink {drink_id}", rng.choice(Drink.VALID_CATEGORIES),
+                  rng.choice(["Alcoholic", "Non alcoholic"]), rng.choice(glasses),
+                  set(rng.choices(pool, weights, k=rng.randint(2, 7))))
+    return stats
+
+
+def case_catalog_stats_rebuild_5000(stack: ExitStack) -> Callable[[], object]:
+    stats = _catalog_stats(5000)
+
+    glasses = itertools.cycle(["Glass 0", "Glass 1"])
+
+    def rebuild():
+        # Changing one drink invalidates the memoized results, so every call rebuilds the columns
+        stats.add(0, "Drink 0", "Cocktail", "Alcoholic", next(glasses), ["Ingredient 0", "Ingredient 1"])
+        return stats.overview(), stats.ingredient_frequency(20), stats.co_occurrence(limit=20)
+    return rebuild
+
+
+def case_catalog_stats_memoized(stack: ExitStack) -> Callable[[], object]:
+    stats = _catalog_stats(5000)
+    stats.overview()
+    return stats.overview
+
+
+def case_similar_drinks_5000(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.utils.catalog_stats import _similar
+
+    stats = _catalog_stats(5000)
+    stats.similar(0)  # build the columns and the TF-IDF matrix outside the timing
+    columns = stats._columns
+    drink_ids = itertools.cycle(range(5000))
+    # The unmemoized query: one sparse product and an argpartition
+    return lambda: _similar(columns, next(drink_ids), 10)
+
+
+def case_similar_precompute_5000(stack: ExitStack) -> Callable[[], object]:
+    stats = _catalog_stats(5000)
+    return lambda: stats.precompute_similar(10)
+
+
+def _name_index(size: int):
+    from cocktail_maker.utils.name_index import NameIndex
+
+    index = NameIndex()
+    for record in build_catalog(size, seed=1):
+        index.add(record["strDrink"])
+    return index
+
+
+def case_name_search_prefix_5000(stack: ExitStack) -> Callable[[], object]:
+    index = _name_index(5000)
+    return lambda: index.search("marg", limit=10)
+
+
+def case_name_search_fuzzy_5000(stack: ExitStack) -> Callable[[], object]:
+    index = _name_index(5000)
+    return lambda: index.search("old fashoned", limit=10)
+
+
+def case_normalize_key(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.utils.cache import normalize_key
+
+    return lambda: normalize_key("  Aloha  Fruit PUNCH ")
+
+
+def case_cache_hit(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.utils.cache import TTLCache
+
+    cache = TTLCache(maxsize=1024, ttl=3600)
+    cache.set("margarita", {"name": "Margarita"})
+    return lambda: cache.get("margarita")
+
+
+def case_alcoholic_statuses_cached(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink, alcoholic_index, in_memory_data
+    from cocktail_maker.utils import http_client
+    from cocktail_maker.utils.cache import normalize_key
+
+    # The alcoholic index is loaded once from a local stub; the cache answers the rest
+    stub = stack.enter_context(StubUpstream(latency=0))
+    stack.callback(setattr, http_client, "COCKTAILDB_BASE_URL", http_client.COCKTAILDB_BASE_URL)
+    http_client.COCKTAILDB_BASE_URL = stub.base_url
+    stack.callback(alcoholic_index.clear)
+    alcoholic_index.refresh()
+
+    names = []
+    for record in build_catalog(50):
+        drink = Drink.from_api(record)
+        in_memory_data.set(normalize_key(drink.name), drink)
+        names.append(drink.name)
+    stack.callback(in_memory_data.clear)
+    return lambda: Drink.get_alcoholic_statuses(names)
+
+
+def case_drink_list_add_remove(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.models.drink_model import Drink
+
+    drink_list = _user_drink_list(stack, 0)
+    drink = Drink.from_api(load_recorded()[0])
+
+    def add_remove():
+        drink_list.add(drink)
+        drink_list.remove_drink(drink.name)
+    return add_remove
+
+
+def case_drink_list_list_50(stack: ExitStack) -> Callable[[], object]:
+    return _user_drink_list(stack, 50).list_drinks_in_alphabetical_order
+
+
+def case_token_bucket_acquire(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker.utils.rate_limit import TokenBucket
+
+    bucket = TokenBucket(rate=1e9, capacity=1e9)
+    return bucket.try_acquire
+
+
+def case_token_bucket_acquire_sqlite(stack: ExitStack) -> Callable[[], object]:
+    import tempfile
+
+    from cocktail_maker.utils.rate_limit import SQLiteTokenBucket
+
+    # The shared budget costs one write transaction per upstream request
+    tmp = stack.enter_context(tempfile.TemporaryDirectory())
+    bucket = SQLiteTokenBucket(f"{tmp}/buckets.db", "bench", rate=1e9, capacity=1e9)
+    return bucket.try_acquire
+
+
+def _health_request(stack: ExitStack, metrics: bool) -> Callable[[], object]:
+    client = _app_context(stack, metrics).test_client()
+    return lambda: client.get("/health")
+
+
+def case_request_health(stack: ExitStack) -> Callable[[], object]:
+    return _health_request(stack, metrics=True)
+
+
+def case_request_health_without_metrics(stack: ExitStack) -> Callable[[], object]:
+    return _health_request(stack, metrics=False)
+
+
+def _user_lookup(stack: ExitStack, metrics: bool) -> Callable[[], object]:
+    from cocktail_maker.db import db
+    from cocktail_maker.models.user_model import Users
+
+    _app_context(stack, metrics)
+    db.session.add(Users(username="bench", salt=SALT, password="x"))
+    db.session.commit()
+    return lambda: Users.get_id_by_username("bench")
+
+
+def case_user_lookup(stack: ExitStack) -> Callable[[], object]:
+    return _user_lookup(stack, metrics=True)
+
+
+def case_user_lookup_without_metrics(stack: ExitStack) -> Callable[[], object]:
+    return _user_lookup(stack, metrics=False)
+
+
+def case_metrics_render(stack: ExitStack) -> Callable[[], object]:
+    from cocktail_maker import instrumentation
+
+    # A scrape with 40 request series and the upstream/cache/database families
+    client = _app_context(stack).test_client()
+    for path in ("/health", "/cache-stats", "/upstream-stats", "/no/such/path"):
+        client.get(path)
+    for i in range(40):
+        instrumentation.observe_request(f"/route/{i}", "GET", 200, 0.01 * i)
+    stack.callback(instrumentation.request_latency.reset)
+    return instrumentation.render
+
+
+def _bench_logger(stack: ExitStack, handler) -> Callable[[], object]:
+    import logging
+
+    bench_logger = logging.getLogger("benchmarks.logging")
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    bench_logger.addHandler(handler)
+    stack.callback(bench_logger.removeHandler, handler)
+    return lambda: bench_logger.info("Fetched drink '%s' in %.1f ms", "Margarita", 12.5)
+
+
+def case_log_info_sync(stack: ExitStack) -> Callable[[], object]:
+    import logging
+    import os
+
+    from cocktail_maker.utils.logger import JsonFormatter
+
+    # What every module logger used to do: format and write on the calling thread
+    devnull = stack.enter_context(open(os.devnull, "w"))
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(JsonFormatter())
+    return _bench_logger(stack, handler)
+
+
+def case_log_info_queued(stack: ExitStack) -> Callable[[], object]:
+    import logging
+    import os
+    import queue
+    from logging.handlers import QueueListener
+
+    from cocktail_maker.utils.logger import JsonFormatter, _DroppingQueueHandler
+
+    devnull = stack.enter_context(open(os.devnull, "w"))
+    output = logging.StreamHandler(devnull)
+    output.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(maxsize=10000)
+    listener = QueueListener(log_queue, output)
+    listener.start()
+    stack.callback(listener.stop)
+    return _bench_logger(stack, _DroppingQueueHandler(log_queue))
+
+
+def case_log_debug_disabled(stack: ExitStack) -> Callable[[], object]:
+    import logging
+
+    bench_logger = logging.getLogger("benchmarks.logging.disabled")
+    bench_logger.setLevel(logging.INFO)
+    return lambda: bench_logger.debug("Evicted cache entry: %s", "margarita")
+
+
+def case_password_hash(stack: ExitStack) -> Callable[[], object]:
+    from config import ProductionConfig
+    from cocktail_maker.utils import passwords
+
+    passwords.configure(vars(ProductionConfig))
+    return lambda: passwords.hash_password("secret", SALT)
+
+
+def case_password_verify(stack: ExitStack) -> Callable[[], object]:
+    from config import ProductionConfig
+    from cocktail_maker.utils import passwords
+
+    passwords.configure(vars(ProductionConfig))
+    stored = passwords.hash_password("secret", SALT)
+    return lambda: passwords.verify_password("secret", SALT, stored)
+
+
+CASES: Dict[str, Callable[[ExitStack], Callable[[], object]]] = {
+    name[len("case_"):]: fn for name, fn in sorted(globals().items()) if name.startswith("case_")
+}
+
+
+def measure(fn: Callable[[], object], rounds: int) -> dict:
+    """Time ``fn`` with an auto-ranged call count and keep the fastest round."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=rounds, number=number)) / number
+    return {"ns_per_op": round(best * 1e9, 1), "ops_per_sec": round(1 / best, 1), "calls_per_round": number}
+
+
+def run(rounds: int, only=None) -> dict:
+    results = {}
+    for name, setup in CASES.items():
+        if only and name not in only:
+            continue
+        with ExitStack() as stack:
+            results[name] = measure(setup(stack), rounds)
+        print(f"{name:<28} {results[name]['ns_per_op']:>14,.1f} ns/op", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per case; the best one is kept.")
+    parser.add_argument("--only", help=f"Comma-separated cases to run: {', '.join(CASES)}.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    only = set(args.only.split(",")) if args.only else None
+    report.emit("micro", run(args.rounds, only), args.output, rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    main()
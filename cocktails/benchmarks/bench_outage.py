@@ -0,0 +1,71 @@
+"""Availability and latency of the drink routes while the upstream is down.
+
+The service runs as a subprocess against the stub upstream with a short
+drink cache TTL. Every recorded drink is fetched once while the stub is
+healthy; once their TTL has passed, the stub is switched to fail every
+request and the drink routes are driven under each stale-serving policy:
+
+- ``stale``: the defaults; expired drinks are served at once and refetched in the background
+- ``stale_if_error``: expired drinks are refetched first and served stale when that fails
+- ``no_stale``: expired drinks are only served fresh from the upstream
+
+Usage:
+    python -m benchmarks.bench_outage [--requests 200] [--concurrency 20] [--server sync]
+"""
+import argparse
+import sys
+import time
+
+from benchmarks import harness, report
+from benchmarks.stub_upstream import StubUpstream
+
+CACHE_TTL = 1.0
+
+POLICIES = {
+    "stale": {},
+    "stale_if_error": {"DRINK_STALE_WHILE_REVALIDATE": "0"},
+    "no_stale": {"DRINK_STALE_WHILE_REVALIDATE": "0", "DRINK_STALE_IF_ERROR": "0"},
+}
+
+
+def run(args: argparse.Namespace) -> dict:
+    results = {}
+    for policy, env in POLICIES.items():
+        with StubUpstream(latency=args.latency) as stub:
+            names = [drink["strDrink"] for drink in stub.drinks]
+            server_env = dict(env, DRINK_CACHE_TTL=str(CACHE_TTL), RANDOM_DRINK_POOL_SIZE="0")
+            with harness.running_server(args.server, args.port, stub.base_url, server_env) as base_url:
+                harness.drive(base_url, lambda i: ("GET", f"/drink/{names[i]}", None), len(names), args.concurrency)
+                time.sleep(CACHE_TTL)
+                stub.error_rate = 1.0
+                before = sum(stub.stats().values())
+                results[policy] = {
+                    "drink_by_name": harness.drive(
+                        base_url, lambda i: ("GET", f"/drink/{names[i % len(names)]}", None),
+                        args.requests, args.concurrency),
+                    "random_drink": harness.drive(
+                        base_url, lambda i: ("GET", "/random-drink", None), args.requests, args.concurrency),
+                }
+                results[policy]["upstream_requests"] = sum(stub.stats().values()) - before - stub.stats()["errors"]
+        for route in ("drink_by_name", "random_drink"):
+            summary = results[policy][route]
+            print(f"{policy:<15} {route:<14} {summary['statuses']} "
+                  f"p50 {summary['latency_ms'].get('p50')} ms", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route and policy.")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub upstream latency in seconds.")
+    parser.add_argument("--server", choices=sorted(harness.SERVERS), default="sync")
+    parser.add_argument("--port", type=int, default=8097)
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("outage", run(args), args.output, requests=args.requests, concurrency=args.concurrency,
+                latency=args.latency, server=args.server)
+
+
+if __name__ == "__main__":
+    main()
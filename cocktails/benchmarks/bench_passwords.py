@@ -0,0 +1,81 @@
+"""Password hashing throughput at each cost setting.
+
+Reports logins/sec on one core (a single verifier thread) and through the
+bounded hashing pool with every core, so PASSWORD_* settings can be picked
+against the login rate the service has to sustain.
+
+Usage:
+    python -m benchmarks.bench_passwords [--seconds 2] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import report
+from cocktail_maker.utils import passwords
+
+SALT = "00112233445566778899aabbccddeeff"
+
+COST_SETTINGS = [
+    {"PASSWORD_HASH_ALGORITHM": "scrypt", "PASSWORD_SCRYPT_N": 2 ** 12},
+    {"PASSWORD_HASH_ALGORITHM": "scrypt", "PASSWORD_SCRYPT_N": 2 ** 14},
+    {"PASSWORD_HASH_ALGORITHM": "scrypt", "PASSWORD_SCRYPT_N": 2 ** 15},
+    {"PASSWORD_HASH_ALGORITHM": "pbkdf2_sha256", "PASSWORD_PBKDF2_ITERATIONS": 100_000},
+    {"PASSWORD_HASH_ALGORITHM": "pbkdf2_sha256", "PASSWORD_PBKDF2_ITERATIONS": 600_000},
+]
+
+
+def _rate(fn, seconds: float) -> float:
+    """Call ``fn`` repeatedly for ``seconds`` and return calls per second."""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def _pooled_rate(stored: str, seconds: float, workers: int) -> float:
+    """Verify through passwords.run from ``workers`` concurrent callers."""
+    with ThreadPoolExecutor(max_workers=workers) as callers:
+        rates = list(callers.map(
+            lambda _: _rate(lambda: passwords.run(passwords.verify_password, "secret", SALT, stored), seconds),
+            range(workers),
+        ))
+    return sum(rates)
+
+
+def run(seconds: float, workers: int) -> list:
+    results = []
+    for setting in COST_SETTINGS:
+        passwords.configure(dict(setting, PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_MAX_PENDING=workers))
+        stored = passwords.hash_password("secret", SALT)
+        single = _rate(lambda: passwords.verify_password("secret", SALT, stored), seconds)
+        pooled = _pooled_rate(stored, seconds, workers)
+        results.append({
+            "hash_format": stored.rsplit("$", 1)[0],
+            "ms_per_login": round(1000 / single, 2),
+            "logins_per_sec_per_core": round(single, 1),
+            "logins_per_sec_pool": round(pooled, 1),
+            "pool_workers": workers,
+        })
+        print(f"{results[-1]['hash_format']:<32} {single:8.1f}/s per core {pooled:8.1f}/s with {workers} workers",
+              file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measurement time per setting and mode.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing pool size.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("passwords", run(args.seconds, args.workers), args.output,
+                seconds=args.seconds, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Worker cold start: import time of the app and time to the first served request.
+
+Each round starts fresh interpreters: one runs ``python -X importtime -c "import
+app"`` and reports the cumulative import time of ``app`` and of its heaviest
+dependencies; the other imports the app, builds it and serves GET /health,
+and reports the wall time from process spawn to that first response. Medians
+over the rounds are compared with benchmarks/data/startup_budget.json, and the
+run fails if a budget is exceeded or a module that must load lazily (the HTTP
+client stack, numpy, scipy) is imported at start-up.
+
+Usage:
+    python -m benchmarks.bench_startup [--rounds 5] [--budget benchmarks/data/startup_budget.json] [--no-gate]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks import report
+from benchmarks.report import ROOT
+
+DEFAULT_BUDGET = ROOT / "benchmarks" / "data" / "startup_budget.json"
+
+# Top-level modules whose cumulative import time is reported
+WATCHED = ("flask", "sqlalchemy", "flask_sqlalchemy", "requests", "numpy", "scipy", "aiohttp",
+           "cocktail_maker.models.drink_model", "cocktail_maker.models.user_model")
+
+FIRST_REQUEST = """
+import time
+from app import create_app
+app = create_app()
+response = app.test_client().get('/health')
+assert response.status_code == 200, response.status_code
+print(time.time())
+"""
+
+
+def _env(tmp: str) -> Dict[str, str]:
+    return dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/startup.db", ALCOHOLIC_INDEX_REFRESH_SECONDS="0",
+                DRINK_WARMER_INTERVAL="0", LOG_LEVEL="WARNING")
+
+
+def import_times(env: Dict[str, str]) -> Dict[str, float]:
+    """Cumulative import time in ms of ``app`` and of every watched module that was imported."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if name == "app" or name in WATCHED:
+            try:
+                times[name] = int(cumulative) / 1000
+            except ValueError:  # the header line
+                continue
+    return times
+
+
+def first_request_ms(env: Dict[str, str]) -> float:
+    start = time.time()
+    stdout = subprocess.run([sys.executable, "-c", FIRST_REQUEST], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return (float(stdout.strip().splitlines()[-1]) - start) * 1000
+
+
+def run(rounds: int) -> dict:
+    imports: List[Dict[str, float]] = []
+    first_requests: List[float] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _env(tmp)
+        for _ in range(rounds):
+            imports.append(import_times(env))
+            first_requests.append(first_request_ms(env))
+    modules = sorted({name for times in imports for name in times} - {"app"})
+    results = {
+        "import_ms": round(statistics.median(times["app"] for times in imports), 1),
+        "first_request_ms": round(statistics.median(first_requests), 1),
+        "modules_ms": {name: round(statistics.median(times.get(name, 0.0) for times in imports), 1)
+                       for name in modules},
+    }
+    print(f"import app {results['import_ms']:.1f} ms, first request {results['first_request_ms']:.1f} ms "
+          f"after spawn", file=sys.stderr)
+    for name, ms in sorted(results["modules_ms"].items(), key=lambda item: -item[1]):
+        print(f"  {name:<36} {ms:8.1f} ms", file=sys.stderr)
+    return results
+
+
+def check(results: dict, budget: dict) -> List[str]:
+    """The budget violations of a run, empty if it passes."""
+    problems = []
+    for key in ("import_ms", "first_request_ms"):
+        if results[key] > budget[key]:
+            problems.append(f"{key} {results[key]} exceeds the budget of {budget[key]}")
+    for name in budget.get("lazy_modules", []):
+        if name in results["modules_ms"]:
+            problems.append(f"{name} is imported at start-up but should load on first use")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="Fresh interpreters per measurement.")
+    parser.add_argument("--budget", default=str(DEFAULT_BUDGET), help="JSON file with the start-up budget.")
+    parser.add_argument("--no-gate", action="store_true", help="Report only; do not fail on budget violations.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    results = run(args.rounds)
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+    results["budget_violations"] = check(results, budget)
+    report.emit("startup", results, args.output, rounds=args.rounds, budget=budget)
+    if results["budget_violations"] and not args.no_gate:
+        sys.exit("Start-up budget exceeded:\n  " + "\n  ".join(results["budget_violations"]))
+
+
+if __name__ == "__main__":
+    main()
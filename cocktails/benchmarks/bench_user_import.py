@@ -0,0 +1,75 @@
+"""Account creation throughput: one create_user call per user versus a bulk import.
+
+Creates ``--users`` accounts each way in a fresh SQLite database and reports
+users/sec and the projected time for 100k users. Hash cost is set with
+``--scrypt-n`` (production uses 2**14; the default here keeps the run short).
+
+Usage:
+    python -m benchmarks.bench_user_import [--users 500] [--scrypt-n 4096] [--workers N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict
+
+from benchmarks import report
+
+PASSWORD = "secret-password"
+
+
+def run(users: int, scrypt_n: int, workers: int, batch_size: int) -> Dict[str, dict]:
+    from app import create_app
+    from cocktail_maker.models.user_model import Users
+    from config import TestConfig
+
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        config = type("BenchConfig", (TestConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp}/bench.db",
+            "PASSWORD_SCRYPT_N": scrypt_n,
+            "PASSWORD_HASH_WORKERS": workers,
+            "PASSWORD_HASH_MAX_PENDING": workers,
+        })
+        with redirect_stdout(sys.stderr):  # keep stdout for the JSON report
+            app = create_app(config)
+
+        def one_by_one():
+            for i in range(users):
+                Users.create_user(f"single{i}", PASSWORD)
+
+        def bulk():
+            records = ((i, {"username": f"bulk{i}", "password": PASSWORD}) for i in range(users))
+            result = Users.bulk_create(records, batch_size=batch_size)
+            assert result["created"] == users, result["failed"][:3]
+
+        with app.app_context():
+            for name, fn in (("create_user", one_by_one), ("bulk_create", bulk)):
+                start = time.perf_counter()
+                fn()
+                elapsed = time.perf_counter() - start
+                results[name] = {
+                    "users_per_sec": round(users / elapsed, 1),
+                    "minutes_per_100k": round(100_000 / (users / elapsed) / 60, 1),
+                }
+                print(f"{name:<12} {results[name]['users_per_sec']:>8.1f} users/s "
+                      f"{results[name]['minutes_per_100k']:>7.1f} min per 100k", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500, help="Accounts created each way.")
+    parser.add_argument("--scrypt-n", type=int, default=2 ** 12, help="scrypt cost parameter.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing pool size.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per bulk transaction.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("user_import", run(args.users, args.scrypt_n, args.workers, args.batch_size), args.output,
+                users=args.users, scrypt_n=args.scrypt_n, workers=args.workers, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
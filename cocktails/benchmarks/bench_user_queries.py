@@ -0,0 +1,78 @@
+"""SQL statements and latency of the user account routes.
+
+Drives the account routes and a drink list read through the Flask test client
+against a fresh SQLite database, counting the statements each request sends
+to the database. Timings of the account writes are dominated by password
+hashing; the statement counts are the figure to compare.
+
+Usage:
+    python -m benchmarks.bench_user_queries [--repeat 50]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict
+
+from sqlalchemy import event
+
+from benchmarks import report
+
+PASSWORD = "secret"
+
+
+def run(repeat: int) -> Dict[str, dict]:
+    from app import create_app
+    from cocktail_maker.db import db
+    from config import TestConfig
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = type("BenchConfig", (TestConfig,), {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp}/bench.db"})
+        with redirect_stdout(sys.stderr):  # keep stdout for the JSON report
+            app = create_app(config)
+        client = app.test_client()
+        statements = [0]
+
+        def count(*_):
+            statements[0] += 1
+
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", count)
+
+        def scenario(name: str, request):
+            # Every request after the first of a scenario may be answered from warm caches
+            start_statements, start = statements[0], time.perf_counter()
+            for i in range(repeat):
+                response = request(i)
+                assert response.status_code < 400, (name, response.status_code, response.get_json())
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                "statements_per_request": round((statements[0] - start_statements) / repeat, 2),
+                "ms_per_request": round(1000 * elapsed / repeat, 3),
+            }
+            print(f"{name:<18} {results[name]['statements_per_request']:>6} statements "
+                  f"{results[name]['ms_per_request']:>8.3f} ms", file=sys.stderr)
+
+        results: Dict[str, dict] = {}
+        scenario("create_account", lambda i: client.post(
+            "/create-account", json={"username": f"user{i}", "password": PASSWORD}))
+        scenario("login", lambda i: client.post("/login", json={"username": "user0", "password": PASSWORD}))
+        scenario("update_password", lambda i: client.post(
+            "/update-password", json={"username": f"user{i}", "new_password": PASSWORD}))
+        scenario("login_after_update", lambda i: client.post(
+            "/login", json={"username": f"user{i}", "password": PASSWORD}))
+        scenario("list_drinks", lambda i: client.get("/list-drinks?username=user0"))
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="Requests per scenario.")
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+    report.emit("user_queries", run(args.repeat), args.output, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Start the service as a subprocess and drive HTTP load against it."""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import aiohttp
+
+from benchmarks.report import ROOT
+
+# (method, path, JSON body or None) for the i-th request of a scenario
+RequestFactory = Callable[[int], Tuple[str, str, Optional[dict]]]
+
+SERVERS = {
+    "sync": lambda port: [
+        sys.executable, "-c",
+        "from werkzeug.serving import run_simple; from app import create_app; "
+        f"run_simple('127.0.0.1', {port}, create_app(), threaded=True)",
+    ],
+    "asgi": lambda port: [
+        sys.executable, "-m", "uvicorn", "asgi:create_asgi_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ],
+}
+
+
+def wait_until_healthy(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+@contextmanager
+def running_server(kind: str, port: int, upstream_url: str, env: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    Run the service against ``upstream_url`` with a throwaway database.
+
+    Args:
+        kind (str): "sync" for the threaded Flask server, "asgi" for uvicorn.
+        port (int): Port to listen on.
+        upstream_url (str): CocktailDB base URL, normally a StubUpstream.
+        env (Optional[dict]): Extra environment variables for the server.
+
+    Yields:
+        str: The base URL of the running server.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        server_env = dict(
+            os.environ,
+            COCKTAILDB_BASE_URL=upstream_url,
+            DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+            ALCOHOLIC_INDEX_REFRESH_SECONDS="0",
+            DRINK_WARMER_INTERVAL="0",
+            DB_MIGRATE_ON_START="true",
+        )
+        server_env.update(env or {})
+        process = subprocess.Popen(SERVERS[kind](port), cwd=ROOT, env=server_env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            wait_until_healthy(base_url)
+            yield base_url
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    total = len(latencies)
+    return {
+        "requests": total,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "requests_per_sec": round(total / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "p50": round(1000 * latencies[total // 2], 2),
+            "p95": round(1000 * latencies[int(total * 0.95)], 2),
+            "p99": round(1000 * latencies[int(total * 0.99)], 2),
+            "mean": round(1000 * statistics.fmean(latencies), 2),
+        } if total else {},
+    }
+
+
+async def _drive(base_url: str, request_for: RequestFactory, total: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    counter = iter(range(total))
+
+    async def worker(client: aiohttp.ClientSession) -> None:
+        for i in counter:
+            method, path, body = request_for(i)
+            start = time.perf_counter()
+            async with client.request(method, f"{base_url}/{quote(path.lstrip('/'), safe='/?=&')}",
+                                      json=body) as response:
+                await response.read()
+                statuses[response.status] += 1
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, statuses, elapsed)
+
+
+def drive(base_url: str, request_for: RequestFactory, total: int, concurrency: int) -> dict:
+    """
+    Send ``total`` requests from ``concurrency`` concurrent clients.
+
+    Returns:
+        dict: Throughput, latency percentiles and a count of response statuses.
+    """
+    return asyncio.run(_drive(base_url, request_for, total, concurrency))
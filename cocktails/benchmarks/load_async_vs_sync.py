@@ -0,0 +1,48 @@
+"""Load test of the sync Flask app against the ASGI serving mode.
+
+Both servers are started as subprocesses against a local stub upstream with
+a fixed latency. Each request asks for a drink name that has not been seen
+before, so every request waits on the upstream and the comparison measures
+how well each mode overlaps that waiting.
+
+Usage:
+    python -m benchmarks.load_async_vs_sync [--requests 2000] [--concurrency 100] [--latency 0.05]
+"""
+import argparse
+import sys
+
+from benchmarks import harness, report
+from benchmarks.stub_upstream import StubUpstream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub upstream delay in seconds.")
+    parser.add_argument("--path", default="drink/Bench {kind} {i}",
+                        help="Request path template; {i} is the request number, {kind} the server kind.")
+    parser.add_argument("--port", type=int, default=5055)
+    report.add_output_argument(parser)
+    args = parser.parse_args()
+
+    results = {}
+    with StubUpstream(latency=args.latency) as stub:
+        for offset, kind in enumerate(harness.SERVERS):
+            env = {"COCKTAILDB_POOL_SIZE": str(args.concurrency)}
+            with harness.running_server(kind, args.port + offset, stub.base_url, env) as base_url:
+                results[kind] = harness.drive(
+                    base_url,
+                    lambda i, kind=kind: ("GET", args.path.format(i=i, kind=kind), None),
+                    args.requests,
+                    args.concurrency,
+                )
+            print(f"{kind:<6} {results[kind]['requests_per_sec']:8.1f} req/s "
+                  f"p99 {results[kind]['latency_ms']['p99']:.1f} ms", file=sys.stderr)
+
+    report.emit("load_async_vs_sync", results, args.output, requests=args.requests,
+                concurrency=args.concurrency, upstream_latency_s=args.latency, path=args.path)
+
+
+if __name__ == "__main__":
+    main()
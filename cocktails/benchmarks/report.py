@@ -0,0 +1,61 @@
+"""JSON reports shared by every benchmark.
+
+Each report records the benchmark name, its parameters, the environment it
+ran in (interpreter, CPU count, git revision) and the results, so reports
+from different releases can be diffed to spot regressions.
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_revision": git_revision(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def add_output_argument(parser) -> None:
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+
+
+def emit(benchmark: str, results: Any, output: Optional[str] = None, **params) -> dict:
+    """
+    Print a benchmark report as JSON on stdout and optionally write it to ``output``.
+
+    Args:
+        benchmark (str): The benchmark name.
+        results (Any): JSON-serializable results.
+        output (Optional[str]): File to write the report to.
+        **params: The parameters the benchmark ran with.
+
+    Returns:
+        dict: The report.
+    """
+    report = {"benchmark": benchmark, "params": params, "environment": environment(), "results": results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    return report
@@ -0,0 +1,247 @@
+"""Local stand-in for the CocktailDB API used by the benchmarks.
+
+Serves recorded CocktailDB JSON for search.php (by name or first letter),
+lookup.php, random.php and filter.php after a configurable delay, and fails
+a configurable share of requests, so benchmarks measure the service rather
+than the public API and its rate limits.
+
+The recorded drinks can be padded with generated variants to reach a
+realistic catalog size. Names that are not in the catalog resolve to a
+generated drink of that name by default, which lets a benchmark defeat the
+drink cache with unique names; pass ``unknown="empty"`` to answer them like
+the real API does instead.
+
+Usage:
+    python -m benchmarks.stub_upstream [--port 8099] [--latency 0.05] [--error-rate 0.1]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api/json/v1/1"
+RECORDED_DRINKS = Path(__file__).resolve().parent / "data" / "recorded_drinks.json"
+
+
+def load_recorded(path: Path = RECORDED_DRINKS) -> List[dict]:
+    """Load the recorded full drink records."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["drinks"]
+
+
+def synthetic_drink(name: str, alcoholic: bool = True) -> dict:
+    """Build a full CocktailDB drink record for ``name``."""
+    drink = {
+        "idDrink": str(100000 + zlib.crc32(name.encode()) % 900000),
+        "strDrink": name,
+        "strCategory": "Cocktail",
+        "strAlcoholic": "Alcoholic" if alcoholic else "Non alcoholic",
+        "strGlass": "Cocktail glass",
+        "strInstructions": "Shake with ice and strain.",
+        "strDrinkThumb": "https://example.invalid/thumb.jpg",
+    }
+    for i in range(1, 16):
+        drink[f"strIngredient{i}"] = f"Ingredient {i}" if i <= 4 else None
+        drink[f"strMeasure{i}"] = "1 oz" if i <= 4 else None
+    return drink
+
+
+def build_catalog(size: int = 0, seed: int = 0, recorded: Optional[List[dict]] = None) -> List[dict]:
+    """
+    Return the recorded drinks padded with generated variants up to ``size`` drinks.
+
+    Variants reuse the recorded categories, glasses and ingredient vocabulary, with
+    each variant drawing a random subset of ingredients, so the catalog has a
+    realistic shape for search and ingredient benchmarks.
+    """
+    drinks = [dict(drink) for drink in (recorded if recorded is not None else load_recorded())]
+    rng = random.Random(seed)
+    vocabulary = sorted({
+        drink[f"strIngredient{i}"] for drink in drinks for i in range(1, 16) if drink.get(f"strIngredient{i}")
+    })
+    base = list(drinks)
+    for n in range(len(drinks), size):
+        template = base[n % len(base)]
+        variant = dict(template)
+        variant["idDrink"] = str(200000 + n)
+        variant["strDrink"] = f"{template['strDrink']} No. {n}"
+        ingredients = rng.sample(vocabulary, k=min(len(vocabulary), rng.randint(2, 6)))
+        for i in range(1, 16):
+            variant[f"strIngredient{i}"] = ingredients[i - 1] if i <= len(ingredients) else None
+            variant[f"strMeasure{i}"] = f"{rng.randint(1, 4)} oz" if i <= len(ingredients) else None
+        drinks.append(variant)
+    return drinks
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        upstream: "StubUpstream" = self.server.upstream
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        endpoint = path.lstrip("/")
+
+        upstream.record(endpoint)
+        if upstream.latency:
+            time.sleep(upstream.latency)
+        if upstream.should_fail():
+            upstream.record("errors")
+            self.send_error(upstream.error_status)
+            return
+
+        body = upstream.respond(endpoint, params)
+        if body is None:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # the default backlog of 5 stalls concurrent connects
+
+
+class StubUpstream:
+    """
+    Threaded stub server that can be started and stopped from a benchmark or test.
+
+    Use as a context manager; ``base_url`` is suitable for COCKTAILDB_BASE_URL.
+    ``latency``, ``error_rate`` and ``error_status`` can be changed while running.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        catalog_size: int = 0,
+        unknown: str = "synthetic",
+        seed: int = 0,
+        drinks: Optional[List[dict]] = None,
+    ):
+        if unknown not in ("synthetic", "empty"):
+            raise ValueError("unknown must be 'synthetic' or 'empty'")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.unknown = unknown
+        self.drinks = drinks if drinks is not None else build_catalog(catalog_size, seed)
+        self._by_name: Dict[str, dict] = {drink["strDrink"].casefold(): drink for drink in self.drinks}
+        self._by_id: Dict[str, dict] = {drink["idDrink"]: drink for drink in self.drinks}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests: Counter = Counter()
+
+        self.server = StubServer((host, port), StubHandler)
+        self.server.upstream = self
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def remove(self, name: str) -> None:
+        """Drop every drink whose name contains ``name``, as if they were deleted upstream."""
+        with self._lock:
+            self.drinks = [drink for drink in self.drinks if name.casefold() not in drink["strDrink"].casefold()]
+            self._by_name = {drink["strDrink"].casefold(): drink for drink in self.drinks}
+            self._by_id = {drink["idDrink"]: drink for drink in self.drinks}
+
+    def record(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def respond(self, endpoint: str, params: Dict[str, str]) -> Optional[dict]:
+        """Build the JSON body for one request, or None for an unknown endpoint."""
+        if endpoint == "search.php":
+            if "f" in params:
+                letter = params["f"][:1].casefold()
+                found = [drink for drink in self.drinks if drink["strDrink"].casefold().startswith(letter)]
+                return {"drinks": found or None}
+            name = params.get("s", "").strip()
+            if not name:
+                return {"drinks": None}
+            exact = self._by_name.get(name.casefold())
+            if exact is not None:
+                return {"drinks": [exact]}
+            # Like the real API, fall back to a substring match
+            found = [drink for drink in self.drinks if name.casefold() in drink["strDrink"].casefold()]
+            if found:
+                return {"drinks": found[:25]}
+            return {"drinks": [synthetic_drink(name)] if self.unknown == "synthetic" else None}
+        if endpoint == "lookup.php":
+            drink = self._by_id.get(params.get("i", ""))
+            return {"drinks": [drink] if drink else None}
+        if endpoint == "random.php":
+            with self._lock:
+                drink = self._rng.choice(self.drinks)
+            return {"drinks": [drink]}
+        if endpoint == "filter.php":
+            alcoholic = {"Alcoholic": "Alcoholic", "Non_Alcoholic": "Non alcoholic"}.get(params.get("a", ""))
+            found = [
+                {"idDrink": drink["idDrink"], "strDrink": drink["strDrink"], "strDrinkThumb": drink["strDrinkThumb"]}
+                for drink in self.drinks if drink["strAlcoholic"] == alcoholic
+            ]
+            return {"drinks": found or None}
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.requests)
+
+    def __enter__(self) -> "StubUpstream":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds to wait before each response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error.")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--catalog-size", type=int, default=0, help="Pad the recorded drinks to this many.")
+    parser.add_argument("--unknown", choices=["synthetic", "empty"], default="synthetic",
+                        help="How to answer searches for names outside the catalog.")
+    args = parser.parse_args()
+    stub = StubUpstream(port=args.port, latency=args.latency, error_rate=args.error_rate,
+                        error_status=args.error_status, catalog_size=args.catalog_size, unknown=args.unknown)
+    with stub:
+        print(f"Serving stub CocktailDB API at {stub.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import json
+import sys
+
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+
+from cocktail_maker import migrations
+from cocktail_maker.db import db
+from cocktail_maker.models.catalog_model import CatalogDrink, fetch_catalog_by_letter, load_catalog_dump
+from cocktail_maker.models.drink_model import Drink
+from cocktail_maker.models.user_model import USER_RECORD_FORMATS, Users, read_user_records, write_user_records
+
+
+@click.command("ingest-catalog")
+@click.option("--file", "dump_path", type=click.Path(exists=True, dir_okay=False),
+              help="Load the catalog from a local JSON dump instead of the CocktailDB API.")
+@click.option("--save-dump", type=click.Path(dir_okay=False),
+              help="Write the records fetched from the API to this JSON file.")
+@click.option("--batch-size", default=500, show_default=True, help="Rows written per transaction.")
+@with_appcontext
+def ingest_catalog_command(dump_path, save_dump, batch_size):
+    """Bulk-load the local drink catalog mirror."""
+    if dump_path:
+        drinks = load_catalog_dump(dump_path)
+    else:
+        drinks = fetch_catalog_by_letter()
+        if save_dump:
+            with open(save_dump, "w", encoding="utf-8") as f:
+                json.dump({"drinks": drinks}, f)
+    written = CatalogDrink.ingest(drinks, batch_size=batch_size)
+    click.echo(f"Ingested {written} drinks into the catalog.")
+
+
+@click.command("similar-drinks")
+@click.option("--limit", default=10, show_default=True, help="Similar drinks listed per drink.")
+@click.option("--output", type=click.Path(dir_okay=False), required=True,
+              help="JSON file to write the lists to, keyed by drink name.")
+@with_appcontext
+def similar_drinks_command(limit, output):
+    """Precompute the most similar drinks of every drink in the catalog mirror."""
+    similar = Drink.precompute_similar(limit)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(similar, f, indent=2, sort_keys=True)
+    click.echo(f"Wrote similar drinks for {len(similar)} drinks to {output}.")
+
+
+def _format_for(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+@click.command("import-users")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(USER_RECORD_FORMATS),
+              help="Input format; defaults to csv for *.csv files and ndjson otherwise.")
+@click.option("--batch-size", default=500, show_default=True, help="Users hashed and written per transaction.")
+@with_appcontext
+def import_users_command(path, fmt, batch_size):
+    """Create users from an NDJSON or CSV file, reporting rows that fail."""
+    with open(path, encoding="utf-8", newline="") as f:
+        result = Users.bulk_create(read_user_records(f, _format_for(path, fmt)), batch_size=batch_size)
+    for failure in result["failed"]:
+        click.echo(f"Row {failure['row']} ({failure['username']}): {failure['error']}", err=True)
+    click.echo(f"Created {result['created']} users, {len(result['failed'])} rows failed.")
+    if result["failed"]:
+        sys.exit(1)
+
+
+@click.command("export-users")
+@click.option("--output", type=click.Path(dir_okay=False), required=True, help="File to write the users to.")
+@click.option("--format", "fmt", type=click.Choice(USER_RECORD_FORMATS),
+              help="Output format; defaults to csv for *.csv files and ndjson otherwise.")
+@with_appcontext
+def export_users_command(output, fmt):
+    """Write every user, with salt and password hash, in a format import-users reads back."""
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        f.writelines(write_user_records(Users.export(), _format_for(output, fmt)))
+    click.echo(f"Exported users to {output}.")
+
+
+@click.command("migrate-db")
+@click.option("--target", type=int, help="Stop at this schema version instead of the latest.")
+@with_appcontext
+def migrate_db_command(target):
+    """Apply pending schema migrations; run once per deployment, before starting the workers."""
+    applied = migrations.upgrade(db.engine, target)
+    with db.engine.connect() as connection:
+        version = migrations.current_version(connection)
+    if applied:
+        click.echo(f"Applied migrations {', '.join(map(str, applied))}; schema is at version {version}.")
+    else:
+        click.echo(f"Schema is up to date at version {version}.")
+
+
+def register_commands(app: Flask) -> None:
+    """
+    Attach the project's CLI commands to the Flask app.
+
+    Args:
+        app (Flask): The application instance.
+    """
+    app.cli.add_command(ingest_catalog_command)
+    app.cli.add_command(similar_drinks_command)
+    app.cli.add_command(import_users_command)
+    app.cli.add_command(export_users_command)
+    app.cli.add_command(migrate_db_command)
@@ -1,3 +1,150 @@
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from cocktail_maker.utils.metrics import LabeledHistograms
 
 db = SQLAlchemy()
+
+# Time spent executing SQL statements, by the model operation that issued them
+query_latency = LabeledHistograms(("operation",))
+_operation: ContextVar[str] = ContextVar("db_operation", default="other")
+
+
+def db_operation(name: str) -> Callable:
+    """
+    Attribute the SQL statements a model function executes to ``name`` in ``query_latency``.
+
+    Only the time spent in the database is measured, not the rest of the
+    function (e.g. password hashing).
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _operation.set(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _operation.reset(token)
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the per-statement execution context, so failed statements leave nothing behind
+    context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    query_latency.labels(_operation.get()).observe(time.perf_counter() - context.query_start)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement executed on ``engine``; safe to call more than once."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+#################################################
+# Engine configuration
+#################################################
+
+# Flask config key -> create_engine() argument, for connection pools
+_POOL_OPTIONS = {
+    "DB_POOL_SIZE": "pool_size",
+    "DB_MAX_OVERFLOW": "max_overflow",
+    "DB_POOL_TIMEOUT": "pool_timeout",
+}
+# Only useful against a database server, which may drop idle connections
+_SERVER_POOL_OPTIONS = {
+    "DB_POOL_RECYCLE": "pool_recycle",
+    "DB_POOL_PRE_PING": "pool_pre_ping",
+}
+# Flask config key -> SQLite pragma, set on every new connection
+_SQLITE_PRAGMAS = {
+    "SQLITE_JOURNAL_MODE": "journal_mode",
+    "SQLITE_SYNCHRONOUS": "synchronous",
+    "SQLITE_MMAP_SIZE": "mmap_size",
+    "SQLITE_BUSY_TIMEOUT_MS": "busy_timeout",
+    "SQLITE_FOREIGN_KEYS": "foreign_keys",
+}
+
+
+def normalize_database_url(url: str) -> str:
+    """
+    Accept the ``postgres://`` scheme some hosting providers hand out, which SQLAlchemy does not.
+    """
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def engine_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build ``SQLALCHEMY_ENGINE_OPTIONS`` from the DB_POOL_* settings in a Flask config.
+
+    In-memory SQLite keeps Flask-SQLAlchemy's single shared connection, so
+    pool sizes are left out for it; recycling and pre-ping are only set for
+    database servers. Unset (None) settings are left at SQLAlchemy's defaults,
+    and options already in ``SQLALCHEMY_ENGINE_OPTIONS`` win.
+
+    Args:
+        config (dict): The application config.
+
+    Returns:
+        dict: Keyword arguments for ``create_engine``.
+    """
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    mapping: Dict[str, str] = {}
+    if url.get_backend_name() != "sqlite":
+        mapping.update(_POOL_OPTIONS)
+        mapping.update(_SERVER_POOL_OPTIONS)
+    elif url.database not in (None, "", ":memory:"):
+        mapping.update(_POOL_OPTIONS)
+    options = {option: config[key] for key, option in mapping.items() if config.get(key) is not None}
+    options.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    return options
+
+
+def sqlite_pragmas(config: Dict[str, Any]) -> List[str]:
+    """The PRAGMA statements for the SQLITE_* settings in a Flask config."""
+    statements = []
+    for key, pragma in _SQLITE_PRAGMAS.items():
+        value = config.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "ON" if value else "OFF"
+        statements.append(f"PRAGMA {pragma}={value}")
+    return statements
+
+
+def configure_engine(engine: Engine, config: Dict[str, Any]) -> None:
+    """
+    Run the configured SQLite pragmas on every new connection of ``engine``; a no-op for other databases.
+
+    WAL lets readers carry on while a worker writes, and ``synchronous=NORMAL``
+    syncs on checkpoints rather than on every commit, which is still safe
+    against application crashes in WAL mode.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    statements = sqlite_pragmas(config)
+    if not statements:
+        return
+
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", set_pragmas)
@@ -0,0 +1,114 @@
+import time
+from typing import List
+
+from flask import Flask, Response, g, request
+
+from cocktail_maker.db import db, instrument_engine, query_latency
+from cocktail_maker.models.drink_list_model import list_bodies
+from cocktail_maker.models.drink_model import drink_fetches, in_memory_data, random_pool, stale_served
+from cocktail_maker.utils import logger
+from cocktail_maker.utils.lazy import LazyModule
+from cocktail_maker.utils.metrics import Gauge, LabeledHistograms, format_histograms, format_metric
+
+# Only needed once metrics are rendered
+http_client = LazyModule("cocktail_maker.utils.http_client")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Requests that did not match a route share one label, so unknown paths cannot add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+request_latency = LabeledHistograms(("route", "method", "status"))
+requests_in_flight = Gauge()
+
+
+def observe_request(route: str, method: str, status: int, seconds: float) -> None:
+    """Record one handled request."""
+    request_latency.labels(route, method, str(status)).observe(seconds)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Time every request to ``app`` by route, method and status, and every SQL statement it runs.
+
+    A request that raises is recorded with status 500.
+    """
+    instrument_engine(db.engine)
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.metrics_start = time.perf_counter()
+        requests_in_flight.inc()
+
+    @app.after_request
+    def record_status(response: Response) -> Response:
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request(exc) -> None:
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return
+        requests_in_flight.dec()
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        observe_request(route, request.method, g.pop("metrics_status", 500), time.perf_counter() - start)
+
+
+def render() -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: The body served at /metrics.
+    """
+    lines: List[str] = []
+    lines += format_histograms("cocktails_http_request_duration_seconds",
+                               "Time to handle a request, by route, method and status.", request_latency.items())
+    lines += format_metric("cocktails_http_requests_in_flight", "gauge",
+                           "Requests currently being handled.", [({}, requests_in_flight.value)])
+
+    lines += format_histograms(
+        "cocktails_upstream_request_duration_seconds", "CocktailDB API call latency, by endpoint.",
+        [({"endpoint": endpoint}, histogram) for endpoint, histogram in sorted(http_client.latency_histograms.items())],
+    )
+    breaker = http_client.breaker.stats()
+    budget_rejected = http_client.throttle.rejected if http_client.throttle is not None else 0
+    lines += format_metric("cocktails_upstream_circuit_open", "gauge",
+                           "1 while the circuit breaker holds back CocktailDB calls.",
+                           [({}, int(breaker["state"] != http_client.CircuitBreaker.CLOSED))])
+    lines += format_metric("cocktails_upstream_rejected_total", "counter",
+                           "CocktailDB calls refused without touching the network, by reason.",
+                           [({"reason": "circuit_open"}, breaker["rejected"]), ({"reason": "budget"}, budget_rejected)])
+    lines += format_metric("cocktails_upstream_throttled_total", "counter",
+                           "429 responses received from the CocktailDB API.",
+                           [({}, http_client.upstream_responses["throttled"])])
+    lines += format_metric("cocktails_upstream_coalesced_total", "counter",
+                           "Drink lookups that shared another caller's upstream request.",
+                           [({}, drink_fetches.stats()["coalesced"])])
+
+    lines += format_metric("cocktails_stale_responses_total", "counter",
+                           "Drinks served from local data instead of a fresh upstream answer, by reason.",
+                           [({"reason": reason}, count) for reason, count in stale_served.snapshot().items()])
+
+    drink_cache = in_memory_data.stats()
+    caches = {
+        "drink": (drink_cache["hits"] + drink_cache["negative_hits"], drink_cache["misses"], drink_cache["size"]),
+        "list_body": (list_bodies.hits, list_bodies.misses, list_bodies.stats()["size"]),
+        "random_pool": (random_pool.hits, random_pool.misses, len(random_pool)),
+    }
+    lines += format_metric("cocktails_cache_hits_total", "counter", "Cache lookups answered from the cache.",
+                           [({"cache": name}, hits) for name, (hits, _, _) in caches.items()])
+    lines += format_metric("cocktails_cache_misses_total", "counter", "Cache lookups that missed.",
+                           [({"cache": name}, misses) for name, (_, misses, _) in caches.items()])
+    lines += format_metric("cocktails_cache_hit_ratio", "gauge", "Share of cache lookups that hit since startup.",
+                           [({"cache": name}, round(hits / (hits + misses), 4) if hits + misses else 0.0)
+                            for name, (hits, misses, _) in caches.items()])
+    lines += format_metric("cocktails_cache_entries", "gauge", "Entries currently held.",
+                           [({"cache": name}, size) for name, (_, _, size) in caches.items()])
+
+    lines += format_metric("cocktails_log_records_dropped_total", "counter",
+                           "Log records dropped because the logging queue was full.", [({}, logger.stats()["dropped"])])
+    lines += format_histograms("cocktails_db_query_duration_seconds",
+                               "Time spent executing SQL statements, by model operation.", query_latency.items())
+    return "\n".join(lines) + "\n"
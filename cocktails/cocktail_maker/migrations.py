@@ -0,0 +1,160 @@
+"""
+Versioned schema migrations.
+
+The ``schema_version`` table records which migrations a database has had.
+``upgrade`` applies the pending ones in order, each in its own transaction,
+and is run once per deployment (``flask migrate-db``) rather than by every
+worker at start-up. Concurrent upgrades, e.g. workers started with
+DB_MIGRATE_ON_START, are serialized by a database lock, so each migration is
+applied once and the other processes find it done.
+
+Migrations describe the schema as it was at their version, so they never
+import the models: a new column is a new migration, and the models are
+changed to match.
+"""
+import logging
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy import JSON, Column, ForeignKey, Index, Integer, MetaData, String, Table, Text, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+_version_metadata = MetaData()
+schema_version = Table(
+    "schema_version", _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+)
+
+
+# Key of the Postgres advisory lock held while a migration is applied
+ADVISORY_LOCK_KEY = 7_268_311_046
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _initial_schema(connection: Connection) -> None:
+    # Databases created before migrations existed already have these tables; they are left as they are
+    metadata = MetaData()
+    Table(
+        "users", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("username", String(80), unique=True, nullable=False),
+        Column("salt", String(32), nullable=False),
+        Column("password", String(255), nullable=False),
+    )
+    Table(
+        "user_drinks", metadata,
+        Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        Column("drink_id", Integer, primary_key=True),
+        Column("name", String(200), nullable=False),
+        Column("name_normalized", String(200), nullable=False),
+        Index("ix_user_drinks_user_name", "user_id", "name_normalized", unique=True),
+    )
+    Table(
+        "cocktails", metadata,
+        Column("id", Integer, primary_key=True, autoincrement=False),
+        Column("name", String(200), nullable=False),
+        Column("name_normalized", String(200), nullable=False, index=True),
+        Column("category", String(80), index=True),
+        Column("alcoholic", String(40), index=True),
+        Column("glass", String(80), index=True),
+        Column("instructions", Text),
+        Column("ingredients", JSON, nullable=False),
+        Column("measures", JSON, nullable=False),
+        Column("thumbnail", String(255)),
+    )
+    metadata.create_all(connection, checkfirst=True)
+
+
+def _cocktails_fetched_at(connection: Connection) -> None:
+    # Existing rows count as ingested now; databases made by create_all already have the column
+    if "fetched_at" not in {column["name"] for column in inspect(connection).get_columns("cocktails")}:
+        connection.execute(text("ALTER TABLE cocktails ADD COLUMN fetched_at FLOAT"))
+    connection.execute(text("UPDATE cocktails SET fetched_at = :now WHERE fetched_at IS NULL"), {"now": time.time()})
+
+
+# In order; append new migrations, never edit applied ones
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Initial schema: users, user_drinks, cocktails", _initial_schema),
+    Migration(2, "Record when catalog rows were ingested", _cocktails_fetched_at),
+]
+
+
+def current_version(connection: Connection) -> int:
+    """
+    The highest migration applied to the database, 0 for an empty database.
+    """
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    versions = connection.execute(schema_version.select().with_only_columns(schema_version.c.version))
+    return max(versions.scalars(), default=0)
+
+
+def _lock(connection: Connection) -> None:
+    """
+    Hold the database's migration lock until the current transaction ends.
+
+    SQLite takes its write lock up front, so a second process waits (up to its
+    busy timeout) before reading the version; Postgres takes an advisory lock.
+    Other databases are not locked.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    elif connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """
+    Apply every migration above the database's version, up to ``target`` (default: the latest).
+
+    Args:
+        engine (Engine): The database to migrate.
+        target (Optional[int]): The version to stop at.
+
+    Returns:
+        list: The versions applied, empty if the database was up to date.
+    """
+    pending = [m for m in MIGRATIONS if target is None or m.version <= target]
+    with engine.connect() as connection:
+        version = current_version(connection)
+    applied = []
+    for migration in pending:
+        if migration.version <= version:
+            continue
+        with engine.begin() as connection:
+            _lock(connection)
+            _version_metadata.create_all(connection, checkfirst=True)
+            # Another process may have applied it while this one waited for the lock
+            version = current_version(connection)
+            if migration.version <= version:
+                continue
+            migration.apply(connection)
+            connection.execute(schema_version.insert().values(version=migration.version,
+                                                              description=migration.description))
+        logger.info("Applied migration %d: %s", migration.version, migration.description)
+        applied.append(migration.version)
+    return applied
+
+
+def reset(engine: Engine, metadata: MetaData) -> List[int]:
+    """
+    Drop the tables in ``metadata`` and the version table, then migrate from scratch.
+
+    Returns:
+        list: The versions applied.
+    """
+    with engine.begin() as connection:
+        metadata.drop_all(connection)
+        _version_metadata.drop_all(connection)
+    return upgrade(engine)
@@ -0,0 +1,229 @@
+import json
+import logging
+import string
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+
+from cocktail_maker.db import db
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.lazy import LazyModule
+from cocktail_maker.utils.logger import configure_logger
+
+requests = LazyModule("requests")
+http_client = LazyModule("cocktail_maker.utils.http_client")
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CatalogDrink(db.Model):
+    """
+    Local mirror of the CocktailDB catalog.
+
+    Rows hold the same fields as the ``Drink`` dictionaries returned by the API
+    wrappers, plus a normalized name column so lookups can be served by index
+    and the Unix time the row was last ingested.
+    """
+    __tablename__ = 'cocktails'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # CocktailDB idDrink
+    name = db.Column(db.String(200), nullable=False)
+    name_normalized = db.Column(db.String(200), nullable=False, index=True)
+    category = db.Column(db.String(80), index=True)
+    alcoholic = db.Column(db.String(40), index=True)
+    glass = db.Column(db.String(80), index=True)
+    instructions = db.Column(db.Text)
+    ingredients = db.Column(db.JSON, nullable=False)
+    measures = db.Column(db.JSON, nullable=False)
+    thumbnail = db.Column(db.String(255))
+    fetched_at = db.Column(db.Float)
+
+    @staticmethod
+    def row_from_api(drink_data: dict) -> dict:
+        """
+        Convert a raw CocktailDB drink record into a row for the catalog table.
+
+        Args:
+            drink_data (dict): A single entry of the API's "drinks" list.
+
+        Returns:
+            dict: Column values for a CatalogDrink row.
+        """
+        return {
+            "id": int(drink_data["idDrink"]),
+            "name": drink_data["strDrink"],
+            "name_normalized": normalize_key(drink_data["strDrink"]),
+            "category": drink_data.get("strCategory"),
+            "alcoholic": drink_data.get("strAlcoholic"),
+            "glass": drink_data.get("strGlass"),
+            "instructions": drink_data.get("strInstructions"),
+            "ingredients": [drink_data.get(f"strIngredient{i}") for i in range(1, 16)],
+            "measures": [drink_data.get(f"strMeasure{i}") for i in range(1, 16)],
+            "thumbnail": drink_data.get("strDrinkThumb"),
+            "fetched_at": time.time(),
+        }
+
+    def to_dict(self) -> dict:
+        """
+        Return the row in the same shape as ``Drink.to_dict``, plus ``fetched_at``.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "alcoholic": self.alcoholic,
+            "glass": self.glass,
+            "instructions": self.instructions,
+            "ingredients": self.ingredients,
+            "measures": self.measures,
+            "thumbnail": self.thumbnail,
+            "fetched_at": self.fetched_at,
+        }
+
+    @classmethod
+    def get_by_name(cls, name: str) -> Optional[dict]:
+        """
+        Look up a drink in the mirror by its normalized name.
+
+        Args:
+            name (str): The drink name.
+
+        Returns:
+            Optional[dict]: The drink dictionary, or None if the mirror has no such drink.
+        """
+        row = db.session.execute(
+            select(cls).where(cls.name_normalized == normalize_key(name)).limit(1)
+        ).scalar_one_or_none()
+        return row.to_dict() if row else None
+
+    @classmethod
+    def get_by_names(cls, names: Iterable[str]) -> Dict[str, dict]:
+        """
+        Look up several drinks in the mirror with a single query.
+
+        Args:
+            names (Iterable[str]): Drink names; they are normalized before the lookup.
+
+        Returns:
+            Dict[str, dict]: Drink dictionaries keyed by normalized name, for the names found.
+        """
+        keys = {normalize_key(name) for name in names}
+        if not keys:
+            return {}
+        rows = db.session.execute(select(cls).where(cls.name_normalized.in_(keys))).scalars()
+        return {row.name_normalized: row.to_dict() for row in rows}
+
+    @classmethod
+    def index_rows(cls) -> List[Tuple[int, str, Optional[str], Optional[str], Optional[str], List[Optional[str]]]]:
+        """
+        Read the columns the in-memory drink indexes and statistics are built from.
+
+        Returns:
+            List[Tuple]: One (id, name, category, alcoholic, glass, ingredients) row per drink.
+        """
+        return [
+            tuple(row)
+            for row in db.session.execute(
+                select(cls.id, cls.name, cls.category, cls.alcoholic, cls.glass, cls.ingredients)
+            )
+        ]
+
+    @classmethod
+    def ingest(cls, drinks: Iterable[dict], batch_size: int = 500) -> int:
+        """
+        Bulk upsert raw CocktailDB drink records into the catalog.
+
+        Existing ids are updated in place and new ids are inserted, one
+        executemany statement of each kind per batch.
+
+        Args:
+            drinks (Iterable[dict]): Raw API drink records.
+            batch_size (int): Number of records written per transaction.
+
+        Returns:
+            int: The number of records written.
+        """
+        written = 0
+        batch: List[dict] = []
+        for drink_data in drinks:
+            batch.append(cls.row_from_api(drink_data))
+            if len(batch) >= batch_size:
+                written += cls._write_batch(batch)
+                batch = []
+        if batch:
+            written += cls._write_batch(batch)
+        logger.info("Ingested %d drinks into the catalog", written)
+        return written
+
+    @classmethod
+    def _write_batch(cls, rows: List[dict]) -> int:
+        # Deduplicate within the batch, keeping the last record for an id
+        rows = list({row["id"]: row for row in rows}.values())
+        ids = [row["id"] for row in rows]
+        existing = set(db.session.execute(select(cls.id).where(cls.id.in_(ids))).scalars())
+        new_rows = [row for row in rows if row["id"] not in existing]
+        updated_rows = [row for row in rows if row["id"] in existing]
+        try:
+            if new_rows:
+                db.session.execute(insert(cls), new_rows)
+            if updated_rows:
+                db.session.execute(update(cls), updated_rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Failed to write catalog batch: %s", e)
+            raise
+        return len(rows)
+
+
+def load_catalog_dump(path: str) -> List[dict]:
+    """
+    Load raw drink records from a JSON dump file.
+
+    The file may contain either a CocktailDB-style ``{"drinks": [...]}`` object
+    or a bare list of drink records.
+
+    Args:
+        path (str): Path to the JSON dump.
+
+    Returns:
+        List[dict]: The raw drink records.
+
+    Raises:
+        ValueError: If the file does not contain a list of drinks.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    drinks = data.get("drinks") if isinstance(data, dict) else data
+    if not isinstance(drinks, list):
+        raise ValueError(f"Catalog dump '{path}' does not contain a list of drinks")
+    return drinks
+
+
+def fetch_catalog_by_letter(letters: str = string.ascii_lowercase + string.digits) -> List[dict]:
+    """
+    Page through the CocktailDB search-by-first-letter endpoint.
+
+    Args:
+        letters (str): The first letters to request.
+
+    Returns:
+        List[dict]: All raw drink records returned, deduplicated by id.
+
+    Raises:
+        RuntimeError: If any page cannot be fetched.
+    """
+    drinks = {}
+    for letter in letters:
+        try:
+            response = http_client.get("search.php", params={"f": letter})
+            page = response.json().get("drinks") or []
+        except requests.RequestException as e:
+            logger.error("Failed to fetch catalog page '%s': %s", letter, e)
+            raise RuntimeError(f"Failed to fetch catalog page '{letter}': {e}")
+        logger.info("Fetched %d drinks for letter '%s'", len(page), letter)
+        for drink_data in page:
+            drinks[drink_data["idDrink"]] = drink_data
+    return list(drinks.values())
@@ -1,60 +1,75 @@
 import logging
-import requests
+import os
 from cocktail_maker.models.drink_model import Drink
 from typing import Optional, List
 
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from cocktail_maker.db import db
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.http_cache import BodyCache, SerializedBody
 from cocktail_maker.utils.logger import configure_logger
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Serialized /list-drinks bodies (and their compressed variants) per user id
+list_bodies = BodyCache(maxsize=int(os.getenv("DRINK_LIST_BODY_CACHE_SIZE", "1024")))
+
+
+class UserDrink(db.Model):
+    """
+    Membership of a drink in a user's drink list.
+
+    The primary key makes (user, drink) a set, and the unique index on
+    (user_id, name_normalized) serves both removal by name and the
+    alphabetical listing.
+    """
+    __tablename__ = 'user_drinks'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    drink_id = db.Column(db.Integer, primary_key=True)  # CocktailDB idDrink
+    name = db.Column(db.String(200), nullable=False)
+    name_normalized = db.Column(db.String(200), nullable=False)
+
+    user = db.relationship('Users', backref=db.backref('drinks', cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.Index('ix_user_drinks_user_name', 'user_id', 'name_normalized', unique=True),
+    )
+
+
 class DrinkListModel:
-    def __init__(self):
+    def __init__(self, user_id: int):
         """
-        Initialize the DrinkListModel with an empty list of drinks.
+        Initialize the DrinkListModel for one user's persistent drink list.
+
+        Args:
+            user_id (int): The id of the user owning the list.
         """
-        self.drinks = []
+        self.user_id = user_id
 
     def fetch_drink_by_name(self, drink_name: str) -> Optional[Drink]:
         """
-        Fetch drink details by name from an external API.
+        Fetch drink details by name, going through the shared drink cache before the external API.
 
         Args:
             drink_name (str): The name of the drink to fetch.
 
         Returns:
             Optional[Drink]: A Drink object if the drink is found, otherwise None.
+
+        Raises:
+            RuntimeError: If the external API request fails.
         """
-        url = f"https://www.thecocktaildb.com/api/json/v1/1/search.php?s={drink_name}"
-        response = requests.get(url)
-        data = response.json()
-        if data["drinks"]:
-            drink_data = data["drinks"][0]
-            ingredients = [
-                drink_data[f"strIngredient{i}"]
-                for i in range(1, 16)
-                if drink_data.get(f"strIngredient{i}")
-            ]
-            measures = [
-                drink_data[f"strMeasure{i}"]
-                for i in range(1, 16)
-                if drink_data.get(f"strMeasure{i}")
-            ]
-            return Drink(
-                id=int(drink_data["idDrink"]),
-                name=drink_data["strDrink"],
-                ingredients=ingredients,
-                measures=measures,
-                category=drink_data["strCategory"],
-                alcoholic=drink_data["strAlcoholic"],
-                glass=drink_data["strGlass"],
-                instructions=drink_data["strInstructions"],
-                thumbnail=drink_data["strDrinkThumb"],
-            )
-        return None
-    
+        try:
+            return Drink.fetch_by_name(drink_name)
+        except ValueError:
+            return None
+
     def add_drink(self, drink_name: str) -> str:
         """
-        Add a drink to the internal list by fetching it from the API.
+        Add a drink to the user's list by fetching it by name.
 
         Args:
             drink_name (str): The name of the drink to add.
@@ -63,14 +78,40 @@ class DrinkListModel:
             str: A message indicating the result of the operation.
         """
         drink = self.fetch_drink_by_name(drink_name)
-        if drink:
-            self.drinks.append(drink)
-            return f"Added {drink.name} to your list."
-        return "Drink not found."
-    
+        if not drink:
+            return "Drink not found."
+        if not self.add(drink):
+            return f"{drink.name} is already in your list."
+        return f"Added {drink.name} to your list."
+
+    def add(self, drink: Drink) -> bool:
+        """
+        Insert a fetched drink into the user's list.
+
+        Args:
+            drink (Drink): The drink to add.
+
+        Returns:
+            bool: True if the drink was added, False if it was already in the list.
+        """
+        db.session.add(UserDrink(
+            user_id=self.user_id,
+            drink_id=drink.id,
+            name=drink.name,
+            name_normalized=normalize_key(drink.name),
+        ))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.info("Drink %s already in list of user %s", drink.name, self.user_id)
+            return False
+        logger.info("Added drink %s to list of user %s", drink.name, self.user_id)
+        return True
+
     def remove_drink(self, drink_name: str) -> str:
         """
-        Remove a drink from the internal list by name.
+        Remove a drink from the user's list by name.
 
         Args:
             drink_name (str): The name of the drink to remove.
@@ -78,38 +119,52 @@ class DrinkListModel:
         Returns:
             str: A message indicating the result of the operation.
         """
-        for drink in self.drinks:
-            if drink.name.lower() == drink_name.lower():
-                self.drinks.remove(drink)
-                return f"Removed {drink.name} from your list."
-        return "Drink not found in the list."
-    
+        result = db.session.execute(
+            delete(UserDrink).where(
+                UserDrink.user_id == self.user_id,
+                UserDrink.name_normalized == normalize_key(drink_name),
+            )
+        )
+        db.session.commit()
+        if result.rowcount == 0:
+            return "Drink not found in the list."
+        return f"Removed {drink_name} from your list."
+
     def list_drinks_in_alphabetical_order(self) -> List[str]:
         """
-        List the names of all possible drinks in alphabetical order.
+        List the names of the drinks in the user's list in alphabetical order.
+
+        The ordering is read from the (user_id, name_normalized) index.
 
         Returns:
             List[str]: A list of drink names sorted alphabetically.
         """
-        sorted_drinks = sorted(self.drinks, key=lambda x: x.name.lower())
-        drink_names = []
+        return list(db.session.execute(
+            select(UserDrink.name)
+            .where(UserDrink.user_id == self.user_id)
+            .order_by(UserDrink.name_normalized)
+        ).scalars())
 
-        for drink in sorted_drinks:
-            drink_names.append(drink.name)
+    def serialized_list(self) -> SerializedBody:
+        """
+        The alphabetical drink list as a serialized response body.
 
-        return drink_names
-        sorted_drinks = sorted(self.drinks, key=lambda x: x.name.lower())
-        drink_names = []
+        The names are read on every call, but the body and its compressed
+        variants are only rebuilt when the list has changed since the last call.
 
-        for drink in sorted_drinks:
-            drink_names.append(drink.name)
+        Returns:
+            SerializedBody: The JSON array of drink names.
+        """
+        return list_bodies.get(self.user_id, self.list_drinks_in_alphabetical_order())
 
-        return drink_names
-    
+    @staticmethod
     def count_alcoholic_drinks(drink_names: List[str]) -> int:
         """
         Count the number of alcoholic drinks in a list of drink names.
 
+        The statuses are resolved with one batched call, so repeated names and
+        cached drinks cost no extra lookups and the rest are fetched concurrently.
+
         Args:
             drink_names (List[str]): A list of drink names to check.
 
@@ -120,18 +175,9 @@ class DrinkListModel:
             RuntimeError: If there is an error checking drink data.
         """
         try:
-            # Use the Drink class's is_drink_alcoholic function for each drink
-            count = 0
-            for name in drink_names:
-                try:
-                    if Drink.is_drink_alcoholic(name):
-                        count += 1
-                except ValueError:
-                    logger.warning("Skipping drink '%s' as it was not found.", name)
-                except Exception as e:
-                    logger.error("Error checking drink '%s': %s", name, e)
-                    raise RuntimeError(f"Error checking drink '{name}': {e}")
-            
+            statuses = Drink.get_alcoholic_statuses(drink_names)
+            count = sum(1 for name in drink_names if statuses[name])
+
             logger.info(
                 "Counted %d alcoholic drinks in the provided list of %d drinks.",
                 count, len(drink_names)
@@ -140,4 +186,4 @@ class DrinkListModel:
 
         except Exception as e:
             logger.error("Error counting alcoholic drinks: %s", e)
-            raise RuntimeError(f"Error counting alcoholic drinks: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Error counting alcoholic drinks: {e}")
@@ -1,132 +1,380 @@
-from dataclasses import asdict, dataclass
 import logging
-import requests
-from typing import Any, List
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from itertools import zip_longest
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from flask import current_app, has_app_context
+from sqlalchemy.exc import SQLAlchemyError
 
 from cocktail_maker.db import db
+from cocktail_maker.models.catalog_model import CatalogDrink
+from cocktail_maker.utils.alcoholic_index import AlcoholicIndex
+from cocktail_maker.utils.cache import NOT_FOUND, TTLCache, normalize_key
+from cocktail_maker.utils.catalog_stats import CatalogStats
+from cocktail_maker.utils.http_cache import SerializedBody
+from cocktail_maker.utils.ingredient_index import IngredientIndex
+from cocktail_maker.utils.lazy import LazyModule
 from cocktail_maker.utils.logger import configure_logger
-from cocktail_maker.utils.random_utils import fetch_random_drink_data
+from cocktail_maker.utils.metrics import Counters
+from cocktail_maker.utils.name_index import NameIndex
+from cocktail_maker.utils.popularity import PopularityTracker
+from cocktail_maker.utils.rate_limit import TokenBucket
+from cocktail_maker.utils.singleflight import SingleFlight
+from cocktail_maker.utils.random_utils import fetch_random_drink_data, fetch_random_drink_data_async
 from cocktail_maker.utils.random_utils import fetch_drinks_by_alcoholic
+from cocktail_maker.utils.warmer import CacheWarmer, DrinkPool, Revalidator
+
+# Imported on first use, so workers start without loading the HTTP client stack
+requests = LazyModule("requests")
+async_http_client = LazyModule("cocktail_maker.utils.async_http_client")
+http_client = LazyModule("cocktail_maker.utils.http_client")
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
-# In-memory storage for drinks
-in_memory_data = {}
-
-@dataclass
-class Drink():
-    __tablename__ = 'cocktails'
-    
-    id: int
-    name: str
-    category: str
-    alcoholic: str
-    glass: str
-    instructions: str
-    ingredients: List[str]
-    measures: List[str]
-    thumbnail: str
-
-    def to_dict(self):
+# Seconds past its TTL during which a drink is served at once while it is refetched in the background
+DRINK_STALE_WHILE_REVALIDATE = float(os.getenv("DRINK_STALE_WHILE_REVALIDATE", "86400"))
+# Seconds past its TTL during which a drink is still served when the refetch fails
+DRINK_STALE_IF_ERROR = float(os.getenv("DRINK_STALE_IF_ERROR", "2592000"))
+
+# In-memory LRU/TTL cache of Drink objects, keyed by normalized drink name. Expired
+# drinks stay, within maxsize, as long as either stale window may still serve them
+in_memory_data = TTLCache(
+    maxsize=int(os.getenv("DRINK_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("DRINK_CACHE_TTL", "3600")),
+    negative_ttl=float(os.getenv("DRINK_CACHE_NEGATIVE_TTL", "300")),
+    stale_ttl=max(DRINK_STALE_WHILE_REVALIDATE, DRINK_STALE_IF_ERROR),
+)
+
+# Responses answered from local data because the upstream was not asked or failed, by reason
+stale_served = Counters(("revalidating", "upstream_error", "random_fallback"))
+
+# Hash sets of the upstream alcoholic/non-alcoholic filter lists for O(1) classification
+alcoholic_index = AlcoholicIndex(
+    loader=lambda alcoholic: fetch_drinks_by_alcoholic(alcoholic),
+    max_age=float(os.getenv("ALCOHOLIC_INDEX_MAX_AGE", "3600")),
+)
+
+# Seconds after which the name and ingredient indexes reload the catalog mirror
+DRINK_INDEX_MAX_AGE = float(os.getenv("DRINK_INDEX_MAX_AGE", "3600"))
+
+# Ingredient -> drinks bitsets over the catalog mirror and every drink fetched since
+ingredient_index = IngredientIndex(max_age=DRINK_INDEX_MAX_AGE)
+
+# Prefix trie and trigram index over every known drink name
+name_index = NameIndex(
+    min_similarity=float(os.getenv("NAME_SEARCH_MIN_SIMILARITY", "0.3")),
+    max_age=DRINK_INDEX_MAX_AGE,
+)
+
+# Coalesces concurrent upstream searches for the same normalized drink name
+drink_fetches = SingleFlight()
+
+# Prefetched random drinks, each served once by /random-drink while the cache warmer refills the pool
+random_pool = DrinkPool(size=int(os.getenv("RANDOM_DRINK_POOL_SIZE", "10")))
+
+# Count-min sketch of requested drink names; the cache warmer keeps the most requested ones fresh
+popular_drinks = PopularityTracker(capacity=int(os.getenv("POPULAR_DRINKS_CAPACITY", "256")))
+
+# Upper bound on concurrent upstream lookups made by a single batch call
+ALCOHOLIC_LOOKUP_WORKERS = int(os.getenv("ALCOHOLIC_LOOKUP_WORKERS", "0"))  # 0: one per upstream connection
+
+class Category(str, Enum):
+    """CocktailDB drink categories; members compare equal to their API strings."""
+    COCKTAIL = "Cocktail"
+    ORDINARY_DRINK = "Ordinary Drink"
+    PUNCH_PARTY_DRINK = "Punch / Party Drink"
+    SHAKE = "Shake"
+    OTHER_UNKNOWN = "Other / Unknown"
+    COCOA = "Cocoa"
+    SHOT = "Shot"
+    COFFEE_TEA = "Coffee / Tea"
+    HOMEMADE_LIQUEUR = "Homemade Liqueur"
+    BEER = "Beer"
+    SOFT_DRINK = "Soft Drink"
+
+
+class Alcoholic(str, Enum):
+    """CocktailDB strAlcoholic values; members compare equal to their API strings."""
+    ALCOHOLIC = "Alcoholic"
+    NON_ALCOHOLIC = "Non alcoholic"
+    OPTIONAL_ALCOHOL = "Optional alcohol"
+
+
+_CATEGORIES = {member.value: member for member in Category}
+_ALCOHOLIC = {member.value: member for member in Alcoholic}
+
+# The numbered ingredient/measure keys of an API record, built once instead of per parse
+_SLOT_KEYS = tuple((f"strIngredient{i}", f"strMeasure{i}") for i in range(1, 16))
+
+# Columnar category/glass/ingredient statistics over the same drinks as the indexes; built once per change
+catalog_stats = CatalogStats(
+    categories=[member.value for member in Category],
+    alcoholic=[member.value for member in Alcoholic],
+    max_age=DRINK_INDEX_MAX_AGE,
+)
+
+
+class Drink:
+    """
+    A cocktail as returned by the CocktailDB API.
+
+    Instances are slotted and hold the ingredients as a tuple of
+    (ingredient, measure) pairs without the API's empty slots. Category and
+    alcoholic status are enum members and glass and ingredient names are
+    interned, so the strings repeated across drinks are stored once.
+    """
+    FIELDS = ("id", "name", "category", "alcoholic", "glass", "instructions", "pairs", "thumbnail")
+    # fetched_at, mirrored and the serialized response bodies are bookkeeping, not part of the drink's value
+    __slots__ = FIELDS + ("fetched_at", "mirrored", "_serialized", "_stale_serialized")
+
+    # Number of ingredient/measure slots in the API records and in ``to_dict``
+    SLOTS = 15
+
+    VALID_CATEGORIES = [member.value for member in Category]
+
+    def __init__(self, id: int, name: str, category: str, alcoholic: Optional[str], glass: Optional[str],
+                 instructions: Optional[str], ingredients: Iterable[Optional[str]] = (),
+                 measures: Iterable[Optional[str]] = (), thumbnail: Optional[str] = None):
+        pairs = tuple(
+            (sys.intern(ingredient), measure)
+            for ingredient, measure in zip_longest(ingredients, measures)
+            if ingredient
+        )
+        self._assign(id, name, category, alcoholic, glass, instructions, pairs, thumbnail)
+
+    def _assign(self, id, name, category, alcoholic, glass, instructions, pairs, thumbnail) -> None:
+        member = _CATEGORIES.get(category)
+        if member is None:
+            raise ValueError(
+                f"Invalid category '{category}'. Must be one of {', '.join(self.VALID_CATEGORIES)}."
+            )
+        self.id = id
+        self.name = name
+        self.category = member
+        # Values outside the enum are kept as (interned) strings rather than rejected
+        self.alcoholic = _ALCOHOLIC.get(alcoholic) or (sys.intern(alcoholic) if alcoholic else alcoholic)
+        self.glass = sys.intern(glass) if glass else glass
+        self.instructions = instructions
+        self.pairs = pairs
+        self.thumbnail = thumbnail
+        self.fetched_at = time.time()
+        self.mirrored = False
+        self._serialized = self._stale_serialized = None
+
+    @classmethod
+    def from_api(cls, drink_data: dict) -> "Drink":
+        """
+        Build a Drink from one entry of a CocktailDB "drinks" array.
+
+        This is the single parser for API records; empty ingredient slots are dropped.
+        """
+        get = drink_data.get
+        pairs = []
+        for ingredient_key, measure_key in _SLOT_KEYS:
+            ingredient = get(ingredient_key)
+            if ingredient:
+                pairs.append((sys.intern(ingredient), get(measure_key)))
+        drink = cls.__new__(cls)
+        drink._assign(
+            int(drink_data["idDrink"]),
+            drink_data["strDrink"],
+            drink_data["strCategory"],
+            drink_data["strAlcoholic"],
+            drink_data["strGlass"],
+            drink_data["strInstructions"],
+            tuple(pairs),
+            drink_data["strDrinkThumb"],
+        )
+        return drink
+
+    @classmethod
+    def from_dict(cls, drink_dict: dict) -> "Drink":
+        """
+        Build a Drink from the dictionary shape produced by ``to_dict``.
+        """
+        return cls(
+            id=drink_dict["id"],
+            name=drink_dict["name"],
+            category=drink_dict["category"],
+            alcoholic=drink_dict["alcoholic"],
+            glass=drink_dict["glass"],
+            instructions=drink_dict["instructions"],
+            ingredients=drink_dict["ingredients"],
+            measures=drink_dict["measures"],
+            thumbnail=drink_dict["thumbnail"],
+        )
+
+    @classmethod
+    def from_mirror(cls, row: dict) -> "Drink":
+        """
+        Build a Drink from a catalog mirror row, as returned by ``CatalogDrink.get_by_name``.
+
+        Mirror drinks never go stale, however old the row; the row's ingest
+        time is kept as ``fetched_at`` and sent as Last-Modified.
+        """
+        drink = cls.from_dict(row)
+        if row.get("fetched_at") is not None:
+            drink.fetched_at = row["fetched_at"]
+        drink.mirrored = True
+        return drink
+
+    @property
+    def ingredients(self) -> Tuple[str, ...]:
+        return tuple(ingredient for ingredient, _ in self.pairs)
+
+    @property
+    def measures(self) -> Tuple[Optional[str], ...]:
+        return tuple(measure for _, measure in self.pairs)
+
+    def to_dict(self) -> dict:
+        """
+        Return the drink in the API wrappers' wire format.
+
+        Ingredients and measures are padded back to the 15 slots clients expect.
+        """
+        padding = [None] * (self.SLOTS - len(self.pairs))
         return {
             "id": self.id,
             "name": self.name,
-            "category": self.category,
-            "alcoholic": self.alcoholic,
+            "category": self.category.value,
+            "alcoholic": getattr(self.alcoholic, "value", self.alcoholic),
             "glass": self.glass,
             "instructions": self.instructions,
-            "ingredients": self.ingredients,
-            "measures": self.measures,
+            "ingredients": [ingredient for ingredient, _ in self.pairs] + padding,
+            "measures": [measure for _, measure in self.pairs] + padding,
             "thumbnail": self.thumbnail
         }
 
-    VALID_CATEGORIES = [
-        "Cocktail",
-        "Ordinary Drink",
-        "Punch / Party Drink",
-        "Shake",
-        "Other / Unknown",
-        "Cocoa",
-        "Shot",
-        "Coffee / Tea",
-        "Homemade Liqueur",
-        "Beer",
-        "Soft Drink",
-    ]
-
-    def __post_init__(self):
-        if self.category not in self.VALID_CATEGORIES:
-            raise ValueError(
-                f"Invalid category '{self.category}'. Must be one of {', '.join(self.VALID_CATEGORIES)}."
+    def serialized(self, stale: bool = False) -> SerializedBody:
+        """
+        The ``{"status": "success", "drink": ...}`` body served by the drink routes.
+
+        It is serialized on first use and kept on the instance, with its ETag,
+        so cached drinks are never re-encoded; Last-Modified is when the drink
+        was fetched.
+
+        Args:
+            stale (bool): Whether the drink is served stale; the body then also
+                carries ``"stale": true``.
+        """
+        if stale:
+            serialized = self._stale_serialized
+            if serialized is None:
+                serialized = self._stale_serialized = SerializedBody.of(
+                    {"status": "success", "stale": True, "drink": self.to_dict()}, self.fetched_at
+                )
+            return serialized
+        serialized = self._serialized
+        if serialized is None:
+            serialized = self._serialized = SerializedBody.of(
+                {"status": "success", "drink": self.to_dict()}, self.fetched_at
             )
+        return serialized
+
+    def age(self) -> float:
+        """Seconds since the drink was fetched, or ingested into the catalog mirror."""
+        return time.time() - self.fetched_at
+
+    def stale_age(self) -> Optional[float]:
+        """
+        The drink's age if it has outlived the drink cache TTL, for the Age header of a stale response.
+
+        Returns:
+            Optional[float]: The age in seconds, or None while the drink is fresh or comes from the mirror.
+        """
+        if self.mirrored:
+            return None
+        age = self.age()
+        return age if age >= in_memory_data.ttl else None
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"Drink({fields})"
 
     def get_random_drink() -> dict:
         """
         Fetch a random cocktail from the API and return it as a Drink object.
 
+        When the API call fails, a random drink from the catalog mirror or one
+        fetched before is returned instead.
+
         Returns:
             dict: A Drink dictionary representation containing the cocktail details.
 
         Raises:
-            RuntimeError: If the API call fails or the response is invalid.
+            RuntimeError: If the API call fails and no drink is known locally.
         """
-        try:
-            # Fetch data from the API
-            cocktail_data = fetch_random_drink_data()  # API call for getting random drink
-            logger.debug("API response received: %s", cocktail_data)
-
-            # Parse the drink data from the API response
-            drink_data = cocktail_data["drinks"][0]
-            logger.info("Successfully fetched drink data: %s", drink_data.get("strDrink"))
-
-            # Extract ingredients and measures (include None values)
-            ingredients = [
-                drink_data.get(f"strIngredient{i}") for i in range(1, 16)
-            ]
-            measures = [
-                drink_data.get(f"strMeasure{i}") for i in range(1, 16)
-            ]
-
-            # Log mismatches in ingredients and measures if any
-            if len(ingredients) != len(measures):
-                logger.warning(
-                    "Mismatch between ingredients and measures. Ingredients: %d, Measures: %d. "
-                    "Ensuring alignment by including None values.",
-                    len(ingredients),
-                    len(measures),
-                )
+        return Drink.fetch_random().to_dict()
 
-            # Create a Drink object
-            drink = Drink(
-                id=int(drink_data["idDrink"]),
-                name=drink_data["strDrink"],
-                category=drink_data["strCategory"],
-                alcoholic=drink_data["strAlcoholic"],
-                glass=drink_data["strGlass"],
-                instructions=drink_data["strInstructions"],
-                ingredients=ingredients,
-                measures=measures,
-                thumbnail=drink_data["strDrinkThumb"],
-            )
-            logger.info("Successfully created Drink object: %s", drink.name)
+    @staticmethod
+    def fetch_random() -> "Drink":
+        """
+        Fetch a random cocktail like ``get_random_drink`` but return the cached Drink itself.
+
+        Raises:
+            RuntimeError: If the API call fails and no drink is known locally.
+        """
+        # Served from the prefetched pool when the cache warmer keeps one
+        pooled = random_pool.pop()
+        if pooled is not None:
+            return pooled
+        try:
+            return _fetch_random_drink()
+        except RuntimeError:
+            local = _random_local_drink()
+            if local is None:
+                raise
+            return local
 
-            # Store the drink in memory
-            in_memory_data[drink.name] = drink.to_dict()
-            logger.info("Stored drink '%s' in memory.", drink.name)
+    @staticmethod
+    async def get_random_drink_async() -> dict:
+        """
+        Non-blocking counterpart of ``get_random_drink`` for the ASGI serving mode.
+        """
+        return (await Drink.fetch_random_async()).to_dict()
 
-            # Returns a dictionary representation of the Drink
-            return drink.to_dict()
+    @staticmethod
+    async def fetch_random_async() -> "Drink":
+        """
+        Non-blocking counterpart of ``fetch_random`` for the ASGI serving mode.
+        """
+        pooled = random_pool.pop()
+        if pooled is not None:
+            return pooled
+        try:
+            cocktail_data = await fetch_random_drink_data_async()
+            return _store_random_drink(cocktail_data)
 
         except Exception as e:
             logger.error("Error fetching random drink: %s", e)
-            raise RuntimeError(f"Error fetching random drink: {e}")
+            local = _random_local_drink()
+            if local is None:
+                raise RuntimeError(f"Error fetching random drink: {e}")
+            return local
 
-    
     def get_drink_by_name(name: str) -> dict:
         """
-        Fetches drinks by name from the CocktailDB API and returns a dictionary representation of a Drink.
+        Fetches drinks by name and returns a dictionary representation of a Drink.
+
+        Lookups are served from the in-memory cache, then the local catalog mirror,
+        and only fall back to the CocktailDB API on a miss in both. A drink that
+        has outlived its TTL is served stale while it is refetched in the
+        background, or, once older, when refetching it fails.
 
         Args:
             name (str): The name of the drink to search for.
@@ -138,74 +386,73 @@ class Drink():
             ValueError: If no drinks are found for the given name or if the name input is invalid.
             RuntimeError: If the API request fails or returns an invalid response.
         """
-        # Check if the drink exists in memory
-        if name in in_memory_data:
-            return in_memory_data[name]
-
-        try:
-            # Fetch from the API
-            api_url = f"https://www.thecocktaildb.com/api/json/v1/1/search.php?s={name}"
-            response = requests.get(api_url)
-            response.raise_for_status()
-            cocktail_data = response.json()
-
-            drinks = cocktail_data.get("drinks")
-            if not drinks:
-                raise ValueError(f"Drink with name '{name}' not found")
-
-            drink_data = drinks[0]  # Assume the first drink matches
-
-            # Extract ingredients and measures, ensuring lists have 15 slots
-            ingredients = [
-                drink_data.get(f"strIngredient{i}") for i in range(1, 16)
-            ]
-            measures = [
-                drink_data.get(f"strMeasure{i}") for i in range(1, 16)
-            ]
-
-            # Create a Drink object
-            drink = Drink(
-                id=int(drink_data["idDrink"]),
-                name=drink_data["strDrink"],
-                category=drink_data["strCategory"],
-                alcoholic=drink_data["strAlcoholic"],
-                glass=drink_data["strGlass"],
-                instructions=drink_data["strInstructions"],
-                ingredients=ingredients,
-                measures=measures,
-                thumbnail=drink_data["strDrinkThumb"],
-            )
+        return Drink.fetch_by_name(name).to_dict()
 
-            # Store the drink in memory
-            in_memory_data[drink.name] = drink.to_dict()
+    @staticmethod
+    def fetch_by_name(name: str) -> "Drink":
+        """
+        Look a drink up like ``get_drink_by_name`` but return the cached Drink itself.
 
-            # Return a dictionary representation of the Drink
-            return drink.to_dict()
+        Raises:
+            ValueError: If no drinks are found for the given name.
+            RuntimeError: If the API request fails or returns an invalid response.
+        """
+        key = normalize_key(name)
+        drink = _fetch_by_name(name, key)
+        # Only names that resolve count, so the warmer never refetches a 404
+        popular_drinks.record(key)
+        return drink
 
-        except requests.RequestException as e:
-            logger.error("Failed to fetch drink by name '%s': %s", name, e)
-            raise RuntimeError(f"Failed to fetch drink by name '{name}': {e}")
+    @staticmethod
+    def refresh_by_name(name: str) -> "Drink":
+        """
+        Fetch a drink from the CocktailDB API even if it is cached, replacing the cached copy.
 
-        except ValueError as e:
-            logger.warning("Drink not found: %s", e)
-            raise
+        Raises:
+            ValueError: If no drinks are found for the given name.
+            RuntimeError: If the API request fails or returns an invalid response.
+        """
+        key = normalize_key(name)
+        return drink_fetches.do(key, lambda: _fetch_drink(name, key))
 
-        except Exception as e:
-            logger.error("Unexpected error fetching drink by name: %s", e)
-            raise RuntimeError(f"Unexpected error fetching drink by name: {e}")
+    @staticmethod
+    async def get_drink_by_name_async(name: str) -> dict:
+        """
+        Non-blocking counterpart of ``get_drink_by_name`` for the ASGI serving mode.
 
+        The cache and catalog mirror are consulted exactly as in the sync path;
+        only the upstream search is awaited on the event loop.
+        """
+        return (await Drink.fetch_by_name_async(name)).to_dict()
 
+    @staticmethod
+    async def fetch_by_name_async(name: str) -> "Drink":
+        """
+        Non-blocking counterpart of ``fetch_by_name`` for the ASGI serving mode.
+        """
+        key = normalize_key(name)
+        drink = await _fetch_by_name_async(name, key)
+        popular_drinks.record(key)
+        return drink
 
     def is_drink_alcoholic(drink_name: str) -> bool:
         """
-        Check if a drink is alcoholic based on its name by fetching its details from the CocktailDB API.
+        Check if a drink is alcoholic based on its name.
+
+        The alcoholic index answers in constant time for drinks on the CocktailDB
+        filter lists; drinks outside both lists, or any drink while the index is
+        still loading, fall back to a detail fetch.
         """
         try:
+            indexed = alcoholic_index.lookup(drink_name)
+            if indexed is not None:
+                return indexed
+
             # Fetch the drink details by name
             drink_details = Drink.get_drink_by_name(drink_name)
             alcoholic_status = drink_details["alcoholic"].lower()
             
-            logger.info(f"Alcoholic status for '{drink_name}': {alcoholic_status}")
+            logger.info("Alcoholic status for '%s': %s", drink_name, alcoholic_status)
             
             # Check the 'alcoholic' field in the drink details
             if alcoholic_status == "alcoholic":
@@ -213,12 +460,578 @@ class Drink():
             elif alcoholic_status == "non alcoholic":
                 return False
             else:
-                logger.warning(f"Unknown alcoholic status for drink '{drink_name}': {alcoholic_status}")
+                logger.warning("Unknown alcoholic status for drink '%s': %s", drink_name, alcoholic_status)
                 raise ValueError(f"Unknown alcoholic status for drink '{drink_name}'")
         
         except ValueError as e:
-            logger.warning(f"Validation error: {e}")
+            logger.warning("Validation error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error determining if drink '%s' is alcoholic: %s", drink_name, e)
+            raise RuntimeError(f"Error determining if drink '{drink_name}' is alcoholic: {e}")
+
+    @staticmethod
+    async def is_drink_alcoholic_async(drink_name: str) -> bool:
+        """
+        Non-blocking counterpart of ``is_drink_alcoholic`` for the ASGI serving mode.
+        """
+        try:
+            indexed = alcoholic_index.lookup(drink_name)
+            if indexed is not None:
+                return indexed
+
+            drink_details = await Drink.get_drink_by_name_async(drink_name)
+            status = _alcoholic_flag(drink_details["alcoholic"])
+            if status is None:
+                logger.warning("Unknown alcoholic status for drink '%s': %s", drink_name, drink_details["alcoholic"])
+                raise ValueError(f"Unknown alcoholic status for drink '{drink_name}'")
+            return status
+
+        except ValueError as e:
+            logger.warning("Validation error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error determining if drink '{drink_name}' is alcoholic: {e}")
+            logger.error("Error determining if drink '%s' is alcoholic: %s", drink_name, e)
             raise RuntimeError(f"Error determining if drink '{drink_name}' is alcoholic: {e}")
+
+    @staticmethod
+    def get_alcoholic_statuses(drink_names: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        Check whether each drink in a list is alcoholic, with as few round trips as possible.
+
+        Names are deduplicated by their normalized form. Drinks on the alcoholic
+        index, in the in-memory cache or in the local catalog mirror are answered
+        directly; the remaining names are looked up concurrently on a bounded
+        thread pool.
+
+        Args:
+            drink_names (List[str]): The drink names to check.
+
+        Returns:
+            Dict[str, Optional[bool]]: The status for each input name; None if the drink
+            was not found or has no definite alcoholic status.
+
+        Raises:
+            RuntimeError: If any upstream lookup fails.
+        """
+        unique_names = {}
+        for name in drink_names:
+            unique_names.setdefault(normalize_key(name), name)
+
+        statuses_by_key: Dict[str, Optional[bool]] = {}
+        misses = []
+        for key, name in unique_names.items():
+            indexed = alcoholic_index.lookup(key)
+            if indexed is not None:
+                statuses_by_key[key] = indexed
+                continue
+            cached = in_memory_data.get(key)
+            if cached is NOT_FOUND:
+                statuses_by_key[key] = None
+            elif cached is not None:
+                statuses_by_key[key] = _alcoholic_flag(cached.alcoholic)
+            else:
+                misses.append(key)
+
+        app = current_app._get_current_object() if has_app_context() else None
+        if misses and app is not None:
+            try:
+                mirrored = CatalogDrink.get_by_names(misses)
+            except SQLAlchemyError as e:
+                logger.warning("Catalog mirror batch lookup failed: %s", e)
+                mirrored = {}
+            for key, drink_dict in mirrored.items():
+                drink = Drink.from_mirror(drink_dict)
+                _cache_drink(key, drink)
+                statuses_by_key[key] = _alcoholic_flag(drink.alcoholic)
+            misses = [key for key in misses if key not in mirrored]
+
+        def lookup(key: str) -> Optional[bool]:
+            try:
+                if app is None:
+                    return Drink.is_drink_alcoholic(unique_names[key])
+                with app.app_context():
+                    return Drink.is_drink_alcoholic(unique_names[key])
+            except ValueError:
+                logger.warning("Skipping drink '%s' as it was not found.", unique_names[key])
+                return None
+
+        if misses:
+            workers = max(1, min(ALCOHOLIC_LOOKUP_WORKERS or http_client.POOL_SIZE, len(misses)))
+            logger.info("Looking up %d uncached drinks with %d workers", len(misses), workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for key, status in zip(misses, executor.map(lookup, misses)):
+                    statuses_by_key[key] = status
+
+        return {name: statuses_by_key[normalize_key(name)] for name in drink_names}
+
+    @staticmethod
+    def search_names(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Autocomplete and fuzzy-match a drink name against every locally known drink.
+
+        Answered from the name index over the catalog mirror and the drinks
+        fetched by this process; no upstream request is made.
+
+        Args:
+            query (str): A full or partial drink name, possibly misspelled.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"name", "match", "score"}`` entries, best first.
+        """
+        _ensure_indexes()
+        return name_index.search(query, limit)
+
+    @staticmethod
+    def find_by_ingredients(ingredients: List[str]) -> List[str]:
+        """
+        Find the known drinks that contain all of the given ingredients.
+
+        Answered from the ingredient index, which covers the catalog mirror and
+        every drink fetched by this process; no upstream request is made.
+
+        Args:
+            ingredients (List[str]): Ingredient names, matched case and whitespace insensitively.
+
+        Returns:
+            List[str]: The drink names in alphabetical order.
+        """
+        _ensure_indexes()
+        return ingredient_index.containing_all(ingredients)
+
+    @staticmethod
+    def find_makeable(pantry: List[str], max_missing: int = 0) -> List[Dict[str, Any]]:
+        """
+        Find the known drinks that can be made from a pantry with at most ``max_missing`` ingredients missing.
+
+        Only drinks that use at least one pantry ingredient are considered.
+
+        Args:
+            pantry (List[str]): The ingredients at hand.
+            max_missing (int): How many ingredients may be missing.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"name", "missing"}`` entries, fewest missing ingredients first.
+        """
+        _ensure_indexes()
+        return [
+            {"name": name, "missing": missing}
+            for name, missing in ingredient_index.makeable(pantry, max_missing)
+        ]
+
+    @staticmethod
+    def catalog_overview() -> Dict[str, Any]:
+        """
+        Count the known drinks by category, alcoholic status and glass.
+
+        Computed over the catalog mirror and the drinks fetched by this process,
+        and memoized until one of them changes.
+
+        Returns:
+            Dict[str, Any]: The counts, plus the distribution of ingredients per drink.
+        """
+        _ensure_indexes()
+        return catalog_stats.overview()
+
+    @staticmethod
+    def ingredient_frequency(limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        List the ingredients used by the most known drinks.
+
+        Args:
+            limit (int): Maximum number of ingredients.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"ingredient", "drinks"}`` entries, most used first.
+        """
+        _ensure_indexes()
+        return catalog_stats.ingredient_frequency(limit)
+
+    @staticmethod
+    def ingredient_pairs(ingredient: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        List the ingredient pairs that appear together in the most known drinks.
+
+        Args:
+            ingredient (Optional[str]): Only list pairs with this ingredient.
+            limit (int): Maximum number of pairs.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"ingredients", "drinks"}`` entries, most frequent first.
+
+        Raises:
+            ValueError: If ``ingredient`` is not used by any known drink.
+        """
+        _ensure_indexes()
+        pairs = catalog_stats.co_occurrence(ingredient, limit)
+        if pairs is None:
+            raise ValueError(f"No known drink uses '{ingredient}'.")
+        return pairs
+
+    @staticmethod
+    def find_similar(name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the known drinks whose ingredients are most like those of a drink.
+
+        The drink itself is looked up like ``fetch_by_name``; the neighbours are
+        ranked by the cosine similarity of TF-IDF weighted ingredient vectors over
+        the catalog mirror and the drinks fetched by this process.
+
+        Args:
+            name (str): The drink name.
+            limit (int): Maximum number of drinks.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"name", "score", "shared"}`` entries, most similar first.
+
+        Raises:
+            ValueError: If the drink is not found.
+            RuntimeError: If the drink is not known locally and the API request fails.
+        """
+        drink = Drink.fetch_by_name(name)
+        _ensure_indexes()
+        # A no-op unless the drink was cached before the statistics were cleared
+        _add_to_stats(drink)
+        return catalog_stats.similar(drink.id, limit)
+
+    @staticmethod
+    def precompute_similar(limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Rank the most similar drinks of every known drink in batches, memoizing them for ``find_similar``.
+
+        Args:
+            limit (int): Maximum number of drinks per list.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: The similar drinks keyed by drink name.
+        """
+        _ensure_indexes()
+        neighbours = catalog_stats.precompute_similar(limit)
+        names = catalog_stats.names()
+        return {names[drink_id]: similar for drink_id, similar in neighbours.items()}
+
+
+def _cache_drink(key: str, drink: Drink) -> None:
+    """
+    Cache a drink under ``key`` until it outlives the TTL, and add it to the name and ingredient indexes.
+    """
+    in_memory_data.set(key, drink, ttl=-_staleness(drink))
+    name_index.add(drink.name)
+    ingredient_index.add(drink.id, drink.name, drink.ingredients)
+    _add_to_stats(drink)
+
+
+def _add_to_stats(drink: Drink) -> None:
+    catalog_stats.add(drink.id, drink.name, drink.category.value,
+                      getattr(drink.alcoholic, "value", drink.alcoholic), drink.glass, drink.ingredients)
+
+
+def _ensure_indexes() -> None:
+    """
+    Load the catalog mirror into the drink indexes and statistics if any was never loaded or is stale.
+    """
+    if not has_app_context() or not (
+        name_index.needs_load() or ingredient_index.needs_load() or catalog_stats.needs_load()
+    ):
+        return
+    try:
+        rows = CatalogDrink.index_rows()
+    except SQLAlchemyError as e:
+        logger.warning("Could not load the catalog mirror into the drink indexes: %s", e)
+        return
+    name_index.load(row[1] for row in rows)
+    ingredient_index.load((drink_id, name, ingredients) for drink_id, name, _, _, _, ingredients in rows)
+    catalog_stats.load(rows)
+
+
+def _fetch_by_name(name: str, key: str) -> Drink:
+    local = _lookup_local(name, key)
+    if local is None:
+        # Concurrent misses for the same drink share a single upstream request
+        return drink_fetches.do(key, lambda: _search_drink(name, key))
+
+    staleness = _staleness(local)
+    if staleness <= 0:
+        return local
+    if staleness < DRINK_STALE_WHILE_REVALIDATE:
+        return _serve_while_revalidating(name, local)
+    try:
+        return drink_fetches.do(key, lambda: _fetch_drink(name, key))
+    except RuntimeError as e:
+        return _serve_on_error(name, local, staleness, e)
+
+
+async def _fetch_by_name_async(name: str, key: str) -> Drink:
+    local = _lookup_local(name, key)
+    staleness = _staleness(local) if local is not None else 0.0
+    if local is not None and staleness <= 0:
+        return local
+    if local is not None and staleness < DRINK_STALE_WHILE_REVALIDATE:
+        return _serve_while_revalidating(name, local)
+    if has_app_context():
+        # Hand the mirror's pooled connection back before waiting on the
+        # upstream, or concurrent requests exhaust the pool and block the loop
+        db.session.close()
+
+    if local is None:
+        return await drink_fetches.do_async(key, lambda: _search_drink_async(name, key))
+    try:
+        return await drink_fetches.do_async(key, lambda: _fetch_drink_async(name, key))
+    except RuntimeError as e:
+        return _serve_on_error(name, local, staleness, e)
+
+
+def _lookup_cached(name: str, key: str) -> Optional[Drink]:
+    """
+    Look a drink up in the in-memory cache only.
+
+    Raises:
+        ValueError: If the drink is cached as not found.
+    """
+    cached = in_memory_data.get(key)
+    if cached is NOT_FOUND:
+        logger.info("Drink '%s' served from negative cache", name)
+        raise ValueError(f"Drink with name '{name}' not found")
+    return cached
+
+
+def _lookup_local(name: str, key: str) -> Optional[Drink]:
+    """
+    Look a drink up in the in-memory cache and then the local catalog mirror.
+
+    Returns:
+        Optional[Drink]: The drink, or None if none of them knows the drink. A fetched
+        drink that outlived its TTL and is not in the mirror is returned stale.
+
+    Raises:
+        ValueError: If the drink is cached as not found.
+    """
+    cached = _lookup_cached(name, key)
+    if cached is not None:
+        return cached
+
+    # The catalog mirror needs an application context
+    if has_app_context():
+        try:
+            mirrored = CatalogDrink.get_by_name(name)
+        except SQLAlchemyError as e:
+            logger.warning("Catalog mirror lookup failed for '%s': %s", name, e)
+            mirrored = None
+        if mirrored is not None:
+            drink = Drink.from_mirror(mirrored)
+            _cache_drink(key, drink)
+            return drink
+    # The last known good copy, kept by the cache for as long as a stale window allows
+    return in_memory_data.get_stale(key)
+
+
+def _staleness(drink: Drink) -> float:
+    """
+    Seconds since ``drink`` outlived the drink cache TTL; zero or less while it is fresh.
+
+    Catalog mirror drinks count as just fetched, so they are cached for a full TTL and never revalidated.
+    """
+    if drink.mirrored:
+        return -in_memory_data.ttl
+    return drink.age() - in_memory_data.ttl
+
+
+def _serve_while_revalidating(name: str, drink: Drink) -> Drink:
+    """
+    Return a stale drink at once and refetch it in the background.
+    """
+    revalidator.schedule(name)
+    stale_served.inc("revalidating")
+    return drink
+
+
+def _serve_on_error(name: str, drink: Drink, staleness: float, error: RuntimeError) -> Drink:
+    """
+    Return a stale drink whose refetch failed, unless it outlived DRINK_STALE_IF_ERROR.
+
+    Raises:
+        RuntimeError: ``error``, if the drink is too old to serve.
+    """
+    if staleness >= DRINK_STALE_IF_ERROR:
+        raise error
+    logger.warning("Serving stale drink '%s' (%.0f s old): %s", name, drink.age(), error)
+    stale_served.inc("upstream_error")
+    return drink
+
+
+def _random_local_drink() -> Optional[Drink]:
+    """
+    Pick a random drink among the locally known ones, for when the upstream cannot provide one.
+
+    Returns:
+        Optional[Drink]: A drink from the catalog mirror or fetched before, or None if none is known.
+    """
+    _ensure_indexes()
+    # Names can be cached as not found, or be missing from the mirror after a failed lookup
+    for _ in range(3):
+        name = name_index.random_name()
+        if name is None:
+            return None
+        try:
+            drink = _lookup_local(name, normalize_key(name))
+        except ValueError:
+            continue
+        if drink is not None:
+            logger.warning("Upstream unavailable; serving locally known drink '%s' as the random drink", name)
+            stale_served.inc("random_fallback")
+            return drink
+    return None
+
+
+def _search_drink(name: str, key: str) -> Drink:
+    """
+    Fetch a drink from the search endpoint; runs once per key for concurrent callers.
+    """
+    # A flight that finished just before this one started has already cached the answer
+    cached = _lookup_cached(name, key)
+    if cached is not None:
+        return cached
+    return _fetch_drink(name, key)
+
+
+def _fetch_drink(name: str, key: str) -> Drink:
+    """
+    Fetch a drink from the search endpoint and cache it, whether or not it is cached already.
+    """
+    try:
+        # Fetch from the API
+        response = http_client.get("search.php", params={"s": name})
+        return _store_search_result(name, key, response.json())
+
+    except requests.RequestException as e:
+        logger.error("Failed to fetch drink by name '%s': %s", name, e)
+        raise RuntimeError(f"Failed to fetch drink by name '{name}': {e}")
+
+    except ValueError as e:
+        logger.warning("Drink not found: %s", e)
+        raise
+
+    except Exception as e:
+        logger.error("Unexpected error fetching drink by name: %s", e)
+        raise RuntimeError(f"Unexpected error fetching drink by name: {e}")
+
+
+async def _search_drink_async(name: str, key: str) -> Drink:
+    """
+    Non-blocking counterpart of ``_search_drink``.
+    """
+    cached = _lookup_cached(name, key)
+    if cached is not None:
+        return cached
+    return await _fetch_drink_async(name, key)
+
+
+async def _fetch_drink_async(name: str, key: str) -> Drink:
+    """
+    Non-blocking counterpart of ``_fetch_drink``.
+    """
+    try:
+        response = await async_http_client.get("search.php", params={"s": name})
+        return _store_search_result(name, key, response.json())
+
+    except requests.RequestException as e:
+        logger.error("Failed to fetch drink by name '%s': %s", name, e)
+        raise RuntimeError(f"Failed to fetch drink by name '{name}': {e}")
+
+    except ValueError as e:
+        logger.warning("Drink not found: %s", e)
+        raise
+
+    except Exception as e:
+        logger.error("Unexpected error fetching drink by name: %s", e)
+        raise RuntimeError(f"Unexpected error fetching drink by name: {e}")
+
+
+def _store_search_result(name: str, key: str, cocktail_data: dict) -> Drink:
+    """
+    Turn a search.php response into a Drink and cache it.
+
+    The drink is stored under both the requested and the canonical name; an
+    empty result is cached as not found, which also drops any stale copy, and
+    the name leaves the name index.
+
+    Raises:
+        ValueError: If the response contains no drinks.
+    """
+    drinks = cocktail_data.get("drinks")
+    if not drinks:
+        in_memory_data.set_negative(key)
+        name_index.remove(key)
+        raise ValueError(f"Drink with name '{name}' not found")
+
+    drink = Drink.from_api(drinks[0])  # Assume the first drink matches
+    _cache_drink(key, drink)
+    in_memory_data.set(normalize_key(drink.name), drink)
+    return drink
+
+
+def _fetch_random_drink() -> Drink:
+    """
+    Fetch a random drink from the API and cache it.
+
+    Raises:
+        RuntimeError: If the API call fails or the response is invalid.
+    """
+    try:
+        # Fetch data from the API
+        cocktail_data = fetch_random_drink_data()  # API call for getting random drink
+        return _store_random_drink(cocktail_data)
+
+    except Exception as e:
+        logger.error("Error fetching random drink: %s", e)
+        raise RuntimeError(f"Error fetching random drink: {e}")
+
+
+def _store_random_drink(cocktail_data: dict) -> Drink:
+    """
+    Turn a random.php response into a Drink and cache it.
+    """
+    drink_data = cocktail_data["drinks"][0]
+    logger.info("Successfully fetched drink data: %s", drink_data.get("strDrink"))
+
+    drink = Drink.from_api(drink_data)
+    _cache_drink(normalize_key(drink.name), drink)
+    logger.info("Stored drink '%s' in memory.", drink.name)
+    return drink
+
+
+def _alcoholic_flag(alcoholic_status: Optional[str]) -> Optional[bool]:
+    """
+    Map the API's strAlcoholic value to True/False, or None when it is not definite.
+    """
+    status = (alcoholic_status or "").lower()
+    if status == "alcoholic":
+        return True
+    if status == "non alcoholic":
+        return False
+    return None
+
+
+# Refetches the stale drinks served by fetch_by_name
+revalidator = Revalidator(
+    refresh=Drink.refresh_by_name,
+    workers=int(os.getenv("DRINK_REVALIDATE_WORKERS", "2")),
+    retry_after=float(os.getenv("DRINK_REVALIDATE_RETRY", "30")),
+)
+
+# Keeps the random drink pool full and the most requested drinks fresh; started by create_app
+cache_warmer = CacheWarmer(
+    pool=random_pool,
+    fetch_random=_fetch_random_drink,
+    popular=popular_drinks,
+    refresh=Drink.refresh_by_name,
+    expires_in=in_memory_data.expires_in,
+    is_negative=in_memory_data.is_negative,
+    budget=TokenBucket(
+        rate=float(os.getenv("DRINK_WARMER_REQUESTS_PER_MINUTE", "60")) / 60,
+        capacity=float(os.getenv("DRINK_WARMER_BURST", "20")),
+    ),
+    top_k=int(os.getenv("POPULAR_DRINKS_TOP_K", "50")),
+    refresh_ahead=float(os.getenv("DRINK_WARMER_REFRESH_AHEAD", "300")),
+)
@@ -1,10 +1,16 @@
-import hashlib
+import csv
+import io
+import json
 import logging
 import os
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
 
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError
 
-from cocktail_maker.db import db
+from cocktail_maker.db import db, db_operation
+from cocktail_maker.utils import passwords
+from cocktail_maker.utils.cache import NOT_FOUND, TTLCache
 from cocktail_maker.utils.logger import configure_logger
 
 
@@ -12,31 +18,111 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+class UserCredentials(NamedTuple):
+    id: int
+    salt: str
+    password: str
+
+
+# Formats accepted by bulk import and written by bulk export
+USER_RECORD_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = ("username", "salt", "password_hash")
+
+# Per-worker cache of username -> UserCredentials. Writes made by this worker
+# invalidate their entry; writes made by other workers are picked up once the
+# short TTL runs out (or straight away when a cached hash fails to verify).
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_MAXSIZE", "4096")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "10")),
+    negative_ttl=float(os.getenv("USER_CACHE_NEGATIVE_TTL", "1")),
+)
+
+
 class Users(db.Model):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
-    password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
+    password = db.Column(db.String(255), nullable=False)  # <algorithm>$<params>$<hex digest>
 
     @classmethod
     def _generate_hashed_password(cls, password: str) -> tuple[str, str]:
         """
-        Generates a salted, hashed password.
+        Generates a salted, hashed password using the configured KDF.
+
+        The hash runs on the bounded password hashing pool.
 
         Args:
             password (str): The password to hash.
 
         Returns:
             tuple: A tuple containing the salt and hashed password.
+
+        Raises:
+            PasswordHasherBusy: If the hashing pool is saturated.
         """
         salt = os.urandom(16).hex()
-        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
-        logger.debug(f"Generated salt: {salt}, Hashed password: {hashed_password}")
+        hashed_password = passwords.run(passwords.hash_password, password, salt)
+        logger.debug("Generated salt and %s password hash", hashed_password.split("$", 1)[0])
         return salt, hashed_password
 
     @classmethod
+    def _credentials(cls, username: str, use_cache: bool = True) -> UserCredentials:
+        """
+        Load the id, salt and password hash of a user, from ``user_cache`` when possible.
+
+        Only these three columns are selected, by the indexed username.
+
+        Args:
+            username (str): The username of the user.
+            use_cache (bool): Whether a cached entry may be used.
+
+        Returns:
+            UserCredentials: The user's id, salt and password hash.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        credentials = user_cache.get(username) if use_cache else None
+        if credentials is None:
+            row = db.session.execute(
+                select(cls.id, cls.salt, cls.password).where(cls.username == username)
+            ).first()
+            if row is None:
+                user_cache.set_negative(username)
+                credentials = NOT_FOUND
+            else:
+                credentials = UserCredentials(*row)
+                user_cache.set(username, credentials)
+        if credentials is NOT_FOUND:
+            logger.info("User %s not found", username)
+            raise ValueError(f"User {username} not found")
+        return credentials
+
+    @classmethod
+    def _update_credentials(cls, username: str, salt: str, hashed_password: str) -> bool:
+        """
+        Replace a user's salt and password hash with a single UPDATE by username.
+
+        Returns:
+            bool: True if a row was updated, False if the user no longer exists.
+        """
+        try:
+            result = db.session.execute(
+                update(cls).where(cls.username == username).values(salt=salt, password=hashed_password)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error: %s", str(e))
+            raise
+        finally:
+            user_cache.delete(username)
+        return result.rowcount == 1
+
+    @classmethod
+    @db_operation("users.create_user")
     def create_user(cls, username: str, password: str) -> None:
         """
         Create a new user with a salted, hashed password.
@@ -53,6 +139,7 @@ class Users(db.Model):
         try:
             db.session.add(new_user)
             db.session.commit()
+            user_cache.delete(username)  # drop a cached "not found"
             logger.info("User successfully added to the database: %s", username)
         except IntegrityError:
             db.session.rollback()
@@ -64,10 +151,15 @@ class Users(db.Model):
             raise
 
     @classmethod
+    @db_operation("users.check_password")
     def check_password(cls, username: str, password: str) -> bool:
         """
         Check if a given password matches the stored password for a user.
 
+        Verification runs on the bounded password hashing pool. Hashes in the
+        legacy SHA-256 format or with outdated cost settings are replaced
+        after a successful check.
+
         Args:
             username (str): The username of the user.
             password (str): The password to check.
@@ -77,15 +169,27 @@ class Users(db.Model):
 
         Raises:
             ValueError: If the user does not exist.
+            PasswordHasherBusy: If the hashing pool is saturated.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
-            logger.info("User %s not found", username)
-            raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        cached = username in user_cache
+        credentials = cls._credentials(username)
+        if not passwords.run(passwords.verify_password, password, credentials.salt, credentials.password):
+            if not cached:
+                return False
+            # The password may have been changed by another worker; check against the stored hash
+            fresh = cls._credentials(username, use_cache=False)
+            if fresh == credentials or not passwords.run(passwords.verify_password, password,
+                                                         fresh.salt, fresh.password):
+                return False
+            credentials = fresh
+
+        if passwords.needs_rehash(credentials.password):
+            cls._update_credentials(username, *cls._generate_hashed_password(password))
+            logger.info("Rehashed password for user %s with current settings", username)
+        return True
 
     @classmethod
+    @db_operation("users.delete_user")
     def delete_user(cls, username: str) -> None:
         """
         Delete a user from the database.
@@ -96,15 +200,20 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
-            logger.info("User %s not found", username)
-            raise ValueError(f"User {username} not found")
-        db.session.delete(user)
-        db.session.commit()
+        user = db.session.get(cls, cls._credentials(username).id)
+        try:
+            if user is None or user.username != username:  # deleted (and the id reused) by another worker
+                logger.info("User %s not found", username)
+                raise ValueError(f"User {username} not found")
+            # ORM delete so the user's saved drinks are removed with it
+            db.session.delete(user)
+            db.session.commit()
+        finally:
+            user_cache.delete(username)
         logger.info("User %s deleted successfully", username)
 
     @classmethod
+    @db_operation("users.get_id_by_username")
     def get_id_by_username(cls, username: str) -> int:
         """
         Retrieve the ID of a user by username.
@@ -118,13 +227,10 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
-            logger.info("User %s not found", username)
-            raise ValueError(f"User {username} not found")
-        return user.id
+        return cls._credentials(username).id
 
     @classmethod
+    @db_operation("users.update_password")
     def update_password(cls, username: str, new_password: str) -> None:
         """
         Update the password for a user.
@@ -136,20 +242,217 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        cls._credentials(username)  # fail fast, before paying for the hash
+
+        salt, hashed_password = cls._generate_hashed_password(new_password)
+        if not cls._update_credentials(username, salt, hashed_password):
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
+        logger.info("Password updated successfully for user: %s", username)
 
-        # Generate new salt and password hash
-        salt, hashed_password = cls._generate_hashed_password(new_password)
+    @classmethod
+    @db_operation("users.bulk_create")
+    def bulk_create(cls, records: Iterable[Tuple[int, Optional[dict]]], batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Create many users, one executemany INSERT and one transaction per batch.
 
-        # Update the fields
-        user.salt = salt
-        user.password = hashed_password
+        Each record has a ``username`` and either a plaintext ``password``, which
+        is hashed on every core with a fresh salt, or the ``salt`` and
+        ``password_hash`` written by ``export``. Rows that are malformed or whose
+        username already exists (in the database or earlier in the input) are
+        reported and skipped; the rest of the input is still imported.
 
-        # Commit the changes and refresh the session
-        db.session.commit()
-        db.session.refresh(user)  # Ensure the session reflects the latest changes
-        logger.debug("Updating password for %s. New salt: %s, New hashed password: %s", username, salt, hashed_password)
-        logger.info("Password updated successfully for user: %s", username)
+        Args:
+            records (Iterable[tuple]): (row number, record) pairs, as yielded by ``read_user_records``.
+            batch_size (int): Users hashed and written per transaction.
+
+        Returns:
+            dict: ``created`` (int) and ``failed``, a list of ``{"row", "username", "error"}`` in row order.
+        """
+        result: Dict[str, Any] = {"created": 0, "failed": []}
+        batch: List[Tuple[int, dict]] = []
+        for row, record in records:
+            error = cls._record_error(record)
+            if error:
+                username = record.get("username") if isinstance(record, dict) else None
+                result["failed"].append({"row": row, "username": username, "error": error})
+                continue
+            batch.append((row, record))
+            if len(batch) >= batch_size:
+                cls._create_batch(batch, result)
+                batch = []
+        if batch:
+            cls._create_batch(batch, result)
+        result["failed"].sort(key=lambda failure: failure["row"])
+        logger.info("Bulk import created %d users, %d rows failed", result["created"], len(result["failed"]))
+        return result
+
+    @staticmethod
+    def _record_error(record: Optional[dict]) -> Optional[str]:
+        if not isinstance(record, dict):
+            return "Malformed record"
+        username = record.get("username")
+        if not username or not isinstance(username, str) or len(username) > 80:
+            return "A username of at most 80 characters is required"
+        password = record.get("password")
+        if password:
+            if not isinstance(password, str) or len(password) > 1024:
+                return "A password must be a string of at most 1024 characters"
+            return None
+        salt, password_hash = record.get("salt"), record.get("password_hash")
+        if not (isinstance(salt, str) and isinstance(password_hash, str) and salt and password_hash
+                and len(salt) <= 32 and len(password_hash) <= 255):
+            return "Either password or salt and password_hash are required"
+        try:
+            passwords.parse_hash(password_hash)
+        except ValueError as e:
+            return f"Invalid password_hash: {e}"
+        return None
+
+    @classmethod
+    def _create_batch(cls, batch: List[Tuple[int, dict]], result: Dict[str, Any]) -> None:
+        names = [record["username"] for _, record in batch]
+        existing = set(db.session.execute(select(cls.username).where(cls.username.in_(names))).scalars())
+
+        pending: List[Tuple[int, dict]] = []
+        for row, record in batch:
+            username = record["username"]
+            if username in existing:
+                result["failed"].append({"row": row, "username": username,
+                                         "error": f"User with username '{username}' already exists"})
+                continue
+            existing.add(username)
+            pending.append((row, record))
+
+        to_hash = [(row, record) for row, record in pending if record.get("password")]
+        salts = [os.urandom(16).hex() for _ in to_hash]
+        hashes = passwords.hash_many([(record["password"], salt) for (_, record), salt in zip(to_hash, salts)])
+        hashed = {row: (salt, hashed_password) for (row, _), salt, hashed_password in zip(to_hash, salts, hashes)}
+        rows = []
+        for row, record in pending:
+            salt, hashed_password = hashed.get(row) or (record["salt"], record["password_hash"])
+            rows.append((row, {"username": record["username"], "salt": salt, "password": hashed_password}))
+        if not rows:
+            return
+
+        try:
+            db.session.execute(insert(cls), [values for _, values in rows])
+            db.session.commit()
+            result["created"] += len(rows)
+        except IntegrityError:
+            # A username was taken concurrently; insert the batch row by row to find it
+            db.session.rollback()
+            for row, values in rows:
+                try:
+                    db.session.execute(insert(cls), [values])
+                    db.session.commit()
+                    result["created"] += 1
+                except IntegrityError:
+                    db.session.rollback()
+                    result["failed"].append({"row": row, "username": values["username"],
+                                             "error": f"User with username '{values['username']}' already exists"})
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Failed to write user batch: %s", e)
+            raise
+        finally:
+            for _, values in rows:
+                user_cache.delete(values["username"])  # drop cached "not found" entries
+
+    @classmethod
+    def export(cls, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Stream every user as ``{"username", "salt", "password_hash"}``, in id order.
+
+        Users are read one page of ``batch_size`` at a time (keyset pagination on
+        the primary key), so memory does not grow with the table.
+
+        Args:
+            batch_size (int): Users read per query.
+
+        Yields:
+            dict: One record per user, importable with ``bulk_create``.
+        """
+        last_id = 0
+        while True:
+            page = cls._export_page(last_id, batch_size)
+            for row in page:
+                yield {"username": row.username, "salt": row.salt, "password_hash": row.password}
+            if len(page) < batch_size:
+                return
+            last_id = page[-1].id
+
+    @classmethod
+    @db_operation("users.export")
+    def _export_page(cls, after_id: int, limit: int) -> list:
+        return db.session.execute(
+            select(cls.id, cls.username, cls.salt, cls.password).where(cls.id > after_id).order_by(cls.id).limit(limit)
+        ).all()
+
+
+def read_user_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[dict]]]:
+    """
+    Parse user records from NDJSON (one JSON object per line) or CSV with a header row.
+
+    Records are read lazily, so input of any size streams through.
+
+    Args:
+        stream (TextIO): The input; for CSV, opened with ``newline=""``.
+        fmt (str): "ndjson" or "csv".
+
+    Returns:
+        Iterator[tuple]: (line number, record) pairs; the record is None for an unparsable line.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if fmt not in USER_RECORD_FORMATS:
+        raise ValueError(f"Unsupported user record format '{fmt}'")
+    if fmt == "csv":
+        return enumerate(csv.DictReader(stream), start=2)  # line 1 is the header
+    return _read_ndjson(stream)
+
+
+def _read_ndjson(stream: TextIO) -> Iterator[Tuple[int, Optional[dict]]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def write_user_records(records: Iterable[dict], fmt: str) -> Iterator[str]:
+    """
+    Render records from ``Users.export`` as NDJSON lines or CSV with a header row.
+
+    Args:
+        records (Iterable[dict]): The records to write.
+        fmt (str): "ndjson" or "csv".
+
+    Returns:
+        Iterator[str]: Chunks of output, one per record (after the CSV header).
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if fmt not in USER_RECORD_FORMATS:
+        raise ValueError(f"Unsupported user record format '{fmt}'")
+    if fmt == "csv":
+        return _write_csv(records)
+    return (json.dumps(record) + "\n" for record in records)
+
+
+def _write_csv(records: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, EXPORT_FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,208 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+_EMPTY: FrozenSet = frozenset()
+
+
+class AlcoholicIndex:
+    """
+    Constant-time alcoholic/non-alcoholic classification.
+
+    Holds the CocktailDB filter lists (``filter.php?a=Alcoholic`` and
+    ``filter.php?a=Non_Alcoholic``) as hash sets of normalized names. The
+    sets are swapped in atomically on each refresh, so readers never take a
+    lock, and lookups never wait for a load.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[bool], List[dict]],
+        max_age: float = 3600.0,
+        retry_interval: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            loader (Callable[[bool], List[dict]]): Returns the filter list for
+                alcoholic (True) or non-alcoholic (False) drinks.
+            max_age (float): Seconds after which the sets are reloaded on demand.
+            retry_interval (float): Seconds to wait before retrying a failed load.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        self._loader = loader
+        self.max_age = max_age
+        self.retry_interval = retry_interval
+        self._timer = timer
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loading_lock = threading.Lock()
+        self._loading: Optional[threading.Thread] = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget the loaded sets so the next lookup reloads them."""
+        # (alcoholic names, non-alcoholic names)
+        self._sets: Tuple[FrozenSet, FrozenSet] = (_EMPTY, _EMPTY)
+        self.loaded_at: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def refresh(self) -> None:
+        """
+        Reload both filter lists and swap in the new sets.
+
+        Raises:
+            RuntimeError: If either list cannot be fetched; the previous sets are kept.
+        """
+        with self._refresh_lock:
+            self._load()
+
+    def _load(self) -> None:
+        # Callers hold _refresh_lock
+        try:
+            alcoholic = self._loader(True) or []
+            non_alcoholic = self._loader(False) or []
+        except Exception as e:
+            self.failed_at = self._timer()
+            self.failures += 1
+            logger.error("Failed to refresh alcoholic index: %s", e)
+            raise RuntimeError(f"Failed to refresh alcoholic index: {e}")
+
+        self._sets = (
+            frozenset(normalize_key(d["strDrink"]) for d in alcoholic if d.get("strDrink")),
+            frozenset(normalize_key(d["strDrink"]) for d in non_alcoholic if d.get("strDrink")),
+        )
+        self.loaded_at = self._timer()
+        self.failed_at = None
+        self.refreshes += 1
+        logger.info(
+            "Alcoholic index refreshed: %d alcoholic, %d non-alcoholic drinks",
+            len(self._sets[0]), len(self._sets[1]),
+        )
+
+    def _needs_load(self, now: float) -> bool:
+        if self.loaded_at is not None and now - self.loaded_at < self.max_age:
+            return False
+        if self.failed_at is not None and now - self.failed_at < self.retry_interval:
+            return False
+        return True
+
+    def needs_refresh(self) -> bool:
+        """
+        Returns:
+            bool: True if the next lookup would load the sets from the upstream.
+        """
+        return self._needs_load(self._timer())
+
+    def ensure_fresh(self) -> bool:
+        """
+        Load the sets if they are missing or older than ``max_age``.
+
+        A failed load is not retried until ``retry_interval`` has passed, and
+        stale sets keep being served in the meantime.
+
+        Returns:
+            bool: True if the index holds data that can be used for lookups.
+        """
+        if self._needs_load(self._timer()):
+            with self._refresh_lock:
+                # Another thread may have loaded the sets while we waited
+                if self._needs_load(self._timer()):
+                    try:
+                        self._load()
+                    except RuntimeError:
+                        pass
+        return self.loaded_at is not None
+
+    def load_in_background(self) -> bool:
+        """
+        Run ``ensure_fresh`` in a daemon thread unless a load is already running.
+
+        Returns:
+            bool: True if a load was started.
+        """
+        with self._loading_lock:
+            if self._loading is not None and self._loading.is_alive():
+                return False
+            self._loading = threading.Thread(target=self.ensure_fresh, name="alcoholic-index-load", daemon=True)
+            self._loading.start()
+            return True
+
+    def wait_for_load(self, timeout: Optional[float] = None) -> None:
+        """Wait for a load started by ``load_in_background`` to finish."""
+        loading = self._loading
+        if loading is not None:
+            loading.join(timeout)
+
+    def lookup(self, name: str) -> Optional[bool]:
+        """
+        Classify a drink by name, without waiting on the upstream.
+
+        Missing or stale sets are loaded in the background. Until the first
+        load finishes every lookup returns None, so callers fall back to a
+        per-drink lookup.
+
+        Args:
+            name (str): The drink name.
+
+        Returns:
+            Optional[bool]: True/False if the drink is in one of the lists, None otherwise.
+        """
+        if self.needs_refresh():
+            self.load_in_background()
+        key = normalize_key(name)
+        alcoholic_names, non_names = self._sets
+        if key in alcoholic_names:
+            return True
+        if key in non_names:
+            return False
+        return None
+
+    def start(self, interval: float) -> None:
+        """
+        Refresh the index in a daemon thread every ``interval`` seconds.
+
+        Args:
+            interval (float): Seconds between refreshes.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except RuntimeError:
+                    pass
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="alcoholic-index-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the index sizes and refresh counters.
+        """
+        alcoholic_names, non_names = self._sets
+        return {
+            "alcoholic": len(alcoholic_names),
+            "non_alcoholic": len(non_names),
+            "age_seconds": None if self.loaded_at is None else self._timer() - self.loaded_at,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from cocktail_maker.utils.lazy import LazyModule
+from cocktail_maker.utils.logger import configure_logger
+
+requests = LazyModule("requests")
+http_client = LazyModule("cocktail_maker.utils.http_client")
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# One ClientSession per event loop; aiohttp sessions cannot be shared across loops
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+class AsyncResponse:
+    """The parts of a response the models use, read fully before the connection is released."""
+
+    def __init__(self, status_code: int, body: bytes):
+        self.status_code = status_code
+        self.content = body
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+def _get_session():
+    """
+    Return the aiohttp.ClientSession for the running loop, creating it on first use.
+
+    aiohttp is imported here rather than at module level, so the sync serving
+    mode never loads it.
+    """
+    loop = asyncio.get_running_loop()
+    client_session = _sessions.get(loop)
+    if client_session is None or client_session.closed:
+        import aiohttp
+
+        client_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=http_client.POOL_SIZE),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=http_client.CONNECT_TIMEOUT, sock_read=http_client.READ_TIMEOUT
+            ),
+        )
+        _sessions[loop] = client_session
+    return client_session
+
+
+async def aclose() -> None:
+    """Close the ClientSession of the running loop."""
+    client_session = _sessions.pop(asyncio.get_running_loop(), None)
+    if client_session is not None:
+        await client_session.close()
+
+
+async def get(path: str, params: Optional[Dict[str, Any]] = None) -> AsyncResponse:
+    """
+    Non-blocking counterpart of ``http_client.get``.
+
+    Uses the same base URL, timeouts, retry policy, circuit breaker, request
+    budget and latency histograms as the sync client, but waits on the event
+    loop instead of a worker thread. Errors are raised as the same ``requests``
+    exception types, so callers share their error handling with the sync path.
+
+    Args:
+        path (str): Endpoint path relative to the API base, e.g. "search.php".
+        params (Optional[dict]): Query string parameters.
+
+    Returns:
+        AsyncResponse: A successful (2xx) response.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker is open.
+        UpstreamBudgetExceeded: If the upstream request budget stays exhausted.
+        requests.RequestException: If the request still fails after all retries.
+    """
+    client_session = _get_session()
+    import aiohttp
+
+    url = f"{http_client.COCKTAILDB_BASE_URL}/{path}"
+    histogram = http_client.histogram_for(path.split(".", 1)[0])
+    breaker = http_client.breaker
+
+    for attempt in range(http_client.MAX_RETRIES + 1):
+        if not breaker.allow_request():
+            raise http_client.CircuitOpenError(f"Circuit breaker open for CocktailDB API; skipping {path}")
+        waited = 0.0
+        try:
+            while True:
+                delay = http_client.budget_delay(path, waited)
+                if not delay:
+                    break
+                await asyncio.sleep(delay)
+                waited += delay
+        except http_client.UpstreamBudgetExceeded:
+            breaker.cancel_request()
+            raise
+
+        start = time.perf_counter()
+        try:
+            async with client_session.get(url, params=params) as response:
+                body = await response.read()
+                status = response.status
+        except asyncio.TimeoutError:
+            error = requests.exceptions.Timeout(f"Request to {url} timed out")
+        except aiohttp.ClientError as e:
+            error = requests.exceptions.ConnectionError(str(e))
+        else:
+            if status < 400:
+                breaker.record_success()
+                return AsyncResponse(status, body)
+            error = requests.exceptions.HTTPError(f"{status} error for url: {url}")
+            if not http_client.is_retryable_status(status):
+                # The upstream answered; a client error is not an outage
+                breaker.record_success()
+                raise error
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+        breaker.record_failure()
+        if attempt == http_client.MAX_RETRIES:
+            raise error
+        delay = http_client.backoff_delay(attempt)
+        logger.warning("Retrying %s after error (attempt %d, sleeping %.3fs): %s", path, attempt + 1, delay, error)
+        await asyncio.sleep(delay)
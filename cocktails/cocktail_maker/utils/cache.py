@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class _NotFound:
+    """Sentinel stored for names the upstream API reported as not found."""
+
+    def __repr__(self) -> str:
+        return "NOT_FOUND"
+
+
+NOT_FOUND = _NotFound()
+
+
+def normalize_key(name: str) -> str:
+    """
+    Normalize a drink name so equivalent spellings share a cache entry.
+
+    Args:
+        name (str): The raw drink name, e.g. from a URL or request body.
+
+    Returns:
+        str: The name with surrounding/duplicate whitespace collapsed and case folded.
+    """
+    return " ".join(name.split()).casefold()
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache with a per-entry time-to-live.
+
+    Entries are evicted in least-recently-used order once ``maxsize`` is reached,
+    and are dropped lazily on access once their TTL has elapsed. Names that are
+    known not to exist can be cached as negative entries with their own TTL.
+    Expired positive entries can be kept for ``stale_ttl`` more seconds, within
+    the same ``maxsize``, as the last known good value returned by ``get_stale``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600.0,
+        negative_ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            maxsize (int): Maximum number of entries (positive and negative) held in memory.
+            ttl (float): Lifetime in seconds of a positive entry.
+            negative_ttl (float): Lifetime in seconds of a negative ("not found") entry.
+            stale_ttl (float): Seconds an expired positive entry is kept for ``get_stale``.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, refreshing its LRU position on a hit.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any): Value returned on a miss.
+
+        Returns:
+            Any: The cached value, ``NOT_FOUND`` for a negative entry, or ``default``.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            now = self._timer()
+            if expires_at <= now:
+                if value is NOT_FOUND or expires_at + self.stale_ttl <= now:
+                    del self._data[key]
+                    self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            if value is NOT_FOUND:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a positive entry, fresh or expired less than ``stale_ttl`` seconds ago,
+        without counting a lookup or refreshing its LRU position.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any): Value returned if there is no such entry.
+
+        Returns:
+            Any: The cached value, or ``default``.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] is NOT_FOUND:
+                return default
+            value, expires_at = entry
+            if expires_at + self.stale_ttl <= self._timer():
+                del self._data[key]
+                self.expirations += 1
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+            ttl (Optional[float]): Override for the default TTL, in seconds.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (value, self._timer() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted_key, _ = self._data.popitem(last=False)
+                self.evictions += 1
+                logger.debug("Evicted cache entry: %s", evicted_key)
+
+    def set_negative(self, key: Hashable) -> None:
+        """
+        Remember that a key does not exist upstream for ``negative_ttl`` seconds.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        self.set(key, NOT_FOUND, ttl=self.negative_ttl)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.negative_hits = self.misses = 0
+            self.evictions = self.expirations = 0
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """
+        Seconds until a positive entry expires, without counting a lookup or refreshing its LRU position.
+
+        Returns:
+            Optional[float]: The remaining lifetime, or None if the key is missing, expired or negative.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] is NOT_FOUND:
+                return None
+            remaining = entry[1] - self._timer()
+            return remaining if remaining > 0 else None
+
+    def is_negative(self, key: Hashable) -> bool:
+        """
+        Whether a key is currently cached as not found, without counting a lookup.
+
+        Returns:
+            bool: True for an unexpired negative entry.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] is NOT_FOUND and entry[1] > self._timer()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[1] > self._timer()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            dict: Hit, miss, eviction and expiration counts plus current size and hit ratio.
+        """
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,462 @@
+from __future__ import annotations  # np and sparse are unbound at import, so annotations stay unevaluated
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.logger import configure_logger
+
+# numpy and scipy.sparse, bound by _import_numpy() when the first columns are built rather than at start-up
+np: Any = None
+sparse: Any = None
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def _import_numpy() -> None:
+    global np, sparse
+    if sparse is None:
+        import numpy
+        from scipy import sparse as scipy_sparse
+        np, sparse = numpy, scipy_sparse
+
+
+# Label reported for drinks without a category, alcoholic status or glass
+UNKNOWN = "Unknown"
+
+# Drinks scored per sparse product when precomputing every drink's neighbours
+NEIGHBOUR_BATCH_SIZE = 256
+
+# (drink id) -> (name, category, alcoholic, glass, normalized ingredients)
+Row = Tuple[str, Optional[str], Optional[str], Optional[str], Tuple[str, ...]]
+
+
+def _factorize(values: Iterable[Optional[str]], count: int, labels: Sequence[str] = ()) -> Tuple[List[str], np.ndarray]:
+    """
+    Encode values as integer codes into a label list.
+
+    Args:
+        values (Iterable[Optional[str]]): One value per drink; None becomes UNKNOWN.
+        count (int): The number of values.
+        labels (Sequence[str]): Labels that get the first codes, so they are reported even when unused.
+
+    Returns:
+        Tuple[List[str], np.ndarray]: The labels and an int32 code per value.
+    """
+    codes_of = {label: code for code, label in enumerate(labels)}
+    codes = np.fromiter(
+        (codes_of.setdefault(value if value is not None else UNKNOWN, len(codes_of)) for value in values),
+        dtype=np.int32,
+        count=count,
+    )
+    return list(codes_of), codes
+
+
+def _ranks(keys: Sequence[str]) -> np.ndarray:
+    """Alphabetical rank of every key, used to break count ties."""
+    ranks = np.empty(len(keys), dtype=np.int64)
+    ranks[np.argsort(np.array(keys, dtype=object), kind="stable")] = np.arange(len(keys))
+    return ranks
+
+
+class _Columns:
+    """Columnar arrays built from one version of the rows."""
+    __slots__ = ("drinks", "ids", "positions", "names", "name_ranks", "categories", "category_codes",
+                 "alcoholic", "alcoholic_codes", "glasses", "glass_codes", "ingredient_columns",
+                 "ingredient_names", "ingredient_ranks", "matrix", "frequency", "co_occurrence", "_tfidf")
+
+    def __init__(self, rows: Dict[int, Row], ingredient_names: Dict[str, str],
+                 categories: Sequence[str], alcoholic: Sequence[str]):
+        count = self.drinks = len(rows)
+        self.ids = list(rows)
+        self.positions = {drink_id: position for position, drink_id in enumerate(self.ids)}
+        rows = list(rows.values())
+        self.names = [row[0] for row in rows]
+        self.name_ranks = _ranks([normalize_key(name) for name in self.names])
+        self.categories, self.category_codes = _factorize((row[1] for row in rows), count, categories)
+        self.alcoholic, self.alcoholic_codes = _factorize((row[2] for row in rows), count, alcoholic)
+        self.glasses, self.glass_codes = _factorize((row[3] for row in rows), count)
+
+        # Drink x ingredient incidence matrix in CSR form; each row lists its distinct ingredients
+        columns: Dict[str, int] = {}
+        indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.fromiter((len(row[4]) for row in rows), dtype=np.int64, count=count), out=indptr[1:])
+        indices = np.fromiter(
+            (columns.setdefault(key, len(columns)) for row in rows for key in row[4]),
+            dtype=np.int32,
+            count=int(indptr[-1]),
+        )
+        self.ingredient_columns = columns
+        self.ingredient_names = [ingredient_names[key] for key in columns]
+        self.ingredient_ranks = _ranks(list(columns))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr), shape=(count, len(columns))
+        )
+        self.frequency = np.bincount(indices, minlength=len(columns))
+        # Ingredient x ingredient counts of drinks using both; the diagonal repeats the frequency
+        self.co_occurrence = (self.matrix.T @ self.matrix).tocsr()
+        self._tfidf: Optional[sparse.csr_matrix] = None
+
+    @property
+    def tfidf(self) -> sparse.csr_matrix:
+        """
+        The drink x ingredient matrix weighted by smoothed inverse document frequency, rows L2-normalized.
+
+        Rare ingredients weigh more than ubiquitous ones, and the product of
+        two rows is the cosine similarity of the two drinks. Built on first use.
+        """
+        if self._tfidf is None:
+            idf = np.log((1 + self.drinks) / (1 + self.frequency)) + 1
+            weighted = sparse.csr_matrix(
+                (idf[self.matrix.indices], self.matrix.indices, self.matrix.indptr), shape=self.matrix.shape
+            )
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._tfidf = sparse.csr_matrix(sparse.diags(1 / norms) @ weighted)
+        return self._tfidf
+
+
+class CatalogStats:
+    """
+    Aggregate statistics over the known drinks, computed on columnar arrays.
+
+    Drinks are added incrementally like the name and ingredient indexes.
+    The first query after a change encodes the category, alcoholic status
+    and glass of every drink as integer codes and builds a sparse
+    drink x ingredient matrix, so counts are ``np.bincount`` calls and
+    ingredient co-occurrence is one sparse product. The same matrix,
+    TF-IDF weighted, scores drink-to-drink similarity. Query results are
+    memoized until the rows change again.
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[str] = (),
+        alcoholic: Sequence[str] = (),
+        max_age: float = 3600.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            categories (Sequence[str]): Categories always reported, with a count of 0 if unused.
+            alcoholic (Sequence[str]): Alcoholic statuses always reported, with a count of 0 if unused.
+            max_age (float): Seconds after which ``needs_load`` asks for a reload from the mirror.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        self.category_labels = tuple(categories)
+        self.alcoholic_labels = tuple(alcoholic)
+        self.max_age = max_age
+        self._timer = timer
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every drink."""
+        with self._lock:
+            self._rows: Dict[int, Row] = {}
+            self._ingredient_names: Dict[str, str] = {}  # normalized ingredient -> display name
+            self._version = 0
+            self._columns: Optional[_Columns] = None
+            self._memo: Dict[Hashable, Any] = {}
+            self.hits = 0
+            self.misses = 0
+            self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        drink_id: int,
+        name: str,
+        category: Optional[str],
+        alcoholic: Optional[str],
+        glass: Optional[str],
+        ingredients: Iterable[Optional[str]],
+    ) -> None:
+        """
+        Add a drink, replacing what was recorded for its id before.
+
+        Memoized results are dropped only if the drink is new or changed.
+
+        Args:
+            drink_id (int): The CocktailDB id.
+            name (str): The drink name returned by similarity queries.
+            category (Optional[str]): The drink category.
+            alcoholic (Optional[str]): The alcoholic status.
+            glass (Optional[str]): The serving glass.
+            ingredients (Iterable[Optional[str]]): Ingredient names; empty slots are skipped.
+        """
+        keys = {}
+        for ingredient in ingredients:
+            if ingredient:
+                keys.setdefault(normalize_key(ingredient), ingredient)
+        row = (name, category, alcoholic, glass, tuple(keys))
+        with self._lock:
+            if self._rows.get(drink_id) == row:
+                return
+            self._rows[drink_id] = row
+            for key, display in keys.items():
+                self._ingredient_names.setdefault(key, display)
+            self._version += 1
+            self._columns = None
+            self._memo.clear()
+
+    def load(self, drinks: Iterable[Tuple[Any, ...]]) -> int:
+        """
+        Add a batch of (id, name, category, alcoholic, glass, ingredients) records and mark the stats as loaded.
+
+        Returns:
+            int: The number of records added.
+        """
+        count = 0
+        for drink_id, name, category, alcoholic, glass, ingredients in drinks:
+            self.add(drink_id, name, category, alcoholic, glass, ingredients)
+            count += 1
+        self.loaded_at = self._timer()
+        logger.info("Catalog stats loaded %d drinks; %d known in total", count, len(self))
+        return count
+
+    def needs_load(self) -> bool:
+        """
+        Returns:
+            bool: True if the stats were never loaded or were loaded more than ``max_age`` ago.
+        """
+        return self.loaded_at is None or self._timer() - self.loaded_at >= self.max_age
+
+    def _current_columns(self) -> _Columns:
+        # Called with the lock held
+        if self._columns is None:
+            _import_numpy()
+            started = time.perf_counter()
+            self._columns = _Columns(self._rows, self._ingredient_names,
+                                     self.category_labels, self.alcoholic_labels)
+            logger.debug("Built catalog columns for %d drinks in %.1f ms",
+                         self._columns.drinks, (time.perf_counter() - started) * 1000)
+        return self._columns
+
+    def _memoized(self, key: Hashable, compute: Callable[[_Columns], Any]) -> Any:
+        """
+        Return the memoized result for ``key``, computing it from the current columns on a miss.
+        """
+        with self._lock:
+            if key in self._memo:
+                self.hits += 1
+                return self._memo[key]
+            self.misses += 1
+            result = self._memo[key] = compute(self._current_columns())
+            return result
+
+    def overview(self) -> Dict[str, Any]:
+        """
+        Counts by category, alcoholic status and glass, and the distribution of ingredients per drink.
+
+        Returns:
+            Dict[str, Any]: ``drinks``; ``categories`` and ``alcoholic`` as label -> count;
+            ``glasses`` as ``{"glass", "drinks"}`` entries, most used first; and
+            ``ingredients_per_drink`` with its mean, maximum and a histogram indexed by
+            ingredient count.
+        """
+        return self._memoized("overview", _overview)
+
+    def ingredient_frequency(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        The most used ingredients.
+
+        Args:
+            limit (int): Maximum number of ingredients.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"ingredient", "drinks"}`` entries, most used first and then alphabetically.
+        """
+        return self._memoized(("frequency", limit), lambda columns: _ingredient_frequency(columns, limit))
+
+    def co_occurrence(self, ingredient: Optional[str] = None, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """
+        The ingredient pairs used together most often, or the partners of one ingredient.
+
+        Args:
+            ingredient (Optional[str]): Only report pairs with this ingredient.
+            limit (int): Maximum number of pairs.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: ``{"ingredients": [a, b], "drinks"}`` entries, most
+            frequent first and then alphabetically; None if ``ingredient`` is unknown.
+        """
+        if ingredient is None:
+            return self._memoized(("pairs", limit), lambda columns: _top_pairs(columns, limit))
+        key = normalize_key(ingredient)
+        return self._memoized(("partners", key, limit), lambda columns: _partners(columns, key, limit))
+
+    def similar(self, drink_id: int, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        The drinks whose ingredients are most like those of one drink.
+
+        Similarity is the cosine of the drinks' TF-IDF ingredient vectors, so
+        sharing a rare ingredient counts for more than sharing sugar. One
+        query is a single sparse product of the drink's row with the matrix,
+        followed by an ``argpartition`` for the top ``limit``.
+
+        Args:
+            drink_id (int): The CocktailDB id of the drink.
+            limit (int): Maximum number of drinks.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: ``{"name", "score", "shared"}`` entries, most similar
+            first, where shared lists the common ingredients; drinks sharing no ingredient are
+            left out. None if the drink is unknown.
+        """
+        return self._memoized(("similar", drink_id, limit), lambda columns: _similar(columns, drink_id, limit))
+
+    def precompute_similar(
+        self, limit: int = 10, batch_size: int = NEIGHBOUR_BATCH_SIZE
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Compute the neighbours of every drink and memoize them for ``similar``.
+
+        Drinks are scored ``batch_size`` at a time with one sparse product per
+        batch, and each batch's top ``limit`` is selected with a row-wise
+        ``argpartition``. The lists are identical to what ``similar`` returns.
+
+        Args:
+            limit (int): Maximum number of neighbours per drink.
+            batch_size (int): Drinks scored per sparse product.
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: The neighbours of each drink id.
+        """
+        with self._lock:
+            columns = self._current_columns()
+            neighbours = {}
+            for start in range(0, columns.drinks, batch_size):
+                positions = np.arange(start, min(start + batch_size, columns.drinks))
+                for position, ranked in zip(positions, _ranked_neighbours(columns, positions, limit)):
+                    drink_id = columns.ids[position]
+                    neighbours[drink_id] = self._memo[("similar", drink_id, limit)] = ranked
+            logger.info("Precomputed the %d most similar drinks of %d drinks", limit, columns.drinks)
+            return neighbours
+
+    def names(self) -> Dict[int, str]:
+        """
+        Returns:
+            Dict[int, str]: The name of every known drink by id.
+        """
+        with self._lock:
+            return {drink_id: row[0] for drink_id, row in self._rows.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the number of drinks, the memo counters and the age of the data.
+        """
+        return {
+            "drinks": len(self._rows),
+            "version": self._version,
+            "memoized": len(self._memo),
+            "hits": self.hits,
+            "misses": self.misses,
+            "age_seconds": None if self.loaded_at is None else self._timer() - self.loaded_at,
+        }
+
+
+def _counts(labels: List[str], codes: np.ndarray) -> np.ndarray:
+    return np.bincount(codes, minlength=len(labels))
+
+
+def _overview(columns: _Columns) -> Dict[str, Any]:
+    glass_counts = _counts(columns.glasses, columns.glass_codes)
+    glass_order = np.lexsort((_ranks(columns.glasses), -glass_counts))
+    sizes = np.diff(columns.matrix.indptr)
+    return {
+        "drinks": columns.drinks,
+        "categories": dict(zip(columns.categories, _counts(columns.categories, columns.category_codes).tolist())),
+        "alcoholic": dict(zip(columns.alcoholic, _counts(columns.alcoholic, columns.alcoholic_codes).tolist())),
+        "glasses": [{"glass": columns.glasses[i], "drinks": int(glass_counts[i])} for i in glass_order],
+        "ingredients_per_drink": {
+            "mean": round(float(sizes.mean()), 2) if columns.drinks else 0.0,
+            "max": int(sizes.max()) if columns.drinks else 0,
+            "histogram": np.bincount(sizes).tolist(),
+        },
+    }
+
+
+def _ingredient_frequency(columns: _Columns, limit: int) -> List[Dict[str, Any]]:
+    order = np.lexsort((columns.ingredient_ranks, -columns.frequency))[:limit]
+    return [{"ingredient": columns.ingredient_names[i], "drinks": int(columns.frequency[i])} for i in order]
+
+
+def _top_pairs(columns: _Columns, limit: int) -> List[Dict[str, Any]]:
+    # Each unordered pair once, from the strict upper triangle
+    pairs = sparse.triu(columns.co_occurrence, k=1, format="coo")
+    ranks = columns.ingredient_ranks
+    first = np.where(ranks[pairs.row] <= ranks[pairs.col], pairs.row, pairs.col)
+    second = np.where(ranks[pairs.row] <= ranks[pairs.col], pairs.col, pairs.row)
+    order = np.lexsort((ranks[second], ranks[first], -pairs.data))[:limit]
+    names = columns.ingredient_names
+    return [
+        {"ingredients": [names[first[i]], names[second[i]]], "drinks": int(pairs.data[i])}
+        for i in order
+    ]
+
+
+def _partners(columns: _Columns, key: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+    column = columns.ingredient_columns.get(key)
+    if column is None:
+        return None
+    matrix = columns.co_occurrence
+    start, end = matrix.indptr[column], matrix.indptr[column + 1]
+    partners = matrix.indices[start:end]
+    counts = matrix.data[start:end]
+    keep = partners != column
+    partners, counts = partners[keep], counts[keep]
+    order = np.lexsort((columns.ingredient_ranks[partners], -counts))[:limit]
+    names = columns.ingredient_names
+    return [
+        {"ingredients": [names[column], names[partners[i]]], "drinks": int(counts[i])}
+        for i in order
+    ]
+
+
+def _similar(columns: _Columns, drink_id: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+    position = columns.positions.get(drink_id)
+    if position is None:
+        return None
+    return _ranked_neighbours(columns, np.array([position]), limit)[0]
+
+
+def _ranked_neighbours(columns: _Columns, positions: np.ndarray, limit: int) -> List[List[Dict[str, Any]]]:
+    """
+    The top ``limit`` neighbours of each drink in ``positions``, scored with one sparse product.
+    """
+    tfidf = columns.tfidf
+    # Sparse matrix times the dense query vectors; a single drink is one mat-vec
+    scores = np.ascontiguousarray((tfidf @ tfidf[positions].toarray().T).T)
+    scores[np.arange(len(positions)), positions] = 0  # a drink is not its own neighbour
+    limit = min(limit, columns.drinks - 1)
+    if limit <= 0:
+        return [[] for _ in positions]
+    top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+    results = []
+    for position, row, candidates in zip(positions, scores, top):
+        candidates = candidates[row[candidates] > 0]
+        # Rounded so float noise does not override the alphabetical tie-break
+        order = candidates[np.lexsort((columns.name_ranks[candidates], -np.round(row[candidates], 6)))]
+        own = set(_ingredient_columns(columns, position))
+        results.append([
+            {"name": columns.names[other], "score": round(float(row[other]), 3),
+             "shared": _shared_ingredients(columns, own, other)}
+            for other in order.tolist()
+        ])
+    return results
+
+
+def _ingredient_columns(columns: _Columns, position: int) -> List[int]:
+    matrix = columns.matrix
+    return matrix.indices[matrix.indptr[position]:matrix.indptr[position + 1]].tolist()
+
+
+def _shared_ingredients(columns: _Columns, own: Set[int], other: int) -> List[str]:
+    shared = own.intersection(_ingredient_columns(columns, other))
+    return [columns.ingredient_names[column] for column in sorted(shared, key=columns.ingredient_ranks.__getitem__)]
@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from cocktail_maker.utils.logger import configure_logger
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Bodies smaller than this are always sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+
+# Preferred content codings, best first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Marks a response served from a copy older than its cache lifetime (RFC 7234, section 5.5.1)
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize a response body exactly as Flask's ``jsonify`` does in production.
+
+    Keys are sorted and separators are compact, so a cached body is
+    byte-for-byte what the route would otherwise have produced.
+    """
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode() + b"\n"
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    # mtime=0 keeps the output, and with it the ETag, stable across processes
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+class SerializedBody:
+    """
+    A JSON response body serialized once, with a strong ETag and precompressed variants.
+
+    Compressed variants are built on first use and kept alongside the body, so
+    repeat responses cost neither serialization nor compression.
+    """
+    __slots__ = ("body", "etag", "last_modified", "last_modified_header", "_encoded", "_lock")
+
+    def __init__(self, body: bytes, last_modified: Optional[float] = None):
+        """
+        Args:
+            body (bytes): The serialized JSON body.
+            last_modified (Optional[float]): Unix time the underlying data last changed.
+        """
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.last_modified = last_modified
+        self.last_modified_header = formatdate(last_modified, usegmt=True) if last_modified is not None else None
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, obj: Any, last_modified: Optional[float] = None) -> "SerializedBody":
+        return cls(dumps(obj), last_modified)
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """
+        Return the body in the given content coding, compressing it on first use.
+        """
+        if encoding is None:
+            return self.body
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            with self._lock:
+                encoded = self._encoded.get(encoding)
+                if encoded is None:
+                    encoded = self._encoded[encoding] = _compress(self.body, encoding)
+        return encoded
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """
+        Return the strong ETag of one representation; each content coding gets its own.
+        """
+        return self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the preferred content coding allowed by an Accept-Encoding header.
+
+    Returns:
+        Optional[str]: "br" or "gzip", or None for an uncompressed response.
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if qualities.get(encoding, qualities.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[float]) -> bool:
+    """
+    Evaluate If-None-Match, or failing that If-Modified-Since, against a representation.
+
+    Args:
+        headers (Mapping[str, str]): Request headers; lower-case names are looked up.
+        etag (str): The representation's ETag.
+        last_modified (Optional[float]): Unix time the representation last changed.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 should be sent.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def respond(
+    payload: SerializedBody,
+    headers: Mapping[str, str],
+    status: int = 200,
+    compress: bool = False,
+    stale_age: Optional[float] = None,
+) -> Tuple[int, bytes, List[Tuple[str, str]]]:
+    """
+    Build a conditional, optionally compressed response for a serialized body.
+
+    Args:
+        payload (SerializedBody): The body to send.
+        headers (Mapping[str, str]): Request headers; lower-case names are looked up.
+        status (int): Status code of a full response.
+        compress (bool): Whether to offer gzip/brotli for bodies of at least COMPRESS_MIN_BYTES.
+        stale_age (Optional[float]): Set when the body is a stale copy; its age in seconds
+            is sent in ``Age`` along with ``Warning: 110``.
+
+    Returns:
+        Tuple[int, bytes, List[Tuple[str, str]]]: Status code, body and response headers.
+        The status is 304 with an empty body when the client's copy is current.
+    """
+    encoding = None
+    response_headers = []
+    if compress and len(payload.body) >= COMPRESS_MIN_BYTES:
+        encoding = negotiate(headers.get("accept-encoding"))
+        response_headers.append(("Vary", "Accept-Encoding"))
+
+    etag = payload.etag_for(encoding)
+    response_headers.append(("ETag", etag))
+    if payload.last_modified_header is not None:
+        response_headers.append(("Last-Modified", payload.last_modified_header))
+    if stale_age is not None:
+        response_headers.append(("Age", str(int(stale_age))))
+        response_headers.append(("Warning", STALE_WARNING))
+
+    if is_not_modified(headers, etag, payload.last_modified):
+        return 304, b"", response_headers
+
+    body = payload.encoded(encoding)
+    if encoding is not None:
+        response_headers.append(("Content-Encoding", encoding))
+    response_headers.append(("Content-Type", "application/json"))
+    response_headers.append(("Content-Length", str(len(body))))
+    return status, body, response_headers
+
+
+class BodyCache:
+    """
+    Serialized bodies keyed by an owner id, reused while the data they were built from is unchanged.
+
+    Each entry remembers the value it was serialized from. Callers pass the
+    current value on every request, so a change made by another process is
+    picked up on the next read instead of being served stale.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: Dict[Any, Tuple[Any, SerializedBody]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, owner: Any, value: Any) -> SerializedBody:
+        """
+        Return the serialized body of ``value``, building it only if ``value`` changed.
+
+        Args:
+            owner (Any): The cache key, e.g. a user id.
+            value (Any): The JSON-serializable data; compared by equality with the cached one.
+        """
+        entry = self._entries.get(owner)
+        if entry is not None and entry[0] == value:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        # No Last-Modified: another process may have changed and restored the data since
+        payload = SerializedBody.of(value)
+        with self._lock:
+            if owner not in self._entries and len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order; drop the oldest entry
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[owner] = (value, payload)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,268 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cocktail_maker.utils.logger import configure_logger
+from cocktail_maker.utils.metrics import Counters, Histogram
+from cocktail_maker.utils.rate_limit import SQLiteTokenBucket, Throttle, TokenBucket
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+COCKTAILDB_BASE_URL = os.getenv("COCKTAILDB_BASE_URL", "https://www.thecocktaildb.com/api/json/v1/1")
+POOL_SIZE = int(os.getenv("COCKTAILDB_POOL_SIZE", "20"))
+CONNECT_TIMEOUT = float(os.getenv("COCKTAILDB_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("COCKTAILDB_READ_TIMEOUT", "5"))
+MAX_RETRIES = int(os.getenv("COCKTAILDB_MAX_RETRIES", "2"))
+BACKOFF_BASE = float(os.getenv("COCKTAILDB_BACKOFF_BASE", "0.1"))
+BACKOFF_MAX = float(os.getenv("COCKTAILDB_BACKOFF_MAX", "2"))
+BREAKER_THRESHOLD = int(os.getenv("COCKTAILDB_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("COCKTAILDB_BREAKER_RESET_TIMEOUT", "30"))
+# Upstream request budget in requests per second; 0 disables it
+RATE_LIMIT = float(os.getenv("COCKTAILDB_RATE_LIMIT", "0"))
+RATE_LIMIT_BURST = float(os.getenv("COCKTAILDB_RATE_LIMIT_BURST", "10"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("COCKTAILDB_RATE_LIMIT_MAX_WAIT", "2"))
+# SQLite file that makes the budget global to all workers on the host; unset keeps it per process
+RATE_LIMIT_DB = os.getenv("COCKTAILDB_RATE_LIMIT_DB")
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class UpstreamBudgetExceeded(requests.exceptions.ConnectionError):
+    """Raised without touching the network when no upstream request token frees up in time."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``threshold`` consecutive failures the breaker opens and calls fail fast.
+    Once ``reset_timeout`` seconds have passed a single trial call is let through
+    (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0, timer=time.monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._timer = timer
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the breaker and forget previous failures."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = 0.0
+            self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """
+        Returns:
+            bool: True if a call may go to the network now.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._timer() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def cancel_request(self) -> None:
+        """Give back an allowed call that was never made, so a half-open trial is not lost."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Circuit breaker opened after %d consecutive failures", self.failures)
+                self.state = self.OPEN
+                self.opened_at = self._timer()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+def _build_session() -> requests.Session:
+    """
+    Create the shared keep-alive session with a connection pool sized by POOL_SIZE.
+    """
+    http_session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+    http_session.mount("https://", adapter)
+    http_session.mount("http://", adapter)
+    return http_session
+
+
+def _build_throttle() -> Optional[Throttle]:
+    """
+    Create the upstream request budget configured by the COCKTAILDB_RATE_LIMIT* variables, if any.
+    """
+    if RATE_LIMIT <= 0:
+        return None
+    if RATE_LIMIT_DB:
+        bucket = SQLiteTokenBucket(RATE_LIMIT_DB, "cocktaildb", rate=RATE_LIMIT, capacity=RATE_LIMIT_BURST)
+    else:
+        bucket = TokenBucket(rate=RATE_LIMIT, capacity=RATE_LIMIT_BURST)
+    return Throttle(bucket, max_wait=RATE_LIMIT_MAX_WAIT)
+
+
+session = _build_session()
+breaker = CircuitBreaker(threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT)
+throttle = _build_throttle()
+# Upstream error responses by kind; "throttled" counts 429 Too Many Requests
+upstream_responses = Counters(("throttled",))
+
+# Upstream latency per endpoint ("random", "search", "filter", ...)
+latency_histograms: Dict[str, Histogram] = {}
+_histogram_lock = threading.Lock()
+
+
+def histogram_for(endpoint: str) -> Histogram:
+    histogram = latency_histograms.get(endpoint)
+    if histogram is None:
+        with _histogram_lock:
+            histogram = latency_histograms.setdefault(endpoint, Histogram())
+    return histogram
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay in seconds for a retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """
+    Whether an error status means the upstream is failing or throttling us, rather than rejecting the request.
+    """
+    if status_code == 429:
+        upstream_responses.inc("throttled")
+        return True
+    return status_code >= 500
+
+
+def budget_delay(path: str, waited: float) -> float:
+    """
+    Take an upstream request token, or return how long to sleep before trying again.
+
+    Args:
+        path (str): The endpoint being requested, for the error message.
+        waited (float): Seconds already spent waiting for this request.
+
+    Returns:
+        float: 0 once a token was taken (or no budget is configured), otherwise the seconds to sleep.
+
+    Raises:
+        UpstreamBudgetExceeded: If no token frees up within RATE_LIMIT_MAX_WAIT seconds.
+    """
+    if throttle is None:
+        return 0.0
+    delay = throttle.delay(waited)
+    if delay is None:
+        logger.warning("Upstream request budget exhausted; skipping %s", path)
+        raise UpstreamBudgetExceeded(f"Upstream request budget for CocktailDB API exhausted; skipping {path}")
+    return delay
+
+
+def get(path: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+    """
+    Perform a GET against the CocktailDB API through the shared session.
+
+    Timeouts, connection errors, 5xx and 429 responses are retried with jittered
+    exponential backoff. Every failed attempt counts towards the circuit breaker.
+    Every attempt first takes a token from the upstream request budget, waiting
+    up to RATE_LIMIT_MAX_WAIT seconds for one.
+
+    Args:
+        path (str): Endpoint path relative to the API base, e.g. "search.php".
+        params (Optional[dict]): Query string parameters.
+
+    Returns:
+        requests.Response: A successful (2xx) response.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker is open.
+        UpstreamBudgetExceeded: If the upstream request budget stays exhausted.
+        requests.RequestException: If the request still fails after all retries.
+    """
+    url = f"{COCKTAILDB_BASE_URL}/{path}"
+    histogram = histogram_for(path.split(".", 1)[0])
+
+    for attempt in range(MAX_RETRIES + 1):
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit breaker open for CocktailDB API; skipping {path}")
+        waited = 0.0
+        try:
+            while True:
+                delay = budget_delay(path, waited)
+                if not delay:
+                    break
+                time.sleep(delay)
+                waited += delay
+        except UpstreamBudgetExceeded:
+            breaker.cancel_request()
+            raise
+
+        start = time.perf_counter()
+        try:
+            response = session.get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            response.raise_for_status()
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            error = e
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or not is_retryable_status(e.response.status_code):
+                # The upstream answered; a client error is not an outage
+                breaker.record_success()
+                raise
+            error = e
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+            return response
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+        breaker.record_failure()
+        if attempt == MAX_RETRIES:
+            raise error
+        delay = backoff_delay(attempt)
+        logger.warning("Retrying %s after error (attempt %d, sleeping %.3fs): %s", path, attempt + 1, delay, error)
+        time.sleep(delay)
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Snapshot of the circuit breaker, request budget and upstream latency histograms.
+    """
+    return {
+        "circuit_breaker": breaker.stats(),
+        "request_budget": throttle.stats() if throttle is not None else None,
+        "throttled_responses": upstream_responses["throttled"],
+        "latency_seconds": {endpoint: h.snapshot() for endpoint, h in latency_histograms.items()},
+    }
@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def _bits(bitset: int) -> Iterator[int]:
+    """Yield the positions of the set bits, lowest first."""
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+def _at_least(counter: List[int], threshold: int, universe: int) -> int:
+    """
+    Positions whose bit-sliced counter value is >= ``threshold``.
+
+    ``counter[i]`` holds bit i of every position's count, as produced by
+    repeatedly adding bitsets with carries.
+    """
+    if threshold <= 0:
+        return universe
+    if threshold >= 1 << len(counter):
+        return 0
+    greater, equal = 0, universe
+    for i in reversed(range(len(counter))):
+        if threshold >> i & 1:
+            equal &= counter[i]
+        else:
+            greater |= equal & counter[i]
+            equal &= ~counter[i]
+    return greater | equal
+
+
+class IngredientIndex:
+    """
+    Inverted index from normalized ingredient name to the drinks that use it.
+
+    Every known drink gets a bit position and each posting is a Python int
+    with the bits of its drinks set. "Contains all of" is then a chain of
+    ``&``, and the pantry search counts each drink's matching ingredients
+    with bit-sliced addition over the pantry's postings rather than visiting
+    the drinks one by one. Drinks are added incrementally as they are
+    fetched; adding a known id replaces its ingredients.
+    """
+
+    def __init__(self, max_age: float = 3600.0, timer: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_age (float): Seconds after which ``needs_load`` asks for a reload from the mirror.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        self.max_age = max_age
+        self._timer = timer
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every drink."""
+        with self._lock:
+            self._positions: Dict[int, int] = {}  # drink id -> bit position
+            self._names: List[str] = []  # bit position -> drink name
+            self._sort_keys: List[str] = []  # bit position -> normalized drink name
+            # bit position -> (display name, normalized name) of each ingredient
+            self._ingredients: List[Tuple[Tuple[str, str], ...]] = []
+            self._postings: Dict[str, int] = {}  # normalized ingredient -> drinks
+            self._by_size: Dict[int, int] = {}  # number of ingredients -> drinks
+            self._all = 0
+            self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, drink_id: int, name: str, ingredients: Iterable[Optional[str]]) -> None:
+        """
+        Index a drink, replacing what was indexed for its id before.
+
+        Args:
+            drink_id (int): The CocktailDB id.
+            name (str): The drink name returned in results.
+            ingredients (Iterable[Optional[str]]): Ingredient names; empty slots are skipped.
+        """
+        entries = {}
+        for ingredient in ingredients:
+            if ingredient:
+                entries.setdefault(normalize_key(ingredient), ingredient)
+        ingredients_of = tuple((display, key) for key, display in entries.items())
+
+        with self._lock:
+            position = self._positions.get(drink_id)
+            if position is None:
+                position = self._positions[drink_id] = len(self._names)
+                self._names.append(name)
+                self._sort_keys.append(normalize_key(name))
+                self._ingredients.append(())
+                self._all |= 1 << position
+            bit = 1 << position
+
+            old = self._ingredients[position]
+            self._names[position] = name
+            self._sort_keys[position] = normalize_key(name)
+            if old == ingredients_of:
+                return
+            for _, key in old:
+                self._postings[key] &= ~bit
+            if old:
+                self._by_size[len(old)] &= ~bit
+
+            for _, key in ingredients_of:
+                self._postings[key] = self._postings.get(key, 0) | bit
+            self._by_size[len(ingredients_of)] = self._by_size.get(len(ingredients_of), 0) | bit
+            self._ingredients[position] = ingredients_of
+
+    def load(self, drinks: Iterable[Tuple[int, str, Iterable[Optional[str]]]]) -> int:
+        """
+        Index a batch of (id, name, ingredients) records and mark the index as loaded.
+
+        Returns:
+            int: The number of records indexed.
+        """
+        count = 0
+        for drink_id, name, ingredients in drinks:
+            self.add(drink_id, name, ingredients)
+            count += 1
+        self.loaded_at = self._timer()
+        logger.info("Ingredient index loaded %d drinks; %d indexed in total", count, len(self))
+        return count
+
+    def needs_load(self) -> bool:
+        """
+        Returns:
+            bool: True if the index was never loaded or was loaded more than ``max_age`` ago.
+        """
+        return self.loaded_at is None or self._timer() - self.loaded_at >= self.max_age
+
+    def _posting(self, ingredient: str) -> int:
+        return self._postings.get(normalize_key(ingredient), 0)
+
+    def containing_all(self, ingredients: Iterable[str]) -> List[str]:
+        """
+        Find the drinks that use every one of the given ingredients.
+
+        Args:
+            ingredients (Iterable[str]): Ingredient names, matched case and whitespace insensitively.
+
+        Returns:
+            List[str]: The matching drink names in alphabetical order.
+        """
+        matches = self._all
+        for ingredient in ingredients:
+            matches &= self._posting(ingredient)
+            if not matches:
+                return []
+        positions = sorted(_bits(matches), key=self._sort_keys.__getitem__)
+        return [self._names[position] for position in positions]
+
+    def makeable(self, pantry: Iterable[str], max_missing: int = 0) -> List[Tuple[str, List[str]]]:
+        """
+        Find the drinks that use at least one pantry ingredient and lack at most ``max_missing``.
+
+        Args:
+            pantry (Iterable[str]): The ingredients at hand.
+            max_missing (int): How many of a drink's ingredients may be missing from the pantry.
+
+        Returns:
+            List[Tuple[str, List[str]]]: (drink name, missing ingredients) pairs, fewest
+            missing first and then alphabetically.
+        """
+        pantry_keys = {normalize_key(ingredient) for ingredient in pantry}
+        # Bit-sliced count of each drink's ingredients that are in the pantry
+        counter: List[int] = []
+        for key in pantry_keys:
+            carry = self._postings.get(key, 0)
+            for i, digit in enumerate(counter):
+                if not carry:
+                    break
+                counter[i], carry = digit ^ carry, digit & carry
+            if carry:
+                counter.append(carry)
+
+        # Drinks with at least one pantry ingredient
+        universe = 0
+        for digit in counter:
+            universe |= digit
+
+        matches = 0
+        for size, drinks in list(self._by_size.items()):
+            candidates = drinks & universe
+            if candidates:
+                matches |= _at_least(counter, size - max_missing, candidates)
+
+        results = []
+        for position in _bits(matches):
+            missing = [display for display, key in self._ingredients[position] if key not in pantry_keys]
+            results.append((len(missing), self._sort_keys[position], self._names[position], missing))
+        results.sort()
+        return [(name, missing) for _, _, name, missing in results]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the index size and age.
+        """
+        return {
+            "drinks": len(self._positions),
+            "ingredients": sum(1 for posting in self._postings.values() if posting),
+            "age_seconds": None if self.loaded_at is None else self._timer() - self.loaded_at,
+        }
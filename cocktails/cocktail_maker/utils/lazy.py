@@ -0,0 +1,27 @@
+import importlib
+import types
+from typing import Any, List, Optional
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is only imported when one of its attributes is first used.
+
+    Every attribute lookup is forwarded to the real module, so patching the
+    real module (e.g. in tests) is seen through the stand-in. The import
+    itself goes through ``importlib``, which serializes concurrent first uses.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module: Optional[types.ModuleType] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for names the stand-in does not define, i.e. everything of the real module
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self.__name__)
+        return getattr(module, attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(importlib.import_module(self.__name__))
@@ -1,26 +1,225 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 
-from flask import current_app, has_request_context
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# Overridden from the Flask config by configure()
+settings: Dict[str, Any] = {
+    "level": os.getenv("LOG_LEVEL", "INFO"),
+    "format": os.getenv("LOG_FORMAT", "json"),  # json or text
+    "debug_sample_every": int(os.getenv("LOG_DEBUG_SAMPLE_EVERY", "1")),
+    "queue_size": int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+}
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "sampled"}
 
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, any ``extra`` fields and the traceback.
+    """
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if getattr(record, "sampled", None):
+            entry["sampled"] = record.sampled
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
 
-    if has_request_context():
-        app_logger = current_app.logger
-        for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+class DebugSampler(logging.Filter):
+    """
+    Keep the first and then every ``every``-th DEBUG record of each call site.
+
+    Records at INFO and above always pass. Kept records carry ``sampled`` so
+    readers know each one stands for ``every`` events.
+    """
+
+    def __init__(self, every: int = 1):
+        super().__init__()
+        self.every = every
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every <= 1:
+            return True
+        site = (record.name, record.lineno)
+        with self._lock:
+            count = self._counts.get(site, 0)
+            self._counts[site] = count + 1
+        if count % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without blocking; drops them if the queue is full.
+
+    Only the message is rendered on the calling thread; timestamps, JSON and
+    the write happen on the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render arguments now, as they may change once the caller moves on; keep the traceback separate
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to whatever ``sys.stderr`` is at the time, so redirection (e.g. by pytest) is followed."""
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_lock = threading.RLock()
+_queue_handler: Optional[_DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_output = _StderrHandler()
+_sampler = DebugSampler()
+
+
+def _start_listener() -> None:
+    global _queue_handler, _listener
+    log_queue: queue.Queue = queue.Queue(maxsize=settings["queue_size"])
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+    _queue_handler = _DroppingQueueHandler(log_queue)
+    _queue_handler.addFilter(_sampler)
+    _listener = QueueListener(log_queue, _output, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_queue_handler)
+
+
+def _apply_settings() -> None:
+    logging.getLogger().setLevel(settings["level"])
+    _output.setFormatter(JsonFormatter() if settings["format"] == "json" else logging.Formatter(TEXT_FORMAT))
+    _sampler.every = settings["debug_sample_every"]
+
+
+def setup_logging() -> None:
+    """
+    Install the shared non-blocking handler on the root logger; safe to call any number of times.
+
+    Records from every logger propagate to one ``QueueHandler``, and a single
+    ``QueueListener`` thread formats and writes them to stderr.
+    """
+    with _lock:
+        if _listener is None:
+            _start_listener()
+            _apply_settings()
+            atexit.register(stop)
+            if hasattr(os, "register_at_fork"):
+                # The listener thread does not survive a fork (e.g. gunicorn --preload); start a new one
+                os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def _restart_after_fork() -> None:
+    global _lock, _listener
+    _lock = threading.RLock()
+    _listener = None
+    _start_listener()
+
+
+def configure_logger(logger: logging.Logger) -> None:
+    """
+    Route a module logger through the shared handler.
+
+    Module loggers keep no handlers or level of their own; they propagate to
+    the root logger, whose level comes from LOG_LEVEL. Nothing is started
+    here, so importing a module stays cheap: the handler and its thread are
+    installed by ``configure`` (from create_app) or ``setup_logging``. Until
+    then, warnings and errors go to stderr through logging's last-resort handler.
+    """
+    logger.propagate = True
+
+
+def configure(config: Dict[str, Any]) -> None:
+    """
+    Apply LOG_LEVEL / LOG_FORMAT / LOG_DEBUG_SAMPLE_EVERY from a Flask config.
+
+    Args:
+        config (dict): The application config.
+    """
+    mapping = {"LOG_LEVEL": "level", "LOG_FORMAT": "format", "LOG_DEBUG_SAMPLE_EVERY": "debug_sample_every"}
+    for config_key, setting in mapping.items():
+        if config.get(config_key) is not None:
+            settings[setting] = config[config_key]
+    if settings["format"] not in ("json", "text"):
+        raise ValueError(f"Unsupported log format '{settings['format']}'")
+    with _lock:
+        setup_logging()
+        _apply_settings()
+
+
+def flush() -> None:
+    """Wait until every queued record has been written."""
+    if _queue_handler is not None:
+        _queue_handler.queue.join()
+
+
+def stop() -> None:
+    """Write the queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Snapshot of the queue and the records dropped because it was full.
+    """
+    return {
+        "queued": _queue_handler.queue.qsize() if _queue_handler is not None else 0,
+        "dropped": _queue_handler.dropped if _queue_handler is not None else 0,
+    }
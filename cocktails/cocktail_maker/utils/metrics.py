@@ -0,0 +1,235 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+# Latency buckets in seconds, covering cache hits through slow upstream calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    A thread-safe fixed-bucket histogram, e.g. for request latencies in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (Sequence[float]): Sorted upper bounds of the buckets. Values above
+                the last bound are only counted in the implicit +Inf bucket.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): The observed value.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall time spent inside the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def reset(self) -> None:
+        """Drop every observation."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Return cumulative bucket counts, total count and sum.
+
+        Returns:
+            dict: ``{"buckets": {"0.005": n, ..., "+Inf": n}, "count": n, "sum": s}``
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"buckets": cumulative, "count": count, "sum": total}
+
+
+class Gauge:
+    """
+    A thread-safe value that goes up and down, e.g. the number of requests in flight.
+    """
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counters:
+    """
+    A thread-safe set of named counts that only go up, e.g. responses by reason.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        """
+        Args:
+            names (Sequence[str]): The counters, each starting at zero.
+        """
+        self._counts = dict.fromkeys(names, 0)
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def __getitem__(self, name: str) -> int:
+        return self._counts[name]
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Returns:
+            dict: The current count of every counter.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        with self._lock:
+            self._counts = dict.fromkeys(self._counts, 0)
+
+
+class LabeledHistograms:
+    """
+    One ``Histogram`` per combination of label values, created on first use.
+    """
+
+    def __init__(self, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            labelnames (Sequence[str]): Names of the labels, in the order their values are passed.
+            buckets (Sequence[float]): Bucket upper bounds shared by every histogram.
+        """
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Histogram:
+        """
+        Returns:
+            Histogram: The histogram for these label values.
+        """
+        histogram = self._histograms.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(values, Histogram(self.buckets))
+        return histogram
+
+    def items(self) -> List[Tuple[Dict[str, str], Histogram]]:
+        """
+        Returns:
+            list: (labels, histogram) pairs, sorted by label values.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        return [(dict(zip(self.labelnames, values)), histogram) for values, histogram in histograms]
+
+    def reset(self) -> None:
+        """Forget every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+
+#################################################
+# Prometheus text exposition format
+#################################################
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Mapping[str, object]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_metric(name: str, kind: str, help_text: str,
+                  samples: Iterable[Tuple[Mapping[str, object], float]]) -> List[str]:
+    """
+    Render a counter or gauge family.
+
+    Args:
+        name (str): Metric name, e.g. "cocktails_upstream_throttled_total".
+        kind (str): "counter" or "gauge".
+        help_text (str): One-line description.
+        samples (Iterable): (labels, value) pairs.
+
+    Returns:
+        List[str]: The exposition lines.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return lines
+
+
+def format_histograms(name: str, help_text: str,
+                      histograms: Iterable[Tuple[Mapping[str, object], Histogram]]) -> List[str]:
+    """
+    Render a histogram family with its cumulative ``_bucket``, ``_sum`` and ``_count`` series.
+
+    Args:
+        name (str): Metric name without suffix, e.g. "cocktails_http_request_duration_seconds".
+        help_text (str): One-line description.
+        histograms (Iterable): (labels, histogram) pairs.
+
+    Returns:
+        List[str]: The exposition lines.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms:
+        snapshot = histogram.snapshot()
+        label_text = _format_labels(labels)
+        # The bucket series add "le" after the family's own labels
+        bucket_prefix = f"{name}_bucket{label_text[:-1]}," if labels else f"{name}_bucket{{"
+        lines.extend(f'{bucket_prefix}le="{bound}"}} {count}' for bound, count in snapshot["buckets"].items())
+        lines.append(f"{name}_sum{label_text} {_format_value(snapshot['sum'])}")
+        lines.append(f"{name}_count{label_text} {snapshot['count']}")
+    return lines
@@ -0,0 +1,237 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def trigrams(key: str) -> Set[str]:
+    """
+    The character trigrams of a normalized name, padded so short names and word starts count.
+    """
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Node:
+    __slots__ = ("children", "key")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.key: Optional[str] = None  # set on the node that ends a name
+
+
+class NameIndex:
+    """
+    Index of known drink names for exact, prefix and fuzzy lookup.
+
+    Names are normalized like cache keys. A character trie answers prefix
+    queries in alphabetical order, and trigram postings rank fuzzy matches
+    by Jaccard similarity, so a typo costs a few set operations rather than
+    an upstream search. Only names are held; the drinks themselves live in
+    the bounded drink cache.
+    """
+
+    def __init__(
+        self,
+        min_similarity: float = 0.3,
+        max_age: float = 3600.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            min_similarity (float): Lowest trigram similarity returned as a fuzzy match.
+            max_age (float): Seconds after which ``needs_load`` asks for a reload from the mirror.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        self.min_similarity = min_similarity
+        self.max_age = max_age
+        self._timer = timer
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every name."""
+        with self._lock:
+            self._root = _Node()
+            self._entries: Dict[str, str] = {}  # key -> display name
+            self._postings: Dict[str, Set[str]] = {}  # trigram -> keys
+            self._trigram_counts: Dict[str, int] = {}  # key -> number of trigrams
+            self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_key(name) in self._entries
+
+    def add(self, name: str) -> None:
+        """
+        Index a drink name.
+
+        Args:
+            name (str): The display name.
+        """
+        key = normalize_key(name)
+        if not key:
+            return
+        with self._lock:
+            known = key in self._entries
+            self._entries[key] = name
+            if known:
+                return
+            node = self._root
+            for char in key:
+                node = node.children.setdefault(char, _Node())
+            node.key = key
+            key_trigrams = trigrams(key)
+            self._trigram_counts[key] = len(key_trigrams)
+            for trigram in key_trigrams:
+                self._postings.setdefault(trigram, set()).add(key)
+
+    def remove(self, name: str) -> None:
+        """
+        Forget a name, e.g. one the upstream reported as not found.
+        """
+        key = normalize_key(name)
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return
+            path = [self._root]
+            for char in key:
+                path.append(path[-1].children[char])
+            path[-1].key = None
+            # Prune the branch back to the last node still ending or leading to another name
+            for depth in range(len(key), 0, -1):
+                if path[depth].children or path[depth].key is not None:
+                    break
+                del path[depth - 1].children[key[depth - 1]]
+            for trigram in trigrams(key):
+                keys = self._postings[trigram]
+                keys.discard(key)
+                if not keys:
+                    del self._postings[trigram]
+            del self._trigram_counts[key]
+
+    def load(self, names: Iterable[str]) -> int:
+        """
+        Index a batch of names and mark the index as loaded.
+
+        Returns:
+            int: The number of names indexed.
+        """
+        count = 0
+        for name in names:
+            self.add(name)
+            count += 1
+        self.loaded_at = self._timer()
+        logger.info("Name index loaded %d names; %d indexed in total", count, len(self))
+        return count
+
+    def needs_load(self) -> bool:
+        """
+        Returns:
+            bool: True if the index was never loaded or was loaded more than ``max_age`` ago.
+        """
+        return self.loaded_at is None or self._timer() - self.loaded_at >= self.max_age
+
+    def random_name(self, rng: Optional[random.Random] = None) -> Optional[str]:
+        """
+        Pick a known name uniformly at random; copies the keys, so meant for occasional use.
+
+        Returns:
+            Optional[str]: The display name, or None if no name is indexed.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            key = (rng or random).choice(list(self._entries))
+            return self._entries[key]
+
+    def _with_prefix(self, prefix: str, limit: int) -> List[str]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        keys: List[str] = []
+        stack = [node]
+        while stack and len(keys) < limit:
+            node = stack.pop()
+            if node.key is not None:
+                keys.append(node.key)
+            # Reverse order on the stack so names come out alphabetically
+            stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+        return keys
+
+    def _similar(self, key: str) -> List[Tuple[float, str]]:
+        query = trigrams(key)
+        shared: Counter = Counter()
+        for trigram in query:
+            shared.update(self._postings.get(trigram, ()))
+        scored = []
+        for candidate, overlap in shared.items():
+            # Jaccard similarity of the two trigram sets
+            similarity = overlap / (len(query) + self._trigram_counts[candidate] - overlap)
+            if similarity >= self.min_similarity:
+                scored.append((similarity, candidate))
+        return scored
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank known names against a query.
+
+        The exact name comes first, then names starting with the query in
+        alphabetical order, then fuzzy matches by descending trigram similarity.
+
+        Args:
+            query (str): A full or partial drink name, possibly misspelled.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[Dict[str, Any]]: ``{"name", "match", "score"}`` entries, where match is
+            "exact", "prefix" or "fuzzy" and score is the trigram similarity.
+        """
+        key = normalize_key(query)
+        if not key or limit <= 0:
+            return []
+        with self._lock:
+            results = []
+            seen = set()
+            # The exact name, if known, is the first key under its own trie node
+            for candidate in self._with_prefix(key, limit):
+                results.append(("exact" if candidate == key else "prefix", candidate))
+                seen.add(candidate)
+            if len(results) < limit:
+                fuzzy = sorted(
+                    (result for result in self._similar(key) if result[1] not in seen),
+                    key=lambda result: (-result[0], result[1]),
+                )
+                results.extend(("fuzzy", candidate) for _, candidate in fuzzy[:limit - len(results)])
+            query_trigrams = trigrams(key)
+            return [
+                {
+                    "name": self._entries[candidate],
+                    "match": match,
+                    "score": round(len(query_trigrams & trigrams(candidate))
+                                   / len(query_trigrams | trigrams(candidate)), 3),
+                }
+                for match, candidate in results
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the index size and age.
+        """
+        return {
+            "names": len(self._entries),
+            "trigrams": len(self._postings),
+            "age_seconds": None if self.loaded_at is None else self._timer() - self.loaded_at,
+        }
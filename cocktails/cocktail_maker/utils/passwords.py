@@ -0,0 +1,277 @@
+import hashlib
+import hmac
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+SCRYPT = "scrypt"
+PBKDF2_SHA256 = "pbkdf2_sha256"
+LEGACY_SHA256 = "sha256"
+
+# Highest KDF cost a stored hash may ask for, unless the configured cost is higher,
+# so a crafted or imported hash cannot make a login burn seconds of CPU or GiBs of memory
+MAX_SCRYPT_WORK = 2 ** 21  # n * r * p: 16x the default cost, at most 256 MiB per hash
+MAX_PBKDF2_ITERATIONS = 2_000_000
+
+_HEX_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+# Cost settings; overridden from the Flask config by configure()
+settings: Dict[str, Any] = {
+    "algorithm": os.getenv("PASSWORD_HASH_ALGORITHM", SCRYPT),
+    "scrypt_n": int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14))),
+    "scrypt_r": int(os.getenv("PASSWORD_SCRYPT_R", "8")),
+    "scrypt_p": int(os.getenv("PASSWORD_SCRYPT_P", "1")),
+    "pbkdf2_iterations": int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000")),
+    "workers": int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))),
+    "max_pending": int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64")),
+    "queue_timeout": float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "2")),
+}
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing pool is saturated and a request cannot be queued."""
+
+
+def _scrypt(password: str, salt: str, n: int, r: int, p: int) -> str:
+    return hashlib.scrypt(
+        password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=32
+    ).hex()
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations).hex()
+
+
+def _current_params() -> str:
+    if settings["algorithm"] == SCRYPT:
+        return f"n={settings['scrypt_n']},r={settings['scrypt_r']},p={settings['scrypt_p']}"
+    return f"i={settings['pbkdf2_iterations']}"
+
+
+def hash_password(password: str, salt: str) -> str:
+    """
+    Hash a password with the configured KDF.
+
+    The result is self-describing: ``<algorithm>$<params>$<hex digest>``, e.g.
+    ``scrypt$n=16384,r=8,p=1$9f86...``, so stored hashes keep verifying after
+    the cost settings change.
+
+    Args:
+        password (str): The plaintext password.
+        salt (str): The per-user salt (hex string).
+
+    Returns:
+        str: The encoded hash.
+    """
+    algorithm = settings["algorithm"]
+    if algorithm == SCRYPT:
+        digest = _scrypt(password, salt, settings["scrypt_n"], settings["scrypt_r"], settings["scrypt_p"])
+    elif algorithm == PBKDF2_SHA256:
+        digest = _pbkdf2(password, salt, settings["pbkdf2_iterations"])
+    else:
+        raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+    return f"{algorithm}${_current_params()}${digest}"
+
+
+def parse_hash(stored: str) -> Tuple[str, Dict[str, int], str]:
+    """
+    Split a stored hash into its algorithm, cost parameters and digest.
+
+    Accepts ``<algorithm>$<params>$<hex digest>`` as written by ``hash_password``
+    and legacy bare SHA-256 hex digests, whose algorithm is ``sha256``.
+
+    Args:
+        stored (str): The stored hash.
+
+    Returns:
+        tuple: (algorithm, parameters, hex digest).
+
+    Raises:
+        ValueError: If the hash is malformed, uses an unknown algorithm or asks for
+            a cost above ``MAX_SCRYPT_WORK`` / ``MAX_PBKDF2_ITERATIONS``.
+    """
+    if "$" not in stored:
+        if not _HEX_DIGEST.fullmatch(stored):
+            raise ValueError("Malformed password hash")
+        return LEGACY_SHA256, {}, stored
+    try:
+        algorithm, params, digest = stored.split("$", 2)
+        values = {key: int(value) for key, value in (item.split("=", 1) for item in params.split(","))}
+    except ValueError:
+        raise ValueError("Malformed password hash") from None
+    if not _HEX_DIGEST.fullmatch(digest):
+        raise ValueError("Malformed password hash")
+
+    if algorithm == SCRYPT:
+        if set(values) != {"n", "r", "p"}:
+            raise ValueError("Malformed password hash")
+        n, r, p = values["n"], values["r"], values["p"]
+        limit = max(MAX_SCRYPT_WORK, settings["scrypt_n"] * settings["scrypt_r"] * settings["scrypt_p"])
+        if n < 2 or n & (n - 1) or r < 1 or p < 1 or n * r * p > limit:
+            raise ValueError("Password hash cost is out of bounds")
+    elif algorithm == PBKDF2_SHA256:
+        if set(values) != {"i"}:
+            raise ValueError("Malformed password hash")
+        if not 1 <= values["i"] <= max(MAX_PBKDF2_ITERATIONS, settings["pbkdf2_iterations"]):
+            raise ValueError("Password hash cost is out of bounds")
+    else:
+        raise ValueError(f"Unknown password hash algorithm '{algorithm}'")
+    return algorithm, values, digest
+
+
+def verify_password(password: str, salt: str, stored: str) -> bool:
+    """
+    Check a password against a stored hash in any supported format.
+
+    Legacy hashes are a bare SHA-256 hex digest of password + salt. Hashes that
+    ``parse_hash`` rejects never match, so a corrupt row is a failed login.
+
+    Args:
+        password (str): The plaintext password.
+        salt (str): The per-user salt.
+        stored (str): The stored hash.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    try:
+        algorithm, values, digest = parse_hash(stored)
+    except ValueError as e:
+        logger.error("Unusable stored password hash: %s", e)
+        return False
+
+    if algorithm == SCRYPT:
+        candidate = _scrypt(password, salt, values["n"], values["r"], values["p"])
+    elif algorithm == PBKDF2_SHA256:
+        candidate = _pbkdf2(password, salt, values["i"])
+    else:
+        candidate = hashlib.sha256((password + salt).encode()).hexdigest()
+    return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(stored: str) -> bool:
+    """
+    Whether a stored hash uses a legacy format or outdated cost settings.
+
+    Args:
+        stored (str): The stored hash.
+
+    Returns:
+        bool: True if the hash should be replaced after the next successful login.
+    """
+    if "$" not in stored:
+        return True
+    algorithm, params, _ = stored.split("$", 2)
+    return algorithm != settings["algorithm"] or params != _current_params()
+
+
+#################################################
+# Bounded hashing pool
+#################################################
+
+# hashlib's scrypt and pbkdf2_hmac release the GIL, so a thread pool hashes on
+# several cores while request threads keep serving other routes.
+_pool: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_bulk_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _slots = threading.BoundedSemaphore(settings["workers"] + settings["max_pending"])
+                _pool = ThreadPoolExecutor(max_workers=settings["workers"], thread_name_prefix="password-hash")
+    return _pool, _slots
+
+
+def run(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a hashing function on the bounded pool and wait for its result.
+
+    At most ``workers`` hashes run at once and at most ``max_pending`` more may
+    wait; callers beyond that wait ``queue_timeout`` seconds for a slot and then
+    fail fast.
+
+    Args:
+        fn (Callable): ``hash_password`` or ``verify_password``.
+        *args: Arguments for ``fn``.
+
+    Returns:
+        Any: The function's result.
+
+    Raises:
+        PasswordHasherBusy: If no slot became free within ``queue_timeout``.
+    """
+    pool, slots = _get_pool()
+    if not slots.acquire(timeout=settings["queue_timeout"]):
+        logger.warning("Password hashing pool is saturated")
+        raise PasswordHasherBusy("Too many concurrent password operations, please retry")
+    try:
+        return pool.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_many(items: Sequence[Tuple[str, str]]) -> List[str]:
+    """
+    Hash many (password, salt) pairs on every core, for bulk imports.
+
+    Runs on a pool of its own, sized like the request pool, so a bulk import
+    does not take the slots logins and account creation wait for.
+
+    Args:
+        items (Sequence[tuple]): (password, salt) pairs.
+
+    Returns:
+        list: The encoded hashes, in input order.
+    """
+    global _bulk_pool
+    if not items:
+        return []
+    with _pool_lock:
+        if _bulk_pool is None:
+            _bulk_pool = ThreadPoolExecutor(max_workers=settings["workers"], thread_name_prefix="password-hash-bulk")
+        pool = _bulk_pool
+    password_list, salts = zip(*items)
+    return list(pool.map(hash_password, password_list, salts))
+
+
+def configure(config: Dict[str, Any]) -> None:
+    """
+    Apply PASSWORD_HASH_* / PASSWORD_SCRYPT_* / PASSWORD_PBKDF2_* settings from a Flask config.
+
+    Args:
+        config (dict): The application config.
+    """
+    global _pool, _slots, _bulk_pool
+    mapping = {
+        "PASSWORD_HASH_ALGORITHM": "algorithm",
+        "PASSWORD_SCRYPT_N": "scrypt_n",
+        "PASSWORD_SCRYPT_R": "scrypt_r",
+        "PASSWORD_SCRYPT_P": "scrypt_p",
+        "PASSWORD_PBKDF2_ITERATIONS": "pbkdf2_iterations",
+        "PASSWORD_HASH_WORKERS": "workers",
+        "PASSWORD_HASH_MAX_PENDING": "max_pending",
+        "PASSWORD_HASH_QUEUE_TIMEOUT": "queue_timeout",
+    }
+    for config_key, setting in mapping.items():
+        if config.get(config_key) is not None:
+            settings[setting] = config[config_key]
+    if settings["algorithm"] not in (SCRYPT, PBKDF2_SHA256):
+        raise ValueError(f"Unsupported password hash algorithm '{settings['algorithm']}'")
+    with _pool_lock:
+        for pool in (_pool, _bulk_pool):
+            if pool is not None:
+                pool.shutdown(wait=False)
+        _pool = _slots = _bulk_pool = None
@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import threading
+from array import array
+from typing import Any, Dict, List, Tuple
+
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CountMinSketch:
+    """
+    Approximate per-key counts in fixed memory.
+
+    Each key increments one counter in each of ``depth`` rows, picked by
+    independent hashes; its estimate is the smallest of those counters.
+    Estimates never undercount, and overcount by at most a small fraction
+    of the total with high probability, whatever the number of distinct keys.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        """
+        Args:
+            width (int): Counters per row; the overcount shrinks as this grows.
+            depth (int): Number of rows; the chance of a large overcount shrinks as this grows.
+        """
+        if width <= 0 or depth <= 0 or depth > 8:
+            raise ValueError("width must be positive and depth between 1 and 8")
+        self.width = width
+        self.depth = depth
+        self._rows = [array("L", bytes(array("L").itemsize * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _columns(self, key: str) -> List[int]:
+        # One 8-byte slice of a single digest per row
+        digest = hashlib.blake2b(key.encode(), digest_size=8 * self.depth).digest()
+        return [int.from_bytes(digest[8 * row:8 * row + 8], "little") % self.width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Count ``key`` and return its new estimate.
+        """
+        estimate = None
+        for row, column in zip(self._rows, self._columns(key)):
+            row[column] += count
+            estimate = row[column] if estimate is None else min(estimate, row[column])
+        self.total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """
+        Returns:
+            int: An upper bound on how often ``key`` was counted.
+        """
+        return min(row[column] for row, column in zip(self._rows, self._columns(key)))
+
+    def halve(self) -> None:
+        """Halve every counter, so older counts weigh less than recent ones."""
+        for row in self._rows:
+            for column, value in enumerate(row):
+                if value:
+                    row[column] = value >> 1
+        self.total >>= 1
+
+
+class PopularityTracker:
+    """
+    Tracks the most requested keys with a count-min sketch.
+
+    The sketch counts every key, and a bounded candidate table remembers the
+    keys with the highest estimates, so finding the top K never scans the
+    whole key space. ``decay`` halves all counts to let popularity follow
+    recent traffic.
+    """
+
+    def __init__(self, capacity: int = 256, width: int = 2048, depth: int = 4):
+        """
+        Args:
+            capacity (int): Number of candidate keys remembered for ``top``.
+            width (int): Counters per sketch row.
+            depth (int): Sketch rows.
+        """
+        self.capacity = capacity
+        self._width = width
+        self._depth = depth
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every count."""
+        with self._lock:
+            self._sketch = CountMinSketch(self._width, self._depth)
+            self._candidates: Dict[str, int] = {}  # key -> estimate when last counted
+            # Lower bound on the smallest candidate estimate; estimates only grow between decays
+            self._floor = 0
+
+    def record(self, key: str) -> None:
+        """
+        Count one request for ``key``.
+        """
+        with self._lock:
+            estimate = self._sketch.add(key)
+            if key in self._candidates or len(self._candidates) < self.capacity:
+                self._candidates[key] = estimate
+                return
+            if estimate <= self._floor:
+                return
+            # Replace the least popular candidate if this key now beats it
+            weakest = min(self._candidates, key=self._candidates.__getitem__)
+            self._floor = self._candidates[weakest]
+            if estimate > self._floor:
+                del self._candidates[weakest]
+                self._candidates[key] = estimate
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """
+        Returns:
+            List[Tuple[str, int]]: Up to ``k`` (key, estimated count) pairs, most requested first.
+        """
+        with self._lock:
+            ranked = sorted(self._candidates.items(), key=lambda item: (-item[1], item[0]))
+        return [(key, count) for key, count in ranked[:k] if count > 0]
+
+    def decay(self) -> None:
+        """Halve every count, dropping candidates whose count reaches zero."""
+        with self._lock:
+            self._sketch.halve()
+            self._candidates = {key: count >> 1 for key, count in self._candidates.items() if count >> 1}
+            self._floor = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the number of requests counted and the current top keys.
+        """
+        return {
+            "requests": self._sketch.total,
+            "candidates": len(self._candidates),
+            "top": [{"name": key, "requests": count} for key, count in self.top(10)],
+        }
@@ -1,8 +1,12 @@
 import logging
-import requests
 
+from cocktail_maker.utils.lazy import LazyModule
 from cocktail_maker.utils.logger import configure_logger
 
+requests = LazyModule("requests")
+async_http_client = LazyModule("cocktail_maker.utils.async_http_client")
+http_client = LazyModule("cocktail_maker.utils.http_client")
+
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
@@ -17,20 +21,36 @@ def fetch_random_drink_data() -> dict:
         RuntimeError: If the request to the API fails or times out.
         ValueError: If the API response is invalid or does not contain drink data.
     """
-    api_url = "https://www.thecocktaildb.com/api/json/v1/1/random.php"
+    api_url = f"{http_client.COCKTAILDB_BASE_URL}/random.php"
 
     try:
         logger.info("Fetching random drink from API: %s", api_url)
-        response = requests.get(api_url, timeout=5)
-        response.raise_for_status()
-        cocktail_data = response.json()
+        response = http_client.get("random.php")
+        return _validate_random_drink_data(response.json())
 
-        drinks = cocktail_data.get("drinks")
-        if not drinks or not isinstance(drinks, list):
-            raise ValueError("Invalid or empty 'drinks' field in API response")
+    except requests.exceptions.Timeout:
+        logger.error("Request to CocktailDB API timed out.")
+        raise RuntimeError("Request to CocktailDB API timed out.")
 
-        logger.info("Random drink data successfully fetched from API")
-        return cocktail_data
+    except requests.exceptions.RequestException as e:
+        logger.error("Request to CocktailDB API failed: %s", e)
+        raise RuntimeError(f"Request to CocktailDB API failed: {e}")
+
+    except Exception as e:
+        logger.error("Unexpected error while fetching random drink: %s", e)
+        raise RuntimeError(f"Unexpected error while fetching random drink: {e}")
+
+async def fetch_random_drink_data_async() -> dict:
+    """
+    Non-blocking counterpart of ``fetch_random_drink_data`` for the ASGI serving mode.
+
+    Raises:
+        RuntimeError: If the request to the API fails or the response is invalid.
+    """
+    try:
+        logger.info("Fetching random drink from API (async)")
+        response = await async_http_client.get("random.php")
+        return _validate_random_drink_data(response.json())
 
     except requests.exceptions.Timeout:
         logger.error("Request to CocktailDB API timed out.")
@@ -44,6 +64,14 @@ def fetch_random_drink_data() -> dict:
         logger.error("Unexpected error while fetching random drink: %s", e)
         raise RuntimeError(f"Unexpected error while fetching random drink: {e}")
 
+def _validate_random_drink_data(cocktail_data: dict) -> dict:
+    drinks = cocktail_data.get("drinks")
+    if not drinks or not isinstance(drinks, list):
+        raise ValueError("Invalid or empty 'drinks' field in API response")
+
+    logger.info("Random drink data successfully fetched from API")
+    return cocktail_data
+
 def fetch_drinks_by_alcoholic(alcoholic: bool) -> dict:
     """
     Fetch drinks filtered by their alcoholic content from the CocktailDB API.
@@ -59,15 +87,14 @@ def fetch_drinks_by_alcoholic(alcoholic: bool) -> dict:
     """
     # Determine the correct endpoint based on the input
     filter_type = "Alcoholic" if alcoholic else "Non_Alcoholic"
-    api_url = f"https://www.thecocktaildb.com/api/json/v1/1/filter.php?a={filter_type}"
+    api_url = f"{http_client.COCKTAILDB_BASE_URL}/filter.php?a={filter_type}"
 
     try:
         # Log the API request
         logger.info("Fetching '%s' drinks from API: %s", filter_type, api_url)
 
-        # Perform the API call
-        response = requests.get(api_url, timeout=5)
-        response.raise_for_status()  # Raise an error for HTTP failures
+        # Perform the API call (retried and timed out by the shared client)
+        response = http_client.get("filter.php", params={"a": filter_type})
 
         # Parse the JSON response
         data = response.json()
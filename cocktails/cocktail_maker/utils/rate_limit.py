@@ -0,0 +1,364 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens accrue continuously at ``rate`` per second up to ``capacity``, so
+    callers may burst up to ``capacity`` requests and are then held to the
+    average rate. Acquiring never blocks; callers that are refused decide
+    whether to wait, skip or fail.
+    """
+
+    def __init__(self, rate: float, capacity: float, timer: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens held; the bucket starts full.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        if rate < 0 or capacity <= 0:
+            raise ValueError("rate must be non-negative and capacity positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated = timer()
+        self.granted = 0
+        self.refused = 0
+
+    def _refill(self, now: float) -> None:
+        # Callers hold _lock
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take ``tokens`` from the bucket if that many are available.
+
+        Returns:
+            bool: True if the tokens were taken.
+        """
+        with self._lock:
+            self._refill(self._timer())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.granted += 1
+                return True
+            self.refused += 1
+            return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        Returns:
+            float: Seconds until ``tokens`` will be available; infinite if the bucket never refills.
+        """
+        with self._lock:
+            self._refill(self._timer())
+            shortfall = tokens - self._tokens
+            if shortfall <= 0:
+                return 0.0
+            return shortfall / self.rate if self.rate else float("inf")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the available tokens and the grant/refusal counters.
+        """
+        with self._lock:
+            self._refill(self._timer())
+            return {
+                "tokens": round(self._tokens, 2),
+                "capacity": self.capacity,
+                "rate_per_second": self.rate,
+                "granted": self.granted,
+                "refused": self.refused,
+            }
+
+
+class SQLiteTokenBucket:
+    """
+    A token bucket kept in a SQLite file, shared by every process that opens it.
+
+    Each acquisition refills and takes tokens in one ``BEGIN IMMEDIATE``
+    transaction, so gunicorn workers on the same host draw from a single
+    budget. Wall-clock time is used because monotonic clocks are not
+    comparable across processes. If the file cannot be used the bucket
+    logs the error and grants the request rather than failing it.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS token_buckets "
+        "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+    )
+
+    def __init__(self, path: str, name: str, rate: float, capacity: float, timer: Callable[[], float] = time.time):
+        """
+        Args:
+            path (str): The SQLite file; created if missing.
+            name (str): The bucket's row, so one file can hold several budgets.
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens held; a new bucket starts full.
+            timer (Callable): Wall clock, injectable for tests.
+        """
+        if rate < 0 or capacity <= 0:
+            raise ValueError("rate must be non-negative and capacity positive")
+        self.path = path
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._timer = timer
+        self._local = threading.local()
+        self.granted = 0
+        self.refused = 0
+        self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that opened them
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(self._SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def _take(self, tokens: float) -> Tuple[bool, float]:
+        """
+        Refill the shared bucket, then take ``tokens`` if that many are available.
+
+        Returns:
+            Tuple[bool, float]: Whether the tokens were taken, and the tokens left.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = self._timer()
+            row = connection.execute(
+                "SELECT tokens, updated FROM token_buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            if row is None:
+                available = float(self.capacity)
+            else:
+                available = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+            taken = available >= tokens
+            if taken:
+                available -= tokens
+            connection.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, available, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return taken, available
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take ``tokens`` from the shared bucket if that many are available.
+
+        Returns:
+            bool: True if the tokens were taken, or if the file could not be used.
+        """
+        try:
+            taken, _ = self._take(tokens)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.error("Token bucket '%s' in %s is unavailable, granting the request: %s", self.name, self.path, e)
+            return True
+        if taken:
+            self.granted += 1
+        else:
+            self.refused += 1
+        return taken
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        Returns:
+            float: Seconds until ``tokens`` will be available, unless another process takes them first.
+        """
+        try:
+            _, available = self._take(0.0)
+        except sqlite3.Error:
+            return 0.0
+        shortfall = tokens - available
+        if shortfall <= 0:
+            return 0.0
+        return shortfall / self.rate if self.rate else float("inf")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the shared tokens and this process's grant/refusal counters.
+        """
+        try:
+            _, available = self._take(0.0)
+            tokens = round(available, 2)
+        except sqlite3.Error:
+            tokens = None
+        return {
+            "tokens": tokens,
+            "capacity": self.capacity,
+            "rate_per_second": self.rate,
+            "granted": self.granted,
+            "refused": self.refused,
+            "errors": self.errors,
+            "shared_path": self.path,
+        }
+
+
+class ClientRateLimiter:
+    """
+    One token bucket per client, e.g. per remote address.
+
+    Buckets are kept for the ``max_clients`` most recently seen clients; a
+    client evicted for being idle comes back with a full bucket, which it
+    would have refilled to anyway.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_clients: int = 10000,
+                 timer: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second to each client's bucket.
+            capacity (float): Requests a client may burst.
+            max_clients (int): Number of client buckets kept.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.max_clients = max_clients
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    def _bucket(self, client: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.capacity, self._timer)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket
+
+    def try_acquire(self, client: str) -> bool:
+        """
+        Count one request from ``client``.
+
+        Returns:
+            bool: True if the request is within the client's limit.
+        """
+        if self._bucket(client).try_acquire():
+            self.allowed += 1
+            return True
+        self.limited += 1
+        return False
+
+    def wait_time(self, client: str) -> float:
+        """
+        Returns:
+            float: Seconds until ``client`` may make another request.
+        """
+        return self._bucket(client).wait_time()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the limit and the allowed/limited counters.
+        """
+        return {
+            "rate_per_second": round(self.rate, 3),
+            "burst": self.capacity,
+            "clients": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class Throttle:
+    """
+    Makes callers wait for a bucket's tokens, up to ``max_wait`` seconds each.
+
+    Sync and async callers share the decision logic through ``delay`` and
+    only differ in how they sleep.
+    """
+
+    def __init__(self, bucket: Any, max_wait: float):
+        """
+        Args:
+            bucket: A ``TokenBucket`` or ``SQLiteTokenBucket``.
+            max_wait (float): Longest a caller waits for a token before giving up.
+        """
+        self.bucket = bucket
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.rejected = 0
+
+    def delay(self, waited: float) -> Optional[float]:
+        """
+        Take a token, or say how long to sleep before trying again.
+
+        Args:
+            waited (float): Seconds the caller has already waited.
+
+        Returns:
+            Optional[float]: 0 once a token was taken, the seconds to sleep, or None
+                if waiting would exceed ``max_wait``.
+        """
+        if self.bucket.try_acquire():
+            if waited:
+                with self._lock:
+                    self.waited += 1
+                    self.wait_seconds += waited
+            return 0.0
+        delay = max(self.bucket.wait_time(), 0.001)
+        if waited + delay > self.max_wait:
+            with self._lock:
+                self.rejected += 1
+            return None
+        return delay
+
+    def acquire(self) -> bool:
+        """
+        Block until a token is taken.
+
+        Returns:
+            bool: False if no token became available within ``max_wait``.
+        """
+        waited = 0.0
+        while True:
+            delay = self.delay(waited)
+            if delay is None:
+                return False
+            if not delay:
+                return True
+            time.sleep(delay)
+            waited += delay
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the bucket and of how often callers waited or gave up.
+        """
+        return {
+            **self.bucket.stats(),
+            "max_wait_seconds": self.max_wait,
+            "waited": self.waited,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from cocktail_maker.utils.logger import configure_logger
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class _Call:
+    """A fetch in progress for one key, waited on by its followers."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent callers for the same key share one execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait for it and receive the same result or
+    exception. Once the call finishes the key is forgotten, so the next caller
+    starts a fresh execution.
+
+    ``do`` coalesces threads and ``do_async`` coalesces coroutines on the same
+    event loop. The two never share calls with each other.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight, then share its outcome.
+
+        Args:
+            key (Hashable): The deduplication key.
+            fn (Callable[[], Any]): The function to run if this caller is the leader.
+
+        Returns:
+            Any: The leader's return value.
+
+        Raises:
+            Exception: Whatever the leader's call raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            logger.debug("Waiting on in-flight call for %r", key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Coroutine counterpart of ``do``: await ``fn()`` unless a call for ``key`` is in flight.
+
+        If the leader is cancelled, waiting followers are cancelled with it.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            future = self._futures.get(flight_key)
+            if future is None:
+                future = self._futures[flight_key] = loop.create_future()
+                # Mark the outcome as retrieved even when nobody else was waiting
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self.executions += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            logger.debug("Waiting on in-flight coroutine for %r", key)
+            # Shield the shared future so one follower's cancellation does not cancel the rest
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[flight_key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            dict: Executions, coalesced callers and calls currently in flight.
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._futures),
+            }
@@ -0,0 +1,348 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.logger import configure_logger
+from cocktail_maker.utils.popularity import PopularityTracker
+from cocktail_maker.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class DrinkPool:
+    """
+    A bounded pool of prefetched items, each handed out once.
+
+    Taking an item below the target size wakes whoever refills the pool, so
+    the consumer never waits on the refill.
+    """
+
+    def __init__(self, size: int = 0):
+        """
+        Args:
+            size (int): Number of items the pool is refilled to; 0 disables it.
+        """
+        self.size = size
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self.refill_needed = threading.Event()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def pop(self) -> Optional[Any]:
+        """
+        Returns:
+            Optional[Any]: The oldest pooled item, or None if the pool is empty.
+        """
+        with self._lock:
+            item = self._items.popleft() if self._items else None
+            if item is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if self.size:
+            self.refill_needed.set()
+        return item
+
+    def put(self, item: Any) -> bool:
+        """
+        Add an item unless the pool is already full.
+
+        Returns:
+            bool: True if the item was added.
+        """
+        with self._lock:
+            if len(self._items) >= self.size:
+                return False
+            self._items.append(item)
+            return True
+
+    def missing(self) -> int:
+        """
+        Returns:
+            int: How many items the pool is short of its target size.
+        """
+        return max(0, self.size - len(self._items))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._items), "target": self.size, "hits": self.hits, "misses": self.misses}
+
+
+class CacheWarmer:
+    """
+    Background worker that keeps the random drink pool full and popular drinks fresh.
+
+    The pool is topped up as soon as a drink is taken from it. Every refresh
+    interval the ``top_k`` most requested names whose cache entry
+    is missing or expires within ``refresh_ahead`` seconds are fetched again,
+    unless they are cached as not found, and the request counts are halved so
+    popularity follows recent traffic.
+    Every upstream request spends a token from ``budget``; when it runs out the
+    warmer waits for the bucket to refill instead of competing with user requests.
+    """
+    # Shortest wait before retrying to fill a pool that was left short
+    RETRY_SECONDS = 1.0
+
+    def __init__(
+        self,
+        pool: DrinkPool,
+        fetch_random: Callable[[], Any],
+        popular: PopularityTracker,
+        refresh: Callable[[str], Any],
+        expires_in: Callable[[str], Optional[float]],
+        budget: TokenBucket,
+        is_negative: Optional[Callable[[str], bool]] = None,
+        top_k: int = 50,
+        refresh_ahead: float = 300.0,
+    ):
+        """
+        Args:
+            pool (DrinkPool): The pool of prefetched random drinks.
+            fetch_random (Callable[[], Any]): Fetches one random drink from the upstream.
+            popular (PopularityTracker): Request counts of drink names.
+            refresh (Callable[[str], Any]): Fetches a drink by name from the upstream and caches it.
+            expires_in (Callable[[str], Optional[float]]): Seconds until a name's cache entry
+                expires, or None if it is not cached.
+            budget (TokenBucket): Upstream requests the warmer may make.
+            is_negative (Optional[Callable[[str], bool]]): Whether a name is cached as not found.
+            top_k (int): Number of popular names kept fresh.
+            refresh_ahead (float): Refresh entries expiring within this many seconds.
+        """
+        self.pool = pool
+        self.fetch_random = fetch_random
+        self.popular = popular
+        self.refresh = refresh
+        self.expires_in = expires_in
+        self.budget = budget
+        self.is_negative = is_negative or (lambda _: False)
+        self.top_k = top_k
+        self.refresh_ahead = refresh_ahead
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.prefetched = 0
+        self.refreshed = 0
+        self.failures = 0
+        self.budget_exhausted = 0
+
+    def fill_pool(self) -> int:
+        """
+        Fetch random drinks until the pool is full or the budget runs out.
+
+        Returns:
+            int: The number of drinks added.
+        """
+        added = 0
+        while self.pool.missing() and not self._stop.is_set():
+            if not self.budget.try_acquire():
+                self.budget_exhausted += 1
+                break
+            try:
+                drink = self.fetch_random()
+            except RuntimeError as e:
+                self.failures += 1
+                logger.warning("Could not prefetch a random drink: %s", e)
+                break
+            if self.pool.put(drink):
+                added += 1
+        self.prefetched += added
+        return added
+
+    def refresh_popular(self) -> int:
+        """
+        Refetch the popular names that are uncached or about to expire, then decay the counts.
+
+        Names cached as not found are left alone until their negative entry expires.
+
+        Returns:
+            int: The number of drinks refreshed.
+        """
+        refreshed = 0
+        for name, _ in self.popular.top(self.top_k):
+            remaining = self.expires_in(name)
+            if remaining is not None and remaining > self.refresh_ahead:
+                continue
+            if remaining is None and self.is_negative(name):
+                continue
+            if not self.budget.try_acquire():
+                self.budget_exhausted += 1
+                break
+            try:
+                self.refresh(name)
+                refreshed += 1
+            except (ValueError, RuntimeError) as e:
+                self.failures += 1
+                logger.warning("Could not refresh popular drink '%s': %s", name, e)
+        self.popular.decay()
+        self.refreshed += refreshed
+        if refreshed:
+            logger.info("Refreshed %d popular drinks", refreshed)
+        return refreshed
+
+    def run_once(self) -> None:
+        """Run one full warming cycle: fill the pool and refresh the popular names."""
+        self.fill_pool()
+        self.refresh_popular()
+
+    def start(self, interval: float) -> None:
+        """
+        Warm in a daemon thread until ``stop`` is called.
+
+        Args:
+            interval (float): Seconds between popular-drink refreshes.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            next_refresh = time.monotonic()
+            while not self._stop.is_set():
+                self.pool.refill_needed.clear()
+                self.fill_pool()
+                if time.monotonic() >= next_refresh:
+                    self.refresh_popular()
+                    next_refresh = time.monotonic() + interval
+                # Sleep until the next refresh or until a drink is taken from the pool; a pool
+                # left short retries once the budget allows, but at most once a second
+                timeout = next_refresh - time.monotonic()
+                if self.pool.missing():
+                    timeout = min(timeout, max(self.budget.wait_time(), self.RETRY_SECONDS))
+                self.pool.refill_needed.wait(max(0.0, timeout))
+
+        self._thread = threading.Thread(target=run, name="cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        self.pool.refill_needed.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the pool, the warming counters and the remaining budget.
+        """
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "pool": self.pool.stats(),
+            "prefetched": self.prefetched,
+            "refreshed": self.refreshed,
+            "failures": self.failures,
+            "budget_exhausted": self.budget_exhausted,
+            "budget": self.budget.stats(),
+            "popular": self.popular.stats(),
+        }
+
+
+class Revalidator:
+    """
+    Refreshes stale drinks in the background while callers are served the stale copy.
+
+    A name is refreshed at most once at a time. After a refresh fails, the
+    name is not retried for ``retry_after`` seconds, so an unreachable
+    upstream is not asked again on every request. The worker threads are
+    started by the first refresh.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str], Any],
+        workers: int = 2,
+        retry_after: float = 30.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            refresh (Callable[[str], Any]): Fetches a drink by name from the upstream and caches it.
+            workers (int): Refreshes run concurrently.
+            retry_after (float): Seconds before a name whose refresh failed is tried again.
+            timer (Callable): Monotonic clock, injectable for tests.
+        """
+        self.refresh = refresh
+        self.workers = workers
+        self.retry_after = retry_after
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._retry_at: Dict[str, float] = {}
+        self.scheduled = 0
+        self.refreshed = 0
+        self.failures = 0
+
+    def schedule(self, name: str) -> bool:
+        """
+        Refresh ``name`` in the background unless it is already being refreshed or recently failed.
+
+        Returns:
+            bool: True if a refresh was started.
+        """
+        key = normalize_key(name)
+        with self._lock:
+            if key in self._pending or self._retry_at.get(key, 0.0) > self._timer():
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="revalidate")
+            self._pending[key] = self._executor.submit(self._run, key, name)
+            self.scheduled += 1
+        return True
+
+    def _run(self, key: str, name: str) -> None:
+        retry_at = None
+        try:
+            self.refresh(name)
+            self.refreshed += 1
+        except ValueError as e:
+            # The upstream answered; the drink is now cached as not found
+            self.refreshed += 1
+            logger.info("Stale drink '%s' no longer exists upstream: %s", name, e)
+        except RuntimeError as e:
+            self.failures += 1
+            retry_at = self._timer() + self.retry_after
+            logger.warning("Could not revalidate stale drink '%s': %s", name, e)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+                if retry_at is None:
+                    self._retry_at.pop(key, None)
+                else:
+                    self._retry_at[key] = retry_at
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait until the refreshes started so far have finished."""
+        with self._lock:
+            pending = list(self._pending.values())
+        wait(pending, timeout=timeout)
+
+    def clear(self) -> None:
+        """Forget failed names and reset the counters; refreshes in progress carry on."""
+        with self._lock:
+            self._retry_at.clear()
+            self.scheduled = self.refreshed = self.failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the refreshes in progress, the counters and the names waiting to be retried.
+        """
+        now = self._timer()
+        with self._lock:
+            return {
+                "in_progress": len(self._pending),
+                "scheduled": self.scheduled,
+                "refreshed": self.refreshed,
+                "failures": self.failures,
+                "backing_off": sum(1 for retry_at in self._retry_at.values() if retry_at > now),
+            }
@@ -5,9 +5,60 @@ class ProductionConfig():
     DEBUG = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:///app.db")
+    # Connection pool; DB_POOL_RECYCLE (seconds) and DB_POOL_PRE_PING only apply to database servers
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', "5"))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', "10"))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', "30"))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', "1800"))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', "true").lower() == "true"
+    # Pragmas run on every SQLite connection; ignored for other databases
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 2 ** 20)))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', "5000"))
+    SQLITE_FOREIGN_KEYS = True
+    # Apply pending schema migrations in create_app; otherwise run `flask migrate-db` once per deployment
+    DB_MIGRATE_ON_START = os.getenv('DB_MIGRATE_ON_START', "false").lower() == "true"
+    ALCOHOLIC_INDEX_REFRESH_SECONDS = float(os.getenv('ALCOHOLIC_INDEX_REFRESH_SECONDS', "3600"))
+    DRINK_WARMER_INTERVAL = float(os.getenv('DRINK_WARMER_INTERVAL', "60"))  # 0 disables the cache warmer
+    # Largest names list accepted by /drinks/alcoholic-count; each unknown name may cost an upstream search
+    ALCOHOLIC_COUNT_MAX_NAMES = int(os.getenv('ALCOHOLIC_COUNT_MAX_NAMES', "100"))
+    PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM', "scrypt")  # scrypt or pbkdf2_sha256
+    PASSWORD_SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', str(2 ** 14)))
+    PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', "600000"))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', "64"))
+    # Per client address on /login and /create-account; 0 disables the limit
+    AUTH_RATE_LIMIT_PER_MINUTE = float(os.getenv('AUTH_RATE_LIMIT_PER_MINUTE', "10"))
+    AUTH_RATE_LIMIT_BURST = float(os.getenv('AUTH_RATE_LIMIT_BURST', "5"))
+    USER_BULK_TOKEN = os.getenv('USER_BULK_TOKEN', "")  # bearer token for /users/bulk; empty disables it
+    USER_BULK_BATCH_SIZE = int(os.getenv('USER_BULK_BATCH_SIZE', "500"))
+    REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', "true").lower() == "true"
+    LOG_LEVEL = os.getenv('LOG_LEVEL', "INFO")
+    LOG_FORMAT = os.getenv('LOG_FORMAT', "json")  # json or text
+    LOG_DEBUG_SAMPLE_EVERY = int(os.getenv('LOG_DEBUG_SAMPLE_EVERY', "10"))  # keep 1 in N debug lines per call site
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    # In-memory SQLite unless TEST_DATABASE_URL points the suite at another database (e.g. Postgres)
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///:memory:')
+    SQLITE_FOREIGN_KEYS = True  # Enforce foreign keys like Postgres does
+    DB_MIGRATE_ON_START = True  # Every in-memory database starts empty
+    ALCOHOLIC_INDEX_REFRESH_SECONDS = 0  # No background refresh thread in tests
+    DRINK_WARMER_INTERVAL = 0  # No cache warmer thread in tests
+    ALCOHOLIC_COUNT_MAX_NAMES = 10
+    PASSWORD_HASH_ALGORITHM = "scrypt"
+    PASSWORD_SCRYPT_N = 2 ** 8  # Cheap hashes keep the test suite fast
+    PASSWORD_PBKDF2_ITERATIONS = 1000
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_MAX_PENDING = 8
+    AUTH_RATE_LIMIT_PER_MINUTE = 0  # Tests log in far more often than a client may
+    AUTH_RATE_LIMIT_BURST = 5
+    USER_BULK_TOKEN = "test-bulk-token"
+    USER_BULK_BATCH_SIZE = 3  # Small batches exercise the batch boundaries
+    REQUEST_METRICS_ENABLED = True
+    LOG_LEVEL = "DEBUG"
+    LOG_FORMAT = "text"
+    LOG_DEBUG_SAMPLE_EVERY = 1
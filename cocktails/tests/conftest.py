@@ -5,7 +5,16 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app import create_app
-from cocktail_maker.db import db
+from benchmarks.stub_upstream import StubUpstream
+from cocktail_maker import instrumentation
+from cocktail_maker.db import db, query_latency
+from cocktail_maker.models.drink_list_model import list_bodies
+from cocktail_maker.models.drink_model import (
+    alcoholic_index, catalog_stats, in_memory_data, ingredient_index, name_index, popular_drinks, random_pool,
+    revalidator, stale_served
+)
+from cocktail_maker.models.user_model import user_cache
+from cocktail_maker.utils import http_client
 from config import TestConfig
 
 @pytest.fixture
@@ -28,3 +37,42 @@ def session(app):
     """Provide a database session for tests."""
     with app.app_context():
         yield db.session
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Run the stub CocktailDB API and point the shared HTTP client at it."""
+    with StubUpstream(latency=0, unknown="empty") as upstream:
+        monkeypatch.setattr(http_client, "COCKTAILDB_BASE_URL", upstream.base_url)
+        monkeypatch.setattr(http_client, "backoff_delay", lambda attempt: 0)
+        yield upstream
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breaker():
+    """Start every test with a closed upstream circuit breaker."""
+    http_client.breaker.reset()
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with empty request and query histograms."""
+    instrumentation.request_latency.reset()
+    query_latency.reset()
+
+@pytest.fixture(autouse=True)
+def no_alcoholic_index_loads(monkeypatch):
+    """Keep lookups on the shared alcoholic index from loading it from the live API in a background thread."""
+    monkeypatch.setattr(alcoholic_index, "load_in_background", lambda: False)
+
+@pytest.fixture(autouse=True)
+def clear_drink_cache():
+    """Start every test with empty drink and user caches and unloaded indexes."""
+    in_memory_data.clear()
+    list_bodies.clear()
+    ingredient_index.clear()
+    name_index.clear()
+    catalog_stats.clear()
+    random_pool.clear()
+    popular_drinks.clear()
+    alcoholic_index.clear()
+    user_cache.clear()
+    revalidator.clear()
+    stale_served.reset()
@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from cocktail_maker.models.drink_model import Drink, alcoholic_index
+from cocktail_maker.utils.alcoholic_index import AlcoholicIndex
+
+ALCOHOLIC = [{"idDrink": "11007", "strDrink": "Margarita"}, {"idDrink": "11001", "strDrink": "Old Fashioned"}]
+NON_ALCOHOLIC = [{"idDrink": "12560", "strDrink": "Afterglow"}]
+
+
+class FakeClock:
+    """Manually advanced clock for refresh tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def loader():
+    return MagicMock(side_effect=lambda alcoholic: ALCOHOLIC if alcoholic else NON_ALCOHOLIC)
+
+
+def test_lookup_by_name(loader, clock):
+    """Test normalized name lookups against both lists."""
+    index = AlcoholicIndex(loader, timer=clock)
+    index.refresh()
+
+    assert index.lookup(" margarita ") is True
+    assert index.lookup("AFTERGLOW") is False
+    assert index.lookup("Mystery Punch") is None
+    assert loader.call_count == 2
+
+
+def test_cold_lookup_loads_in_background(clock):
+    """Test that a lookup on an unloaded index returns None at once and loads the lists off the request path."""
+    release = threading.Event()
+
+    def slow_loader(alcoholic):
+        release.wait(5)
+        return ALCOHOLIC if alcoholic else NON_ALCOHOLIC
+
+    index = AlcoholicIndex(slow_loader, timer=clock)
+
+    assert index.lookup("Margarita") is None
+    assert not index.load_in_background()  # already loading
+    release.set()
+    index.wait_for_load(5)
+    assert index.lookup("Margarita") is True
+    assert index.refreshes == 1
+
+
+def test_reload_when_stale(loader, clock):
+    """Test that the sets are reloaded once older than max_age."""
+    index = AlcoholicIndex(loader, max_age=10, timer=clock)
+    index.lookup("Margarita")
+    index.wait_for_load()
+    clock.now = 11
+    index.lookup("Margarita")
+    index.wait_for_load()
+
+    assert index.refreshes == 2
+
+
+def test_failed_refresh_keeps_stale_sets(loader, clock):
+    """Test that a failed reload keeps serving the previous sets and backs off."""
+    index = AlcoholicIndex(loader, max_age=10, retry_interval=30, timer=clock)
+    index.refresh()
+
+    loader.side_effect = RuntimeError("API down")
+    clock.now = 11
+    assert index.lookup("Margarita") is True
+    index.wait_for_load()
+    assert index.failures == 1
+
+    clock.now = 20
+    assert index.lookup("Margarita") is True
+    index.wait_for_load()
+    assert index.failures == 1  # still backing off
+
+
+def test_lookup_without_data(clock):
+    """Test that an index that never loaded returns None."""
+    index = AlcoholicIndex(MagicMock(side_effect=RuntimeError("API down")), timer=clock)
+
+    assert index.lookup("Margarita") is None
+    index.wait_for_load()
+    assert index.lookup("Margarita") is None
+    with pytest.raises(RuntimeError, match="Failed to refresh alcoholic index"):
+        index.refresh()
+
+
+def test_batch_statuses_use_index(mocker):
+    """Test that batch classification needs no per-drink lookups for indexed drinks."""
+    mocker.patch(
+        "cocktail_maker.models.drink_model.fetch_drinks_by_alcoholic",
+        side_effect=lambda alcoholic: ALCOHOLIC if alcoholic else NON_ALCOHOLIC,
+    )
+    alcoholic_index.refresh()
+    with patch("cocktail_maker.models.drink_model.Drink.get_drink_by_name") as mock_get:
+        statuses = Drink.get_alcoholic_statuses(["Margarita", "Afterglow", "old fashioned"])
+
+    assert statuses == {"Margarita": True, "Afterglow": False, "old fashioned": True}
+    mock_get.assert_not_called()
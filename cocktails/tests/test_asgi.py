@@ -0,0 +1,229 @@
+import asyncio
+import json
+
+import pytest
+import requests
+from unittest.mock import AsyncMock, MagicMock
+
+from asgi import AsyncDrinkApp
+from cocktail_maker import instrumentation
+from cocktail_maker.models import drink_model
+from cocktail_maker.models.drink_model import in_memory_data
+from cocktail_maker.utils import async_http_client
+from cocktail_maker.utils.async_http_client import AsyncResponse
+from cocktail_maker.utils.cache import NOT_FOUND
+from cocktail_maker.utils.http_cache import STALE_WARNING
+
+
+def drink_payload(name: str = "Margarita", alcoholic: str = "Alcoholic") -> dict:
+    drink = {
+        "idDrink": "11007",
+        "strDrink": name,
+        "strCategory": "Ordinary Drink",
+        "strAlcoholic": alcoholic,
+        "strGlass": "Cocktail glass",
+        "strInstructions": "Shake and strain.",
+        "strDrinkThumb": "https://example.com/margarita.jpg",
+    }
+    for i in range(1, 16):
+        drink[f"strIngredient{i}"] = "Tequila" if i == 1 else None
+        drink[f"strMeasure{i}"] = "1 1/2 oz" if i == 1 else None
+    return {"drinks": [drink]}
+
+
+def upstream_response(body: dict) -> AsyncResponse:
+    return AsyncResponse(200, json.dumps(body).encode())
+
+
+def call(asgi_app, path: str, headers=(), response_headers=None):
+    """Drive one GET request through the ASGI app and return (status, json body)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+    }
+    scope["headers"] = [(name.lower().encode(), value.encode()) for name, value in headers]
+    asyncio.run(asgi_app(scope, receive, send))
+    if response_headers is not None:
+        response_headers.update((name.decode(), value.decode()) for name, value in messages[0]["headers"])
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], json.loads(body) if body else None
+
+
+@pytest.fixture
+def asgi_app(app):
+    return AsyncDrinkApp(app)
+
+
+@pytest.fixture
+def mock_async_get(mocker):
+    """Mock the async upstream client."""
+    return mocker.patch("cocktail_maker.utils.async_http_client.get", new_callable=AsyncMock)
+
+
+##########################################################
+# Async drink routes
+##########################################################
+
+def test_drink_by_name(asgi_app, mock_async_get):
+    """Test that a drink is fetched through the async client and cached."""
+    mock_async_get.return_value = upstream_response(drink_payload())
+
+    status, body = call(asgi_app, "/drink/margarita")
+
+    assert status == 200
+    assert body["drink"]["name"] == "Margarita"
+    assert body["drink"]["ingredients"][0] == "Tequila"
+    mock_async_get.assert_awaited_once_with("search.php", params={"s": "margarita"})
+
+    # The second request is served from the shared cache
+    status, _ = call(asgi_app, "/drink/Margarita")
+    assert status == 200
+    assert mock_async_get.await_count == 1
+
+
+def test_drink_by_name_not_found(asgi_app, mock_async_get):
+    """Test that an empty search answers 404 and is cached negatively."""
+    mock_async_get.return_value = upstream_response({"drinks": None})
+
+    status, body = call(asgi_app, "/drink/Nope")
+
+    assert status == 404
+    assert "not found" in body["error"]
+    assert in_memory_data.get("nope") is NOT_FOUND
+
+
+def test_async_routes_are_timed(asgi_app, mock_async_get):
+    """Test that async routes are recorded under the same route labels as the Flask routes."""
+    mock_async_get.return_value = upstream_response({"drinks": None})
+
+    call(asgi_app, "/drink/Nope")
+
+    histogram = instrumentation.request_latency.labels("/drink/<string:drink_name>", "GET", "404")
+    assert histogram.snapshot()["count"] == 1
+    assert instrumentation.requests_in_flight.value == 0
+
+
+def test_drink_by_name_upstream_failure(asgi_app, mock_async_get):
+    """Test that an upstream failure answers 500."""
+    mock_async_get.side_effect = requests.exceptions.ConnectionError("down")
+
+    status, body = call(asgi_app, "/drink/Margarita")
+
+    assert status == 500
+    assert "Failed to fetch drink by name" in body["error"]
+
+
+@pytest.mark.parametrize("path", ["/drink/Margarita", "/random-drink"])
+def test_stale_drink_served_on_upstream_failure(asgi_app, mock_async_get, monkeypatch, path):
+    """Test that the async drink routes fall back to a stale copy, flagged, when the upstream fails."""
+    monkeypatch.setattr(drink_model, "DRINK_STALE_WHILE_REVALIDATE", 0)
+    mock_async_get.return_value = upstream_response(drink_payload())
+    call(asgi_app, "/drink/Margarita")
+    drink = in_memory_data.get("margarita")
+    drink.fetched_at -= in_memory_data.ttl + 60
+    in_memory_data.set("margarita", drink, ttl=-60)
+    mock_async_get.side_effect = requests.exceptions.ConnectionError("down")
+    headers = {}
+
+    status, body = call(asgi_app, path, response_headers=headers)
+
+    assert status == 200
+    assert body["drink"]["name"] == "Margarita" and body["stale"] is True
+    assert headers["warning"] == STALE_WARNING
+
+
+def test_drink_by_name_revalidates(asgi_app, mock_async_get):
+    """Test that the async drink route answers a matching If-None-Match with 304."""
+    mock_async_get.return_value = upstream_response(drink_payload())
+    headers = {}
+    call(asgi_app, "/drink/margarita", response_headers=headers)
+
+    status, body = call(asgi_app, "/drink/margarita", headers=[("If-None-Match", headers["etag"])])
+
+    assert (status, body) == (304, None)
+    assert mock_async_get.await_count == 1
+
+
+def test_random_drink(asgi_app, mock_async_get):
+    """Test the async random drink route."""
+    mock_async_get.return_value = upstream_response(drink_payload("Mojito"))
+
+    status, body = call(asgi_app, "/random-drink")
+
+    assert status == 200
+    assert body["drink"]["name"] == "Mojito"
+    assert in_memory_data.get("mojito").name == "Mojito"
+
+
+def test_drink_alcoholic(asgi_app, mock_async_get, mocker):
+    """Test that drinks outside the alcoholic index fall back to an async detail fetch."""
+    mocker.patch("cocktail_maker.models.drink_model.fetch_drinks_by_alcoholic", return_value=[])
+    mock_async_get.return_value = upstream_response(drink_payload("Virgin Mary", "Non alcoholic"))
+
+    status, body = call(asgi_app, "/drink/Virgin Mary/alcoholic")
+
+    assert status == 200
+    assert body["is_alcoholic"] is False
+
+
+def test_other_routes_are_served_by_flask(asgi_app, mock_async_get):
+    """Test that routes without an async handler are delegated to the Flask app."""
+    status, body = call(asgi_app, "/health")
+
+    assert status == 200
+    assert body == {"status": "healthy"}
+    mock_async_get.assert_not_awaited()
+
+
+##########################################################
+# Async client
+##########################################################
+
+class FakeResponse:
+    def __init__(self, status: int, body: bytes = b"{}"):
+        self.status = status
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def test_async_client_retries_server_errors(mocker):
+    """Test that the async client retries 5xx responses like the sync client."""
+    session = MagicMock()
+    session.get.side_effect = [FakeResponse(503), FakeResponse(200, b'{"drinks": []}')]
+    mocker.patch("cocktail_maker.utils.async_http_client._get_session", return_value=session)
+    mocker.patch("cocktail_maker.utils.http_client.backoff_delay", return_value=0)
+
+    response = asyncio.run(async_http_client.get("search.php", params={"s": "x"}))
+
+    assert response.status_code == 200
+    assert response.json() == {"drinks": []}
+    assert session.get.call_count == 2
+
+
+def test_async_client_does_not_retry_client_errors(mocker):
+    """Test that a 4xx response is raised immediately as a requests HTTPError."""
+    session = MagicMock()
+    session.get.return_value = FakeResponse(404)
+    mocker.patch("cocktail_maker.utils.async_http_client._get_session", return_value=session)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        asyncio.run(async_http_client.get("search.php"))
+
+    assert session.get.call_count == 1
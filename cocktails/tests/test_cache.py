@@ -0,0 +1,106 @@
+import pytest
+
+from cocktail_maker.utils.cache import NOT_FOUND, TTLCache, normalize_key
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_normalize_key():
+    """Test that case and whitespace differences map to the same key."""
+    assert normalize_key("  Margarita ") == "margarita"
+    assert normalize_key("Old   Fashioned") == normalize_key("old fashioned")
+
+
+def test_get_and_set(clock):
+    """Test a basic hit and miss."""
+    cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+    cache.set("margarita", {"name": "Margarita"})
+
+    assert cache.get("margarita") == {"name": "Margarita"}
+    assert cache.get("mojito") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction(clock):
+    """Test that the least recently used entry is evicted at capacity."""
+    cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(clock):
+    """Test that entries expire once their TTL has elapsed."""
+    cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+    cache.set("a", 1)
+    clock.now = 10.5
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stale_entry_is_kept_for_get_stale(clock):
+    """Test that an expired entry stays available to get_stale for stale_ttl seconds, and not after a 404."""
+    cache = TTLCache(maxsize=2, ttl=10, stale_ttl=20, timer=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    clock.now = 15
+
+    assert cache.get("a") is None
+    assert cache.get_stale("a") == 1
+    cache.set_negative("b")
+    assert cache.get_stale("b") is None
+
+    clock.now = 30.5
+    assert cache.get_stale("a") is None
+    assert len(cache) == 1
+
+
+def test_negative_entry(clock):
+    """Test that negative entries are returned as NOT_FOUND and use their own TTL."""
+    cache = TTLCache(maxsize=2, ttl=100, negative_ttl=5, timer=clock)
+    cache.set_negative("unknown")
+
+    assert cache.get("unknown") is NOT_FOUND
+    assert cache.stats()["negative_hits"] == 1
+
+    clock.now = 6
+    assert cache.get("unknown") is None
+
+
+def test_clear_resets_counters(clock):
+    """Test that clear empties the cache and resets the counters."""
+    cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 0
+
+
+def test_invalid_maxsize():
+    """Test that a non-positive maxsize is rejected."""
+    with pytest.raises(ValueError, match="maxsize must be a positive integer"):
+        TTLCache(maxsize=0)
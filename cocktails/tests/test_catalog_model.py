@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+from cocktail_maker.db import db
+from cocktail_maker.models.catalog_model import CatalogDrink, load_catalog_dump
+from cocktail_maker.models.drink_model import Drink
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+@pytest.fixture
+def catalog(app):
+    """Load the fixture dump into the catalog mirror."""
+    CatalogDrink.ingest(load_catalog_dump(FIXTURE_DUMP))
+    return app
+
+
+@pytest.fixture
+def mock_requests_get(mocker):
+    """Fail the test if the upstream API is called."""
+    return mocker.patch("cocktail_maker.utils.http_client.session.get", side_effect=AssertionError("unexpected HTTP call"))
+
+
+##########################################################
+# Ingest
+##########################################################
+
+def test_load_catalog_dump():
+    """Test loading raw drink records from the fixture dump."""
+    drinks = load_catalog_dump(FIXTURE_DUMP)
+    assert len(drinks) == 6
+    assert drinks[0]["strDrink"] == "Margarita"
+
+
+def test_load_catalog_dump_invalid(tmp_path):
+    """Test that a dump without a drinks list is rejected."""
+    path = tmp_path / "dump.json"
+    path.write_text('{"drinks": null}')
+    with pytest.raises(ValueError, match="does not contain a list of drinks"):
+        load_catalog_dump(path)
+
+
+def test_ingest(catalog, session):
+    """Test that the ingest writes every record with normalized names."""
+    assert session.query(CatalogDrink).count() == 6
+    row = session.get(CatalogDrink, 11001)
+    assert row.name == "Old Fashioned"
+    assert row.name_normalized == "old fashioned"
+    assert len(row.ingredients) == 15
+
+
+def test_ingest_is_idempotent(catalog, session):
+    """Test that re-ingesting updates rows instead of duplicating them."""
+    drinks = load_catalog_dump(FIXTURE_DUMP)
+    drinks[0]["strGlass"] = "Margarita glass"
+    assert CatalogDrink.ingest(drinks, batch_size=4) == 6
+
+    assert session.query(CatalogDrink).count() == 6
+    assert session.get(CatalogDrink, 11007).glass == "Margarita glass"
+
+
+def test_ingest_command(app, session):
+    """Test the ingest-catalog CLI command with a local dump."""
+    result = app.test_cli_runner().invoke(args=["ingest-catalog", "--file", str(FIXTURE_DUMP)])
+    assert result.exit_code == 0
+    assert "Ingested 6 drinks" in result.output
+    assert session.query(CatalogDrink).count() == 6
+
+
+##########################################################
+# Lookups
+##########################################################
+
+def test_get_by_name(catalog):
+    """Test a normalized lookup against the mirror."""
+    drink = CatalogDrink.get_by_name("  MOJITO ")
+    assert drink["id"] == 11000
+    assert drink["ingredients"][:2] == ["Light rum", "Lime"]
+
+
+def test_get_by_name_missing(catalog):
+    """Test a lookup for a drink that is not mirrored."""
+    assert CatalogDrink.get_by_name("Nonexistent") is None
+
+
+def test_get_drink_by_name_reads_mirror(catalog, mock_requests_get):
+    """Test that get_drink_by_name is served from the mirror without HTTP."""
+    drink = Drink.get_drink_by_name("margarita")
+    assert drink["name"] == "Margarita"
+    assert drink["alcoholic"] == "Alcoholic"
+    mock_requests_get.assert_not_called()
+
+
+def test_drink_route_reads_mirror(catalog, client, mock_requests_get):
+    """Test that the /drink route is served from the mirror without HTTP."""
+    response = client.get("/drink/Old Fashioned")
+    assert response.status_code == 200
+    assert response.get_json()["drink"]["id"] == 11001
+    mock_requests_get.assert_not_called()
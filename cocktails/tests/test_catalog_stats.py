@@ -0,0 +1,165 @@
+import json
+import random
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+
+import pytest
+
+from cocktail_maker.models.catalog_model import CatalogDrink, load_catalog_dump
+from cocktail_maker.models.drink_model import Drink, catalog_stats
+from cocktail_maker.utils.catalog_stats import UNKNOWN, CatalogStats
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+@pytest.fixture
+def stats():
+    stats = CatalogStats(categories=["Cocktail", "Shot"], alcoholic=["Alcoholic", "Non alcoholic"])
+    stats.add(1, "Margarita", "Cocktail", "Alcoholic", "Cocktail glass",
+              ["Tequila", "Triple sec", "Lime juice", "Salt"])
+    stats.add(2, "Mojito", "Cocktail", "Alcoholic", "Highball glass", ["Light rum", "Lime", "Sugar", "Mint"])
+    stats.add(3, "Daiquiri", "Cocktail", "Alcoholic", "Cocktail glass", ["Light rum", "Lime juice", "Sugar"])
+    stats.add(4, "Lime Rickey", None, "Non alcoholic", None, ["Lime juice", "Sugar", "Soda water"])
+    return stats
+
+
+@pytest.fixture
+def catalog(app):
+    """Load the fixture dump into the catalog mirror."""
+    CatalogDrink.ingest(load_catalog_dump(FIXTURE_DUMP))
+    return app
+
+
+def test_overview_counts(stats):
+    """Test the category, alcoholic, glass and size counts, including unused and missing labels."""
+    overview = stats.overview()
+
+    assert overview["drinks"] == 4
+    assert overview["categories"] == {"Cocktail": 3, "Shot": 0, UNKNOWN: 1}
+    assert overview["alcoholic"] == {"Alcoholic": 3, "Non alcoholic": 1}
+    assert overview["glasses"] == [{"glass": "Cocktail glass", "drinks": 2},
+                                   {"glass": "Highball glass", "drinks": 1},
+                                   {"glass": UNKNOWN, "drinks": 1}]
+    assert overview["ingredients_per_drink"] == {"mean": 3.5, "max": 4, "histogram": [0, 0, 0, 2, 2]}
+
+
+def test_ingredient_frequency_and_pairs(stats):
+    """Test ingredient counts and co-occurrence, with ties broken alphabetically."""
+    assert stats.ingredient_frequency(3) == [{"ingredient": "Lime juice", "drinks": 3},
+                                             {"ingredient": "Sugar", "drinks": 3},
+                                             {"ingredient": "Light rum", "drinks": 2}]
+    assert stats.co_occurrence(limit=2) == [{"ingredients": ["Light rum", "Sugar"], "drinks": 2},
+                                            {"ingredients": ["Lime juice", "Sugar"], "drinks": 2}]
+    assert stats.co_occurrence("  lime JUICE", limit=2) == [{"ingredients": ["Lime juice", "Sugar"], "drinks": 2},
+                                                           {"ingredients": ["Lime juice", "Light rum"], "drinks": 1}]
+    assert stats.co_occurrence("Vodka") is None
+
+
+def test_matches_a_python_count():
+    """Test the vectorized aggregates against plain Counters over a random catalog."""
+    rng = random.Random(3)
+    pool = [f"Ingredient {i:02d}" for i in range(30)]
+    drinks = {i: (rng.choice(["Cocktail", "Shot", "Beer"]), rng.choice(["Highball", "Flute"]),
+                  rng.sample(pool, rng.randint(1, 6))) for i in range(300)}
+    stats = CatalogStats()
+    for drink_id, (category, glass, ingredients) in drinks.items():
+        stats.add(drink_id, f"Drink {drink_id}", category, "Alcoholic", glass, ingredients)
+
+    categories = Counter(category for category, _, _ in drinks.values())
+    assert stats.overview()["categories"] == dict(categories)
+    frequency = Counter(ingredient for _, _, ingredients in drinks.values() for ingredient in ingredients)
+    assert {row["ingredient"]: row["drinks"] for row in stats.ingredient_frequency(100)} == dict(frequency)
+    pairs = Counter(pair for _, _, ingredients in drinks.values() for pair in combinations(sorted(ingredients), 2))
+    expected = sorted(pairs.items(), key=lambda item: (-item[1], item[0]))[:10]
+    assert [(tuple(row["ingredients"]), row["drinks"]) for row in stats.co_occurrence(limit=10)] == expected
+
+
+def test_results_are_memoized_until_a_change(stats):
+    """Test that results are reused until a drink is added or changed, but not when re-added unchanged."""
+    first = stats.overview()
+    assert stats.overview() is first
+
+    stats.add(3, "Daiquiri", "Cocktail", "Alcoholic", "Cocktail glass", ["Light rum", "Lime juice", "Sugar"])
+    assert stats.overview() is first
+
+    stats.add(5, "Tequila Shot", "Shot", "Alcoholic", "Shot glass", ["Tequila"])
+    assert stats.overview() is not first
+    assert stats.overview()["categories"]["Shot"] == 1
+    assert stats.stats()["hits"] == 3
+
+
+def test_fetched_drinks_are_counted(mocker):
+    """Test that drinks fetched from the upstream are added to the statistics."""
+    drink = load_catalog_dump(FIXTURE_DUMP)[0]
+    mocker.patch("cocktail_maker.models.drink_model.fetch_random_drink_data", return_value={"drinks": [drink]})
+
+    Drink.get_random_drink()
+
+    assert catalog_stats.overview()["categories"]["Ordinary Drink"] == 1
+
+
+def test_stats_routes_read_the_mirror(client, catalog):
+    """Test the statistics routes over the catalog mirror and their validation."""
+    response = client.get('/stats')
+    assert response.status_code == 200
+    assert response.get_json()['drinks'] == 6
+    assert response.get_json()['alcoholic'] == {'Alcoholic': 4, 'Non alcoholic': 2, 'Optional alcohol': 0}
+
+    response = client.get('/stats/ingredients?limit=2')
+    assert response.get_json()['ingredients'] == [{'ingredient': 'Sugar', 'drinks': 3},
+                                                  {'ingredient': 'Grenadine', 'drinks': 2}]
+
+    response = client.get('/stats/ingredient-pairs?ingredient=grenadine&limit=1')
+    assert response.get_json()['pairs'] == [{'ingredients': ['Grenadine', 'Gin'], 'drinks': 1}]
+    assert client.get('/stats/ingredient-pairs?ingredient=Vodka').status_code == 404
+    assert client.get('/stats/ingredients?limit=0').status_code == 400
+
+
+def test_similar_ranks_by_shared_ingredients(stats):
+    """Test the cosine ranking, the shared ingredients and that unrelated drinks are left out."""
+    similar = stats.similar(2)
+
+    assert [drink["name"] for drink in similar] == ["Daiquiri", "Lime Rickey"]
+    assert [drink["shared"] for drink in similar] == [["Light rum", "Sugar"], ["Sugar"]]
+    assert similar[0]["score"] > similar[1]["score"] > 0
+    assert stats.similar(99) is None
+
+
+def test_precompute_matches_single_queries():
+    """Test that the batched neighbour lists equal one-by-one queries and are memoized for them."""
+    rng = random.Random(5)
+    pool = [f"Ingredient {i}" for i in range(40)]
+    drinks = [(drink_id, f"Drink {drink_id}", "Cocktail", "Alcoholic", None, rng.sample(pool, rng.randint(1, 6)))
+              for drink_id in range(200)]
+    single, batched = CatalogStats(), CatalogStats()
+    single.load(drinks)
+    batched.load(drinks)
+
+    neighbours = batched.precompute_similar(5, batch_size=32)
+
+    assert neighbours == {drink_id: single.similar(drink_id, 5) for drink_id in range(200)}
+    assert batched.similar(7, 5) is neighbours[7]
+
+
+def test_similar_route(client, catalog):
+    """Test the similar drinks route over the catalog mirror and its validation."""
+    response = client.get('/drink/afterglow/similar?limit=2')
+
+    assert response.status_code == 200
+    # Both share one ingredient with the Afterglow; the A1 has fewer others to dilute it
+    assert [drink['name'] for drink in response.get_json()['similar']] == ['A1', 'Aloha Fruit punch']
+    assert response.get_json()['similar'][0]['shared'] == ['Grenadine']
+    assert client.get('/drink/afterglow/similar?limit=500').status_code == 400
+
+
+def test_similar_drinks_command(app, catalog, tmp_path):
+    """Test that the CLI writes the neighbour lists of every mirrored drink."""
+    output = tmp_path / "similar.json"
+
+    result = app.test_cli_runner().invoke(args=["similar-drinks", "--limit", "2", "--output", str(output)])
+
+    assert result.exit_code == 0
+    similar = json.loads(output.read_text())
+    assert len(similar) == 6
+    assert [drink["name"] for drink in similar["Afterglow"]] == ["A1", "Aloha Fruit punch"]
@@ -0,0 +1,59 @@
+from sqlalchemy import create_engine, text
+
+from cocktail_maker.db import configure_engine, engine_options, normalize_database_url, sqlite_pragmas
+
+POOL_SETTINGS = {
+    "DB_POOL_SIZE": 5,
+    "DB_MAX_OVERFLOW": 10,
+    "DB_POOL_TIMEOUT": 30.0,
+    "DB_POOL_RECYCLE": 1800,
+    "DB_POOL_PRE_PING": True,
+}
+
+
+def test_engine_options_for_postgres():
+    """Test that every pool setting reaches create_engine for a database server."""
+    options = engine_options(dict(POOL_SETTINGS, SQLALCHEMY_DATABASE_URI="postgresql://app:secret@db/cocktails"))
+
+    assert options == {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30.0,
+                       "pool_recycle": 1800, "pool_pre_ping": True}
+
+
+def test_engine_options_for_sqlite():
+    """Test that SQLite files get pool sizes only, and in-memory SQLite keeps its single connection."""
+    file_options = engine_options(dict(POOL_SETTINGS, SQLALCHEMY_DATABASE_URI="sqlite:///app.db"))
+    memory_options = engine_options(dict(POOL_SETTINGS, SQLALCHEMY_DATABASE_URI="sqlite:///:memory:"))
+
+    assert file_options == {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30.0}
+    assert memory_options == {}
+
+
+def test_explicit_engine_options_win():
+    """Test that SQLALCHEMY_ENGINE_OPTIONS overrides the DB_POOL_* settings."""
+    options = engine_options(dict(POOL_SETTINGS, SQLALCHEMY_DATABASE_URI="postgresql://db/cocktails",
+                                  SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 20, "echo": True}))
+
+    assert options["pool_size"] == 20 and options["echo"] is True
+
+
+def test_normalize_database_url():
+    """Test that the postgres:// scheme is rewritten and other URLs are left alone."""
+    assert normalize_database_url("postgres://app@db/cocktails") == "postgresql://app@db/cocktails"
+    assert normalize_database_url("sqlite:///app.db") == "sqlite:///app.db"
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    """Test that every new SQLite connection runs the configured pragmas."""
+    config = {"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL", "SQLITE_MMAP_SIZE": 2 ** 20,
+              "SQLITE_BUSY_TIMEOUT_MS": 1234, "SQLITE_FOREIGN_KEYS": True}
+    assert sqlite_pragmas({"SQLITE_FOREIGN_KEYS": False, "SQLITE_MMAP_SIZE": None}) == ["PRAGMA foreign_keys=OFF"]
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    configure_engine(engine, config)
+    with engine.connect() as connection:
+        values = {pragma: connection.execute(text(f"PRAGMA {pragma}")).scalar()
+                  for pragma in ("journal_mode", "synchronous", "mmap_size", "busy_timeout", "foreign_keys")}
+    engine.dispose()
+
+    assert values == {"journal_mode": "wal", "synchronous": 1, "mmap_size": 2 ** 20,
+                      "busy_timeout": 1234, "foreign_keys": 1}
@@ -2,7 +2,11 @@ import pytest
 from flask.testing import FlaskClient
 from unittest.mock import MagicMock, patch
 
-from cocktail_maker.models.drink_list_model import DrinkListModel
+import time
+
+from cocktail_maker.models.drink_list_model import DrinkListModel, UserDrink
+from cocktail_maker.models.drink_model import Drink, alcoholic_index, in_memory_data
+from cocktail_maker.models.user_model import Users
 from app import create_app
 from cocktail_maker.db import db
 from config import TestConfig
@@ -26,16 +30,27 @@ def client():
             db.create_all()  # Set up the test database
         yield client
 
+@pytest.fixture
+def user(client):
+    """Create the account that owns the drink list."""
+    client.post('/create-account', json={'username': 'drinker', 'password': 'secret'})
+    return 'drinker'
+
+def make_drink(drink_id, name):
+    """Build a Drink as returned by fetch_drink_by_name."""
+    return Drink(id=drink_id, name=name, category="Cocktail", alcoholic="Alcoholic", glass="Cocktail glass",
+                 instructions="Shake.", ingredients=["Tequila"], measures=["1 oz"], thumbnail=None)
+
 @pytest.fixture
 def mock_fetch_drinks_by_alcoholic(mocker):
     """Fixture to mock fetch_drinks_by_alcoholic API calls."""
-    return mocker.patch('cocktail_maker.utils.random_utils.fetch_drinks_by_alcoholic')
+    return mocker.patch('cocktail_maker.models.drink_model.fetch_drinks_by_alcoholic')
 
 
-def test_add_drink(client, mock_drink_list):
+def test_add_drink(client, user):
     """Test the add drink API."""
-
-    response = client.post('/create-drink', json={'name': 'Margarita'})
+    with patch.object(DrinkListModel, 'fetch_drink_by_name', return_value=make_drink(11007, 'Margarita')):
+        response = client.post('/create-drink', json={'name': 'Margarita', 'username': user})
 
     # Validate response
     assert response.status_code == 201
@@ -51,25 +66,51 @@ def test_add_drink_invalid_name(client):
     assert response.status_code == 400
     assert response.get_json()['error'] == 'Drink name is required.'
 
-def test_add_drink_not_found(client, mock_drink_list):
+def test_add_drink_missing_username(client):
+    """Test the error case when the username is not provided."""
+    response = client.post('/create-drink', json={'name': 'Margarita'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Username is required.'
+
+def test_add_drink_unknown_user(client):
+    """Test the error case when the user does not exist."""
+    response = client.post('/create-drink', json={'name': 'Margarita', 'username': 'nobody'})
+    assert response.status_code == 404
+    assert response.get_json()['error'] == 'User nobody not found'
+
+def test_add_drink_twice(client, user):
+    """Test that adding a drink already in the list is a no-op."""
+    with patch.object(DrinkListModel, 'fetch_drink_by_name', return_value=make_drink(11007, 'Margarita')):
+        client.post('/create-drink', json={'name': 'Margarita', 'username': user})
+        response = client.post('/create-drink', json={'name': 'margarita', 'username': user})
+
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'Drink already in list'
+
+def test_add_drink_not_found(client, mock_drink_list, user):
     """Test the error case when the drink is not found in the external API."""
     with patch.object(DrinkListModel, 'fetch_drink_by_name', return_value=None):
-        response = client.post('/create-drink', json={'name': 'NonExistingDrink'})
+        response = client.post('/create-drink', json={'name': 'NonExistingDrink', 'username': user})
         assert response.status_code == 404
         assert response.get_json()['error'] == 'Drink not found in the external API.'
 
 
-def test_remove_drink(client, mocker):
+def test_remove_drink(client, user):
     """Test removing a drink successfully."""
-    with patch.object(DrinkListModel, 'remove_drink', return_value="Drink not found in the list."):
-        response = client.post('/remove-drink', json={'name': 'NonExistingDrink'})
-        assert response.status_code == 404
-        assert response.get_json()['error'] == 'Drink not found in the list.'
+    with patch.object(DrinkListModel, 'fetch_drink_by_name', return_value=make_drink(11007, 'Margarita')):
+        client.post('/create-drink', json={'name': 'Margarita', 'username': user})
 
-def test_remove_drink_not_found(client):
+    response = client.post('/remove-drink', json={'name': 'MARGARITA', 'username': user})
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'Drink removed'
+
+    response = client.get('/list-drinks', query_string={'username': user})
+    assert response.get_json() == []
+
+def test_remove_drink_not_found(client, user):
     """Test removing a non-existing drink."""
     with patch.object(DrinkListModel, 'remove_drink', return_value="Drink not found in the list.") as mock_remove:
-        response = client.post('/remove-drink', json={'name': 'NonExistingDrink'})
+        response = client.post('/remove-drink', json={'name': 'NonExistingDrink', 'username': user})
         assert response.status_code == 404
         assert response.get_json()['error'] == 'Drink not found in the list.'
 
@@ -83,32 +124,48 @@ def test_remove_drink_missing_name(client):
 
 
 
-def test_list_drinks(client, mocker):
+def test_list_drinks(client, mocker, user):
     """Test listing drinks in alphabetical order."""
     with patch('cocktail_maker.models.drink_list_model.DrinkListModel.list_drinks_in_alphabetical_order') as mock_list:
         mock_list.return_value = ['Martini', 'Margarita']
 
     mock_list = mocker.patch.object(DrinkListModel, 'list_drinks_in_alphabetical_order', return_value=['Martini', 'Margarita'])
 
-    response = client.get('/list-drinks')
+    response = client.get('/list-drinks', query_string={'username': user})
 
     assert response.status_code == 200
     json_data = response.get_json()
     assert json_data == ['Martini', 'Margarita']
 
-def test_list_drinks_empty(client, mocker):
+def test_list_drinks_sorted_per_user(client, user):
+    """Test that each user's list is stored separately and sorted by name."""
+    client.post('/create-account', json={'username': 'other', 'password': 'secret'})
+    for drink in [make_drink(11001, 'Old Fashioned'), make_drink(11000, 'mojito'), make_drink(17222, 'A1')]:
+        with patch.object(DrinkListModel, 'fetch_drink_by_name', return_value=drink):
+            client.post('/create-drink', json={'name': drink.name, 'username': user})
+
+    assert client.get('/list-drinks', query_string={'username': user}).get_json() == ['A1', 'mojito', 'Old Fashioned']
+    assert client.get('/list-drinks', query_string={'username': 'other'}).get_json() == []
+
+def test_list_drinks_missing_username(client):
+    """Test the error case when the username is not provided."""
+    response = client.get('/list-drinks')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Username is required.'
+
+def test_list_drinks_empty(client, mocker, user):
     """Test listing drinks when the list is empty."""
     with patch.object(DrinkListModel, 'list_drinks_in_alphabetical_order', return_value=[]):
-        response = client.get('/list-drinks')
+        response = client.get('/list-drinks', query_string={'username': user})
         assert response.status_code == 200
         assert response.get_json() == []
 
-def test_list_drinks_error(client, mocker):
+def test_list_drinks_error(client, mocker, user):
     """Test handling errors during drink listing."""
-    with patch('cocktail_maker.models.drink_list_model.DrinkListModel.list_drinks_in_alphabetical_order') as mock_list:
-        mock_list.side_effect = Exception("Error retrieving drinks")
+    mocker.patch.object(DrinkListModel, 'list_drinks_in_alphabetical_order',
+                        side_effect=Exception("Error retrieving drinks"))
 
-    response = client.get('/list-drinks')
+    response = client.get('/list-drinks', query_string={'username': user})
 
     assert response.status_code == 500
     json_data = response.get_json()
@@ -118,21 +175,26 @@ def test_list_drinks_error(client, mocker):
 # tests for counting alcoholic drinks
 #################################################################################################
 def test_count_alcoholic_drinks(mock_fetch_drinks_by_alcoholic):
-    """Test counting the number of alcoholic drinks in a list."""
-    # Mock API response for alcoholic drinks
-    mock_fetch_drinks_by_alcoholic.return_value = [{"strDrink": "Margarita"}, {"strDrink": "Old Fashioned"}]
+    """Test counting alcoholic drinks from the alcoholic index, looking up only the drinks it does not list."""
+    # Mock API responses for the alcoholic and non-alcoholic filter lists
+    mock_fetch_drinks_by_alcoholic.side_effect = lambda alcoholic: (
+        [{"strDrink": "Margarita"}, {"strDrink": "Old Fashioned"}] if alcoholic
+        else [{"strDrink": "Fruit Punch"}, {"strDrink": "Cranberry Punch"}]
+    )
+    alcoholic_index.refresh()
 
     drink_list = ["Margarita", "Fruit Punch", "Old Fashioned", "Cranberry Punch", "Mojito"]
 
     # Mock `Drink.is_drink_alcoholic`
     with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic') as mock_is_alcoholic:
-        mock_is_alcoholic.side_effect = lambda name: name in ["Margarita", "Old Fashioned"]
+        mock_is_alcoholic.return_value = False
 
         result = DrinkListModel.count_alcoholic_drinks(drink_list)
         assert result == 2
+        mock_is_alcoholic.assert_called_once_with("Mojito")
 
 
-def test_count_alcoholic_drinks_with_errors(mock_fetch_drinks_by_alcoholic):
+def test_count_alcoholic_drinks_with_errors():
     """Test counting alcoholic drinks when some drinks are not found."""
     # Mock `Drink.is_drink_alcoholic` to raise errors for unknown drinks
     with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic') as mock_is_alcoholic:
@@ -153,4 +215,91 @@ def test_count_alcoholic_drinks_empty_list():
     result = DrinkListModel.count_alcoholic_drinks([])
     assert result == 0
 
+def test_count_alcoholic_drinks_dedupes_names():
+    """Test that repeated names are looked up once but counted per entry."""
+    with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic') as mock_is_alcoholic:
+        mock_is_alcoholic.side_effect = lambda name: name.strip().lower() == "margarita"
+
+        result = DrinkListModel.count_alcoholic_drinks(["Margarita", "margarita", " MARGARITA", "Mojito"])
+
+        assert result == 3
+        assert mock_is_alcoholic.call_count == 2
+
+
+def test_count_alcoholic_drinks_uses_cache():
+    """Test that cached drinks are answered without a lookup."""
+    in_memory_data.set("margarita", make_drink(11007, "Margarita"))
+    in_memory_data.set_negative("unknown drink")
+
+    with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic') as mock_is_alcoholic:
+        result = DrinkListModel.count_alcoholic_drinks(["Margarita", "Unknown Drink"])
+
+        assert result == 1
+        mock_is_alcoholic.assert_not_called()
+
+
+def test_count_alcoholic_drinks_is_concurrent():
+    """Test that uncached lookups run concurrently rather than one after another."""
+    def slow_lookup(name):
+        time.sleep(0.05)
+        return True
+
+    names = [f"Drink {i}" for i in range(20)]
+    with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic', side_effect=slow_lookup):
+        start = time.perf_counter()
+        result = DrinkListModel.count_alcoholic_drinks(names)
+        elapsed = time.perf_counter() - start
+
+    assert result == 20
+    assert elapsed < 0.5
+
+
+def test_count_alcoholic_drinks_upstream_error():
+    """Test that an upstream failure surfaces as a RuntimeError."""
+    with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic',
+               side_effect=RuntimeError("API down")):
+        with pytest.raises(RuntimeError, match="Error counting alcoholic drinks"):
+            DrinkListModel.count_alcoholic_drinks(["Margarita"])
+
+
+def test_alcoholic_count_route(client):
+    """Test the batch alcoholic count endpoint."""
+    with patch('cocktail_maker.models.drink_model.Drink.is_drink_alcoholic') as mock_is_alcoholic:
+        mock_is_alcoholic.side_effect = lambda name: name == "Margarita"
+
+        response = client.post('/drinks/alcoholic-count', json={'names': ['Margarita', 'Fruit Punch']})
+
+    assert response.status_code == 200
+    json_data = response.get_json()
+    assert json_data['count'] == 1
+    assert json_data['total'] == 2
+    assert json_data['statuses'] == {'Margarita': True, 'Fruit Punch': False}
+
+
+def test_alcoholic_count_route_invalid_body(client):
+    """Test the batch endpoint rejects a missing names list."""
+    response = client.post('/drinks/alcoholic-count', json={'names': 'Margarita'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'A list of drink names is required.'
+
+
+def test_alcoholic_count_route_rejects_long_lists(client):
+    """Test the batch endpoint rejects more names than ALCOHOLIC_COUNT_MAX_NAMES without looking any up."""
+    with patch('cocktail_maker.models.drink_model.Drink.get_alcoholic_statuses') as mock_statuses:
+        response = client.post('/drinks/alcoholic-count', json={'names': [f'Drink {i}' for i in range(11)]})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'At most 10 drink names can be checked at once.'
+    mock_statuses.assert_not_called()
+
 #################################################################################################
+
+def test_delete_user_removes_list(client, user):
+    """Test that deleting a user deletes their drink list."""
+    with patch.object(DrinkListModel, 'fetch_drink_by_name', return_value=make_drink(11007, 'Margarita')):
+        client.post('/create-drink', json={'name': 'Margarita', 'username': user})
+
+    with client.application.app_context():
+        assert db.session.query(UserDrink).count() == 1
+        Users.delete_user(user)
+        assert db.session.query(UserDrink).count() == 0
@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 import requests
+import threading
+import time
 from contextlib import contextmanager
 from unittest.mock import patch
 import re
@@ -9,7 +12,11 @@ import pytest
 from unittest.mock import MagicMock
 
 from cocktail_maker.models.drink_model import (
+    Alcoholic,
+    Category,
     Drink,
+    alcoholic_index,
+    drink_fetches,
     in_memory_data
 )
 
@@ -29,9 +36,9 @@ def mock_fetch_random_drink_data(mocker):
 @pytest.fixture
 def mock_requests_get(mocker):
     """
-    Mock the requests.get function.
+    Mock the shared HTTP session's get function.
     """
-    mock = mocker.patch("requests.get")
+    mock = mocker.patch("cocktail_maker.utils.http_client.session.get")
     return mock
 
 @pytest.fixture(autouse=True)
@@ -185,6 +192,126 @@ def test_get_drink_by_name_api_failure(mock_requests_get):
         Drink.get_drink_by_name("Margarita")
 
 
+def test_get_drink_by_name_uses_normalized_cache(mock_requests_get):
+    """Test that differently cased names share one upstream call."""
+    mock_requests_get.return_value.json.return_value = {
+        "drinks": [
+            {
+                "idDrink": "11007",
+                "strDrink": "Margarita",
+                "strCategory": "Ordinary Drink",
+                "strAlcoholic": "Alcoholic",
+                "strGlass": "Cocktail glass",
+                "strInstructions": "Rub the rim of the glass...",
+                "strIngredient1": "Tequila",
+                "strMeasure1": "1 1/2 oz",
+                "strDrinkThumb": "https://www.example.com/margarita.jpg",
+            }
+        ]
+    }
+
+    first = Drink.get_drink_by_name("margarita")
+    second = Drink.get_drink_by_name(" MARGARITA ")
+
+    assert first == second
+    assert mock_requests_get.call_count == 1
+
+
+def test_get_drink_by_name_negative_cache(mock_requests_get):
+    """Test that a not-found answer is cached and not re-requested."""
+    mock_requests_get.return_value.json.return_value = {"drinks": None}
+
+    with pytest.raises(ValueError, match="not found"):
+        Drink.get_drink_by_name("NonexistentDrink")
+    with pytest.raises(ValueError, match="not found"):
+        Drink.get_drink_by_name("nonexistentdrink")
+
+    assert mock_requests_get.call_count == 1
+
+
+def test_get_drink_by_name_coalesces_concurrent_misses(mock_requests_get):
+    """Test that concurrent lookups of one uncached drink make a single upstream call."""
+    release = threading.Event()
+
+    def slow_response(*args, **kwargs):
+        release.wait()
+        response = MagicMock()
+        response.json.return_value = {"drinks": [{
+            "idDrink": "11000",
+            "strDrink": "Mojito",
+            "strCategory": "Cocktail",
+            "strAlcoholic": "Alcoholic",
+            "strGlass": "Highball glass",
+            "strInstructions": "Muddle mint leaves with sugar and lime juice.",
+            "strIngredient1": "Light rum",
+            "strMeasure1": "2-3 oz",
+            "strDrinkThumb": "https://www.example.com/mojito.jpg",
+        }]}
+        return response
+
+    mock_requests_get.side_effect = slow_response
+    coalesced_before = drink_fetches.stats()["coalesced"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(Drink.get_drink_by_name, name) for name in ["Mojito", "mojito", " MOJITO "] * 2]
+        deadline = time.monotonic() + 5
+        while drink_fetches.stats()["coalesced"] - coalesced_before < 5 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert all(result["name"] == "Mojito" for result in results)
+    assert mock_requests_get.call_count == 1
+
+
+def api_record(**overrides):
+    """Build a raw CocktailDB drink record with two ingredients."""
+    record = {
+        "idDrink": "11000", "strDrink": "Mojito", "strCategory": "Cocktail", "strAlcoholic": "Alcoholic",
+        "strGlass": "Highball glass", "strInstructions": "Muddle.", "strDrinkThumb": None,
+        "strIngredient1": "Light rum", "strMeasure1": "2-3 oz ",
+        "strIngredient2": "Lime", "strMeasure2": None,
+    }
+    record.update({f"strIngredient{i}": None for i in range(3, 16)})
+    record.update({f"strMeasure{i}": None for i in range(3, 16)})
+    record.update(overrides)
+    return record
+
+
+def test_from_api_keeps_compact_pairs():
+    """Test that parsing drops empty ingredient slots and interns the small enumerations."""
+    drink = Drink.from_api(api_record(strIngredient3="", strIngredient5="Mint", strMeasure5="4"))
+
+    assert drink.pairs == (("Light rum", "2-3 oz "), ("Lime", None), ("Mint", "4"))
+    assert drink.category is Category.COCKTAIL
+    assert drink.alcoholic is Alcoholic.ALCOHOLIC
+    assert drink.glass is Drink.from_api(api_record()).glass
+    assert not hasattr(drink, "__dict__")
+
+
+def test_to_dict_pads_fifteen_slots():
+    """Test that the wire format keeps 15 aligned ingredient and measure slots and plain strings."""
+    drink_dict = Drink.from_api(api_record()).to_dict()
+
+    assert drink_dict["ingredients"] == ["Light rum", "Lime"] + [None] * 13
+    assert drink_dict["measures"] == ["2-3 oz ", None] + [None] * 13
+    assert type(drink_dict["category"]) is str and drink_dict["category"] == "Cocktail"
+    assert Drink.from_dict(drink_dict) == Drink.from_api(api_record())
+
+
+def test_unknown_alcoholic_status_is_kept():
+    """Test that alcoholic values outside the enum survive a round trip."""
+    drink = Drink.from_api(api_record(strAlcoholic="Sometimes"))
+
+    assert drink.to_dict()["alcoholic"] == "Sometimes"
+
+
+def test_invalid_category_is_rejected():
+    """Test that categories outside the CocktailDB list are rejected."""
+    with pytest.raises(ValueError, match="Invalid category 'Smoothie'"):
+        Drink.from_api(api_record(strCategory="Smoothie"))
+
+
 #####################################################################################
 # tests for checking alcoholic
 ##########################################################################################################
@@ -196,6 +323,8 @@ def test_is_drink_alcoholic_true(mock_fetch_drinks_by_alcoholic):
         {"strDrink": "Margarita"}, {"strDrink": "Old Fashioned"}
     ] if alcoholic else []
 
+    alcoholic_index.refresh()
+
     result = Drink.is_drink_alcoholic("Margarita")
     assert result is True
 
@@ -207,6 +336,8 @@ def test_is_drink_alcoholic_false(mock_fetch_drinks_by_alcoholic):
         {"strDrink": "Fruit Punch"}, {"strDrink": "Cranberry Punch"}
     ] if not alcoholic else []
 
+    alcoholic_index.refresh()
+
     result = Drink.is_drink_alcoholic("Fruit Punch")
     assert result is False
 
@@ -0,0 +1,113 @@
+import gzip
+import json
+
+import pytest
+
+from cocktail_maker.models.drink_list_model import DrinkListModel, list_bodies
+from cocktail_maker.models.drink_model import Drink, in_memory_data
+from cocktail_maker.utils import http_cache
+from cocktail_maker.utils.http_cache import BodyCache, SerializedBody
+
+
+@pytest.fixture
+def margarita():
+    """Cache a drink so the drink route is served without the upstream."""
+    drink = Drink(id=11007, name="Margarita", category="Ordinary Drink", alcoholic="Alcoholic",
+                  glass="Cocktail glass", instructions="Shake.", ingredients=["Tequila"],
+                  measures=["1 oz"], thumbnail=None)
+    in_memory_data.set("margarita", drink)
+    return drink
+
+
+@pytest.fixture
+def long_list(client, monkeypatch):
+    """A user whose drink list is long enough to be compressed."""
+    client.post('/create-account', json={'username': 'drinker', 'password': 'secret'})
+    names = [f"Drink number {i}" for i in range(200)]
+    monkeypatch.setattr(DrinkListModel, "list_drinks_in_alphabetical_order", lambda self: names)
+    return names
+
+
+def test_negotiate_prefers_allowed_codings():
+    """Test Accept-Encoding parsing, including q-values and wildcards."""
+    assert http_cache.negotiate(None) is None
+    assert http_cache.negotiate("gzip") == "gzip"
+    assert http_cache.negotiate("gzip;q=0, identity") is None
+    assert http_cache.negotiate("*") == http_cache.ENCODINGS[0]
+
+
+def test_respond_answers_matching_etag_with_304():
+    """Test that a matching If-None-Match, weak or strong, gets an empty 304."""
+    payload = SerializedBody.of({"status": "success"}, last_modified=1700000000)
+
+    status, body, _ = http_cache.respond(payload, {})
+    assert status == 200 and json.loads(body) == {"status": "success"}
+
+    status, body, headers = http_cache.respond(payload, {"if-none-match": f'"other", W/{payload.etag}'})
+    assert (status, body) == (304, b"")
+    assert ("ETag", payload.etag) in headers
+
+
+def test_compressed_variants_have_their_own_etag():
+    """Test that a compressed representation is built once and validated separately."""
+    payload = SerializedBody(b"[" + b'"x",' * 1000 + b'"x"]\n')
+
+    status, body, headers = http_cache.respond(payload, {"accept-encoding": "gzip"}, compress=True)
+
+    assert status == 200
+    assert gzip.decompress(body) == payload.body
+    assert dict(headers)["ETag"] == payload.etag_for("gzip") != payload.etag
+    assert payload.encoded("gzip") is body
+    status, _, _ = http_cache.respond(
+        payload, {"accept-encoding": "gzip", "if-none-match": payload.etag}, compress=True
+    )
+    assert status == 200
+
+
+def test_body_cache_rebuilds_only_on_change():
+    """Test that a body is reused while the data is unchanged and rebuilt once it changes."""
+    cache = BodyCache()
+
+    first = cache.get(1, ["Margarita"])
+    assert cache.get(1, ["Margarita"]) is first
+    assert cache.get(1, ["Margarita", "Mojito"]) is not first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_drink_route_revalidates(client, margarita):
+    """Test that the drink route sends validators and answers revalidation with 304."""
+    response = client.get('/drink/Margarita')
+    assert response.status_code == 200
+    assert response.get_json()["drink"]["name"] == "Margarita"
+    assert response.headers["ETag"] == margarita.serialized().etag
+    assert "Last-Modified" in response.headers
+
+    response = client.get('/drink/margarita', headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_list_drinks_is_compressed(client, long_list):
+    """Test that large drink lists are sent gzip-compressed and revalidated per encoding."""
+    response = client.get('/list-drinks?username=drinker', headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(response.data)) == long_list
+
+    etag = response.headers["ETag"]
+    response = client.get('/list-drinks?username=drinker',
+                          headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert list_bodies.stats()["hits"] == 1
+
+
+def test_list_drinks_brotli(client, long_list):
+    """Test that brotli is preferred when it is installed."""
+    brotli = pytest.importorskip("brotli")
+
+    response = client.get('/list-drinks?username=drinker', headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.data)) == long_list
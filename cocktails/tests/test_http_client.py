@@ -0,0 +1,197 @@
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from cocktail_maker.utils import http_client
+from cocktail_maker.utils.http_client import CircuitBreaker, CircuitOpenError, UpstreamBudgetExceeded
+from cocktail_maker.utils.metrics import Histogram
+from cocktail_maker.utils.rate_limit import Throttle, TokenBucket
+
+
+def make_response(status_code: int) -> MagicMock:
+    """Build a fake response whose raise_for_status mirrors requests."""
+    response = MagicMock(status_code=status_code)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} error", response=response
+        )
+    return response
+
+
+@pytest.fixture
+def mock_session_get(mocker):
+    """Mock the shared session and remove retry delays."""
+    mocker.patch("cocktail_maker.utils.http_client.backoff_delay", return_value=0)
+    return mocker.patch("cocktail_maker.utils.http_client.session.get")
+
+
+##########################################################
+# Retries
+##########################################################
+
+def test_get_success(mock_session_get):
+    """Test a successful call passes params and timeouts to the session."""
+    mock_session_get.return_value = make_response(200)
+
+    response = http_client.get("search.php", params={"s": "Margarita"})
+
+    assert response.status_code == 200
+    _, kwargs = mock_session_get.call_args
+    assert kwargs["params"] == {"s": "Margarita"}
+    assert kwargs["timeout"] == (http_client.CONNECT_TIMEOUT, http_client.READ_TIMEOUT)
+
+
+def test_get_retries_server_errors(mock_session_get):
+    """Test that a 5xx response is retried."""
+    mock_session_get.side_effect = [make_response(503), make_response(200)]
+
+    response = http_client.get("random.php")
+
+    assert response.status_code == 200
+    assert mock_session_get.call_count == 2
+
+
+def test_get_retries_timeouts_then_raises(mock_session_get):
+    """Test that timeouts are retried up to MAX_RETRIES and then re-raised."""
+    mock_session_get.side_effect = requests.exceptions.Timeout("timed out")
+
+    with pytest.raises(requests.exceptions.Timeout):
+        http_client.get("random.php")
+
+    assert mock_session_get.call_count == http_client.MAX_RETRIES + 1
+
+
+def test_get_does_not_retry_client_errors(mock_session_get):
+    """Test that a 4xx response is raised immediately."""
+    mock_session_get.return_value = make_response(404)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        http_client.get("search.php")
+
+    assert mock_session_get.call_count == 1
+    assert http_client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_get_fails_fast_when_circuit_open(mock_session_get):
+    """Test that calls are rejected without network access once the breaker opens."""
+    mock_session_get.side_effect = requests.exceptions.ConnectionError("down")
+
+    for _ in range(http_client.BREAKER_THRESHOLD):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_client.get("random.php")
+            if http_client.breaker.state == CircuitBreaker.OPEN:
+                break
+
+    calls = mock_session_get.call_count
+    with pytest.raises(CircuitOpenError):
+        http_client.get("random.php")
+    assert mock_session_get.call_count == calls
+
+
+def test_get_retries_throttled_responses(mock_session_get):
+    """Test that a 429 response is retried like a server error and counted."""
+    mock_session_get.side_effect = [make_response(429), make_response(200)]
+    before = http_client.upstream_responses["throttled"]
+
+    assert http_client.get("random.php").status_code == 200
+    assert mock_session_get.call_count == 2
+    assert http_client.upstream_responses["throttled"] == before + 1
+
+
+##########################################################
+# Request budget
+##########################################################
+
+def test_get_waits_for_the_request_budget(mock_session_get, mocker):
+    """Test that an exhausted budget delays the call and then fails it without touching the network."""
+    now = [0.0]
+    throttle = Throttle(TokenBucket(rate=10, capacity=1, timer=lambda: now[0]), max_wait=0.15)
+    mocker.patch.object(http_client, "throttle", throttle)
+    sleep = mocker.patch("cocktail_maker.utils.http_client.time.sleep",
+                         side_effect=lambda seconds: now.__setitem__(0, now[0] + seconds))
+    mock_session_get.return_value = make_response(200)
+
+    http_client.get("random.php")
+    http_client.get("random.php")
+    assert sleep.call_count == 1
+    assert throttle.stats()["waited"] == 1
+
+    throttle.bucket.try_acquire()
+    throttle.bucket.capacity = throttle.bucket.rate = 1
+    with pytest.raises(UpstreamBudgetExceeded):
+        http_client.get("random.php")
+    assert mock_session_get.call_count == 2
+    assert throttle.stats()["rejected"] == 1
+
+
+##########################################################
+# Circuit breaker
+##########################################################
+
+def test_circuit_breaker_half_open():
+    """Test that the breaker lets one trial call through after the reset timeout."""
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=2, reset_timeout=10, timer=lambda: now[0])
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+    now[0] = 11
+    assert breaker.allow_request() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_keeps_a_cancelled_trial():
+    """Test that a half-open trial given back unused is offered to the next caller."""
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=1, reset_timeout=10, timer=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 11
+    assert breaker.allow_request() is True
+
+    breaker.cancel_request()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is True
+
+
+def test_circuit_breaker_reopens_on_failed_trial():
+    """Test that a failed half-open trial re-opens the breaker."""
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=1, reset_timeout=10, timer=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 11
+    breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+##########################################################
+# Histograms
+##########################################################
+
+def test_histogram_snapshot():
+    """Test cumulative bucket counts."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+
+def test_get_records_latency(mock_session_get):
+    """Test that upstream calls are timed per endpoint."""
+    mock_session_get.return_value = make_response(200)
+    before = http_client.histogram_for("filter").snapshot()["count"]
+
+    http_client.get("filter.php", params={"a": "Alcoholic"})
+
+    assert http_client.histogram_for("filter").snapshot()["count"] == before + 1
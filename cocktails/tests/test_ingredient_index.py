@@ -0,0 +1,106 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from cocktail_maker.models.catalog_model import CatalogDrink, load_catalog_dump
+from cocktail_maker.models.drink_model import Drink, ingredient_index
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.ingredient_index import IngredientIndex
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+@pytest.fixture
+def index():
+    index = IngredientIndex()
+    index.add(1, "Margarita", ["Tequila", "Triple sec", "Lime juice", "Salt"])
+    index.add(2, "Mojito", ["Light rum", "Lime", "Sugar", "Mint", "Soda water"])
+    index.add(3, "Daiquiri", ["Light rum", "Lime juice", "Sugar"])
+    index.add(4, "Cuba Libre", ["Light rum", "Lime", "Coca-Cola"])
+    return index
+
+
+@pytest.fixture
+def catalog(app):
+    """Load the fixture dump into the catalog mirror."""
+    CatalogDrink.ingest(load_catalog_dump(FIXTURE_DUMP))
+    return app
+
+
+def test_containing_all(index):
+    """Test that only drinks with every ingredient match, case-insensitively."""
+    assert index.containing_all(["light RUM", "lime"]) == ["Cuba Libre", "Mojito"]
+    assert index.containing_all(["Lime juice"]) == ["Daiquiri", "Margarita"]
+    assert index.containing_all(["Lime juice", "Mint"]) == []
+    assert index.containing_all(["Unknown"]) == []
+
+
+def test_makeable_with_missing(index):
+    """Test the pantry search with and without missing ingredients."""
+    pantry = ["Light rum", "Lime juice", "Sugar", "Lime"]
+
+    assert index.makeable(pantry) == [("Daiquiri", [])]
+    assert index.makeable(pantry, max_missing=1) == [("Daiquiri", []), ("Cuba Libre", ["Coca-Cola"])]
+    assert [name for name, _ in index.makeable(pantry, max_missing=2)] == ["Daiquiri", "Cuba Libre", "Mojito"]
+
+
+def test_add_replaces_ingredients(index):
+    """Test that re-adding a drink id replaces its postings."""
+    index.add(3, "Daiquiri", ["Light rum", "Lime"])
+
+    assert index.containing_all(["Lime juice"]) == ["Margarita"]
+    assert index.makeable(["Light rum", "Lime"]) == [("Daiquiri", [])]
+    assert len(index) == 4
+
+
+def test_matches_a_linear_scan():
+    """Test the bitset answers against a brute-force scan of a random catalog."""
+    rng = random.Random(7)
+    pool = [f"Ingredient {i}" for i in range(40)]
+    drinks = {i: rng.sample(pool, rng.randint(1, 8)) for i in range(500)}
+    index = IngredientIndex()
+    for drink_id, ingredients in drinks.items():
+        index.add(drink_id, f"Drink {drink_id}", ingredients)
+
+    for _ in range(20):
+        pantry = set(rng.sample(pool, 12))
+        k = rng.randint(0, 3)
+        expected = {f"Drink {i}" for i, ingredients in drinks.items()
+                    if pantry & set(ingredients) and len(set(ingredients) - pantry) <= k}
+        assert {name for name, _ in index.makeable(pantry, k)} == expected
+
+        wanted = rng.sample(pool, 2)
+        expected = sorted((f"Drink {i}" for i, ingredients in drinks.items() if set(wanted) <= set(ingredients)),
+                          key=normalize_key)
+        assert index.containing_all(wanted) == expected
+
+
+def test_fetched_drinks_are_indexed(mocker):
+    """Test that drinks fetched from the upstream are added incrementally."""
+    drink = load_catalog_dump(FIXTURE_DUMP)[0]
+    mocker.patch("cocktail_maker.models.drink_model.fetch_random_drink_data", return_value={"drinks": [drink]})
+
+    Drink.get_random_drink()
+
+    assert ingredient_index.containing_all(["tequila"]) == ["Margarita"]
+
+
+def test_containing_route_reads_the_mirror(client, catalog):
+    """Test that the route loads the catalog mirror into the index."""
+    response = client.get('/drinks/containing?ingredients=Pineapple juice, grenadine')
+
+    assert response.status_code == 200
+    assert response.get_json()['drinks'] == ['Afterglow']
+    assert client.get('/drinks/containing').status_code == 400
+
+
+def test_makeable_route(client, catalog):
+    """Test the pantry route and its validation."""
+    response = client.post('/drinks/makeable', json={'pantry': ['Tequila', 'Triple sec', 'Lime juice'],
+                                                     'max_missing': 1})
+
+    assert response.status_code == 200
+    assert response.get_json()['drinks'] == [{'name': 'Margarita', 'missing': ['Salt']}]
+    assert client.post('/drinks/makeable', json={'pantry': 'Tequila'}).status_code == 400
+    assert client.post('/drinks/makeable', json={'pantry': ['Tequila'], 'max_missing': -1}).status_code == 400
@@ -0,0 +1,95 @@
+import json
+import logging
+import queue
+
+import pytest
+
+from cocktail_maker.utils import logger as log_setup
+from cocktail_maker.utils.logger import DebugSampler, configure_logger
+
+
+@pytest.fixture
+def json_logs():
+    """Switch the shared handler to JSON at DEBUG, restoring the previous settings afterwards."""
+    previous = dict(log_setup.settings)
+    log_setup.configure({"LOG_FORMAT": "json", "LOG_LEVEL": "DEBUG", "LOG_DEBUG_SAMPLE_EVERY": 1})
+    yield
+    log_setup.flush()
+    log_setup.configure({"LOG_FORMAT": previous["format"], "LOG_LEVEL": previous["level"],
+                         "LOG_DEBUG_SAMPLE_EVERY": previous["debug_sample_every"]})
+
+
+def test_configure_logger_is_idempotent():
+    """Test that configuring loggers and setting up logging repeatedly installs a single shared handler."""
+    first, second = logging.getLogger("cocktail_maker.test_a"), logging.getLogger("cocktail_maker.test_b")
+    for _ in range(3):
+        configure_logger(first)
+        configure_logger(second)
+        log_setup.setup_logging()
+
+    queue_handlers = [handler for handler in logging.getLogger().handlers
+                      if isinstance(handler, log_setup.QueueHandler)]
+    assert len(queue_handlers) == 1
+    assert first.handlers == [] and second.handlers == []
+
+
+def test_json_lines(json_logs, capsys):
+    """Test that records are written once, as JSON with extra fields and the traceback."""
+    test_logger = logging.getLogger("cocktail_maker.test_json")
+    configure_logger(test_logger)
+
+    test_logger.info("Fetched %s", "Margarita", extra={"drink_id": 11007})
+    try:
+        raise ValueError("bad drink")
+    except ValueError:
+        test_logger.exception("Lookup failed")
+    log_setup.flush()
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()
+             if '"cocktail_maker.test_json"' in line]
+    assert [line["message"] for line in lines] == ["Fetched Margarita", "Lookup failed"]
+    assert lines[0]["level"] == "INFO" and lines[0]["drink_id"] == 11007
+    assert "ValueError: bad drink" in lines[1]["exc"]
+
+
+def test_level_comes_from_config(json_logs, capsys):
+    """Test that records below LOG_LEVEL are not formatted or written."""
+    log_setup.configure({"LOG_LEVEL": "WARNING"})
+    test_logger = logging.getLogger("cocktail_maker.test_level")
+    configure_logger(test_logger)
+
+    test_logger.info("hidden")
+    test_logger.warning("shown")
+    log_setup.flush()
+
+    assert not test_logger.isEnabledFor(logging.INFO)
+    err = capsys.readouterr().err
+    assert "shown" in err and "hidden" not in err
+
+
+def test_debug_sampler_keeps_one_in_n_per_call_site():
+    """Test that debug records are sampled per call site while warnings always pass."""
+    sampler = DebugSampler(every=3)
+
+    def record(level, lineno):
+        return logging.LogRecord("cocktail_maker.test", level, __file__, lineno, "msg", None, None)
+
+    kept = [sampler.filter(record(logging.DEBUG, 10)) for _ in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampler.filter(record(logging.DEBUG, 20))
+    assert all(sampler.filter(record(logging.WARNING, 10)) for _ in range(3))
+
+    sampled = record(logging.DEBUG, 30)
+    sampler.filter(sampled)
+    assert sampled.sampled == 3
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that a full logging queue drops records and counts them."""
+    handler = log_setup._DroppingQueueHandler(queue.Queue(maxsize=1))
+
+    for _ in range(3):
+        handler.emit(logging.LogRecord("cocktail_maker.test", logging.INFO, __file__, 1, "msg", None, None))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from cocktail_maker import instrumentation
+from cocktail_maker.db import query_latency
+from cocktail_maker.models.catalog_model import load_catalog_dump
+from cocktail_maker.models.drink_model import Drink, in_memory_data
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.metrics import Histogram, format_histograms, format_metric
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+def samples(text: str) -> dict:
+    """Parse an exposition body into {series: value}, skipping comments."""
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in text.splitlines() if line and not line.startswith("#")}
+
+
+def test_exposition_format():
+    """Test the histogram series, cumulative buckets and label escaping."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    lines = format_histograms("latency_seconds", "Latency.", [({"route": '/a"b'}, histogram)])
+
+    assert lines == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 2',
+        'latency_seconds_sum{route="/a\\"b"} 0.55',
+        'latency_seconds_count{route="/a\\"b"} 2',
+    ]
+    assert format_metric("up", "gauge", "Up.", [({}, 1)])[2] == "up 1"
+
+
+def test_requests_are_timed_by_route_and_status(client):
+    """Test that requests are recorded under their route rule, with unknown paths sharing one label."""
+    client.get('/health')
+    client.get('/drinks/search?q=')
+    client.get('/no/such/path')
+    client.get('/another/missing/path')
+
+    metrics = samples(client.get('/metrics').get_data(as_text=True))
+
+    assert metrics['cocktails_http_request_duration_seconds_count{route="/health",method="GET",status="200"}'] == 1
+    assert metrics['cocktails_http_request_duration_seconds_count{route="/drinks/search",method="GET",status="400"}'] == 1
+    assert metrics['cocktails_http_request_duration_seconds_count{route="<unmatched>",method="GET",status="404"}'] == 2
+    # Only the /metrics request itself is in flight while it renders
+    assert metrics['cocktails_http_requests_in_flight'] == 1
+    assert instrumentation.requests_in_flight.value == 0
+
+
+def test_user_queries_are_timed_without_hashing(client):
+    """Test that SQL time is attributed to the Users operation that ran it, excluding password hashing."""
+    client.post('/create-account', json={'username': 'drinker', 'password': 'secret'})
+    response = client.post('/login', json={'username': 'drinker', 'password': 'secret'})
+
+    queries = {labels["operation"]: histogram.snapshot() for labels, histogram in query_latency.items()}
+    login = instrumentation.request_latency.labels("/login", "POST", "200").snapshot()
+
+    assert queries["users.create_user"]["count"] >= 1
+    assert queries["users.check_password"]["count"] == 1
+    assert response.status_code == 200
+    assert queries["users.check_password"]["sum"] < login["sum"]
+
+
+def test_cache_metrics(client):
+    """Test that drink cache lookups show up as hits, misses and a hit ratio."""
+    drink = Drink.from_api(load_catalog_dump(FIXTURE_DUMP)[0])
+    in_memory_data.set(normalize_key(drink.name), drink)
+    client.get('/drink/margarita')
+    client.get('/drink/MARGARITA')
+    in_memory_data.get("unknown drink")
+
+    metrics = samples(client.get('/metrics').get_data(as_text=True))
+
+    assert metrics['cocktails_cache_hits_total{cache="drink"}'] == 2
+    assert metrics['cocktails_cache_misses_total{cache="drink"}'] == 1
+    assert metrics['cocktails_cache_hit_ratio{cache="drink"}'] == 0.6667
+    assert metrics['cocktails_cache_entries{cache="drink"}'] == 1
@@ -0,0 +1,94 @@
+import threading
+
+from sqlalchemy import create_engine, inspect, text
+
+from cocktail_maker import migrations
+from cocktail_maker.db import db
+
+
+def _schema(engine):
+    """Tables with their column names and index names."""
+    inspector = inspect(engine)
+    return {table: ({column["name"] for column in inspector.get_columns(table)},
+                    {index["name"] for index in inspector.get_indexes(table)})
+            for table in inspector.get_table_names() if table != migrations.schema_version.name}
+
+
+def test_migrations_build_the_model_schema(app, tmp_path):
+    """Test that migrating an empty database yields the tables, columns and indexes the models declare."""
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    from_models = create_engine(f"sqlite:///{tmp_path / 'models.db'}")
+    db.metadata.create_all(from_models)
+
+    assert migrations.upgrade(migrated) == [m.version for m in migrations.MIGRATIONS]
+    assert _schema(migrated) == _schema(from_models)
+
+
+def test_upgrade_applies_each_migration_once(tmp_path):
+    """Test that a second upgrade is a no-op and the version is recorded."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    migrations.upgrade(engine)
+
+    assert migrations.upgrade(engine) == []
+    with engine.connect() as connection:
+        assert migrations.current_version(connection) == migrations.MIGRATIONS[-1].version
+
+
+def test_upgrade_adopts_database_created_without_migrations(tmp_path):
+    """Test that a database created by create_all keeps its data and is stamped at the latest version."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (username, salt, password) VALUES ('old', 'salt', 'hash')"))
+
+    assert migrations.upgrade(engine) == [1, 2]
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT username FROM users")).scalar() == "old"
+
+
+def test_concurrent_upgrades_apply_each_migration_once(tmp_path):
+    """Test that workers migrating the same database at start-up wait for each other instead of crashing."""
+    path = tmp_path / "app.db"
+    workers = 4
+    start = threading.Barrier(workers)
+    applied, errors = [], []
+
+    def worker():
+        engine = create_engine(f"sqlite:///{path}")
+        start.wait()
+        try:
+            applied.extend(migrations.upgrade(engine))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(applied) == [m.version for m in migrations.MIGRATIONS]
+    with create_engine(f"sqlite:///{path}").connect() as connection:
+        assert connection.execute(text("SELECT version FROM schema_version ORDER BY version")).scalars().all() == [1, 2]
+
+
+def test_catalog_rows_get_an_ingest_time(tmp_path):
+    """Test that migration 2 adds fetched_at to the catalog and stamps the rows already there."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    migrations.upgrade(engine, target=1)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO cocktails (id, name, name_normalized, ingredients, measures) "
+                                "VALUES (1, 'Mojito', 'mojito', '[]', '[]')"))
+
+    assert migrations.upgrade(engine) == [2]
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT fetched_at FROM cocktails")).scalar() > 0
+
+
+def test_migrate_db_command(app):
+    """Test the migrate-db command on the already migrated test database."""
+    result = app.test_cli_runner().invoke(args=["migrate-db"])
+
+    assert result.exit_code == 0
+    assert f"Schema is up to date at version {migrations.MIGRATIONS[-1].version}." in result.output
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from cocktail_maker.models.catalog_model import CatalogDrink, load_catalog_dump
+from cocktail_maker.models.drink_model import Drink, in_memory_data, name_index
+from cocktail_maker.utils.name_index import NameIndex
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+@pytest.fixture
+def index():
+    index = NameIndex()
+    for name in ["Margarita", "Blue Margarita", "Mango Margarita", "Mojito", "Martini", "Mai Tai", "Manhattan"]:
+        index.add(name)
+    return index
+
+
+@pytest.fixture
+def catalog(app):
+    """Load the fixture dump into the catalog mirror."""
+    CatalogDrink.ingest(load_catalog_dump(FIXTURE_DUMP))
+    return app
+
+
+def test_prefix_matches_are_alphabetical(index):
+    """Test that prefix matches come out of the trie in alphabetical order."""
+    results = index.search("ma", limit=4)
+
+    assert [r["name"] for r in results] == ["Mai Tai", "Mango Margarita", "Manhattan", "Margarita"]
+    assert {r["match"] for r in results} == {"prefix"}
+
+
+def test_exact_match_comes_first(index):
+    """Test that the exact name outranks longer names sharing its prefix."""
+    results = index.search("  MARGARITA ", limit=3)
+
+    assert results[0] == {"name": "Margarita", "match": "exact", "score": 1.0}
+    assert {r["name"] for r in results[1:]} == {"Blue Margarita", "Mango Margarita"}
+    assert results[1]["score"] >= results[2]["score"]
+
+
+def test_typos_are_matched_by_trigrams(index):
+    """Test that misspelled names are ranked by trigram similarity."""
+    results = index.search("margarrita", limit=2)
+
+    assert results[0]["name"] == "Margarita"
+    assert results[0]["match"] == "fuzzy"
+    assert index.search("xyzzy") == []
+
+
+def test_removed_names_are_not_matched(index):
+    """Test that a removed name leaves the trie and trigram postings without disturbing names sharing its prefix."""
+    index.remove("margarita")
+    index.remove("Cosmopolitan")
+
+    assert "Margarita" not in index
+    assert {r["name"] for r in index.search("margarita", limit=5)} == {"Blue Margarita", "Mango Margarita"}
+    index.remove("Mai Tai")
+    assert [r["name"] for r in index.search("ma", limit=5)] == ["Mango Margarita", "Manhattan", "Martini"]
+
+
+def test_evicted_drinks_stay_searchable_but_are_not_held(stub):
+    """Test that a drink evicted from the cache keeps its name in the index but is fetched again."""
+    Drink.fetch_by_name("Margarita")
+    in_memory_data.clear()
+
+    assert name_index.search("margarita", limit=1)[0]["name"] == "Margarita"
+    assert Drink.fetch_by_name("Margarita").name == "Margarita"
+    assert stub.stats() == {"search.php": 2}
+
+
+def test_search_route(client, catalog):
+    """Test the search route over the catalog mirror and its validation."""
+    response = client.get('/drinks/search?q=old fashoned&limit=1')
+
+    assert response.status_code == 200
+    assert response.get_json()['results'][0]['name'] == 'Old Fashioned'
+    assert client.get('/drinks/search').status_code == 400
+    assert client.get('/drinks/search?q=mo&limit=abc').status_code == 400
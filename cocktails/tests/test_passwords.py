@@ -0,0 +1,163 @@
+import hashlib
+import threading
+
+import pytest
+
+from cocktail_maker.models.user_model import Users
+from cocktail_maker.utils import passwords
+from cocktail_maker.utils.passwords import PasswordHasherBusy
+
+SALT = "00112233445566778899aabbccddeeff"
+
+
+@pytest.fixture
+def pbkdf2(app):
+    """Switch the hasher to cheap PBKDF2 settings for one test."""
+    passwords.configure({"PASSWORD_HASH_ALGORITHM": "pbkdf2_sha256", "PASSWORD_PBKDF2_ITERATIONS": 1000})
+    yield
+    passwords.configure({"PASSWORD_HASH_ALGORITHM": "scrypt"})
+
+
+##########################################################
+# Hash format
+##########################################################
+
+def test_scrypt_round_trip(app):
+    """Test that a scrypt hash is self-describing and verifies."""
+    stored = passwords.hash_password("secret", SALT)
+
+    assert stored.startswith(f"scrypt$n={app.config['PASSWORD_SCRYPT_N']},r=8,p=1$")
+    assert passwords.verify_password("secret", SALT, stored) is True
+    assert passwords.verify_password("wrong", SALT, stored) is False
+
+
+def test_pbkdf2_round_trip(pbkdf2):
+    """Test that a PBKDF2 hash is self-describing and verifies."""
+    stored = passwords.hash_password("secret", SALT)
+
+    assert stored.startswith("pbkdf2_sha256$i=1000$")
+    assert passwords.verify_password("secret", SALT, stored) is True
+
+
+def test_verify_legacy_sha256():
+    """Test that legacy SHA-256 hashes still verify."""
+    legacy = hashlib.sha256(("secret" + SALT).encode()).hexdigest()
+
+    assert passwords.verify_password("secret", SALT, legacy) is True
+    assert passwords.verify_password("wrong", SALT, legacy) is False
+
+
+def test_needs_rehash(app):
+    """Test rehash detection for legacy hashes and outdated costs."""
+    current = passwords.hash_password("secret", SALT)
+    legacy = hashlib.sha256(("secret" + SALT).encode()).hexdigest()
+
+    assert passwords.needs_rehash(current) is False
+    assert passwords.needs_rehash(legacy) is True
+    assert passwords.needs_rehash("scrypt$n=1024,r=8,p=1$abcd") is True
+
+
+def test_old_cost_hash_still_verifies(app):
+    """Test that a hash made with different settings keeps verifying."""
+    stored = passwords.hash_password("secret", SALT)
+    passwords.configure({"PASSWORD_SCRYPT_N": app.config["PASSWORD_SCRYPT_N"] * 2})
+    try:
+        assert passwords.verify_password("secret", SALT, stored) is True
+        assert passwords.needs_rehash(stored) is True
+    finally:
+        passwords.configure({"PASSWORD_SCRYPT_N": app.config["PASSWORD_SCRYPT_N"]})
+
+
+@pytest.mark.parametrize("stored", [
+    "foo",
+    "scrypt$garbage$x",
+    "scrypt$n=16384,r=8$" + "0" * 64,
+    "md5$i=1$" + "0" * 64,
+    "scrypt$n=1073741824,r=8,p=1$" + "0" * 64,
+    "scrypt$n=1000,r=8,p=1$" + "0" * 64,
+    "pbkdf2_sha256$i=10000000000$" + "0" * 64,
+])
+def test_unusable_hash_is_a_failed_login(stored):
+    """Test that malformed hashes and hashes asking for an excessive cost never match and never raise."""
+    with pytest.raises(ValueError):
+        passwords.parse_hash(stored)
+    assert passwords.verify_password("secret", SALT, stored) is False
+
+
+def test_unsupported_algorithm():
+    """Test that an unknown algorithm is rejected at configuration time."""
+    with pytest.raises(ValueError, match="Unsupported password hash algorithm"):
+        passwords.configure({"PASSWORD_HASH_ALGORITHM": "md5"})
+    passwords.configure({"PASSWORD_HASH_ALGORITHM": "scrypt"})
+
+
+def test_hash_many_keeps_order(app):
+    """Test that bulk hashing returns one hash per pair, in input order."""
+    salts = [f"{i:032x}" for i in range(5)]
+    hashes = passwords.hash_many([(f"secret{i}", salt) for i, salt in enumerate(salts)])
+
+    assert [passwords.verify_password(f"secret{i}", salt, stored)
+            for i, (salt, stored) in enumerate(zip(salts, hashes))] == [True] * 5
+    assert passwords.hash_many([]) == []
+
+
+##########################################################
+# Rehash on login
+##########################################################
+
+def test_login_rehashes_legacy_row(client, session):
+    """Test that a legacy row is upgraded transparently on login."""
+    legacy = hashlib.sha256(("secret" + SALT).encode()).hexdigest()
+    session.add(Users(username="legacy", salt=SALT, password=legacy))
+    session.commit()
+
+    response = client.post("/login", json={"username": "legacy", "password": "secret"})
+    assert response.status_code == 200
+
+    user = session.query(Users).filter_by(username="legacy").first()
+    assert user.password.startswith("scrypt$")
+    assert user.salt != SALT
+    assert Users.check_password("legacy", "secret") is True
+
+
+def test_failed_login_does_not_rehash(client, session):
+    """Test that a wrong password leaves a legacy row untouched."""
+    legacy = hashlib.sha256(("secret" + SALT).encode()).hexdigest()
+    session.add(Users(username="legacy", salt=SALT, password=legacy))
+    session.commit()
+
+    response = client.post("/login", json={"username": "legacy", "password": "wrong"})
+    assert response.status_code == 401
+    assert session.query(Users).filter_by(username="legacy").first().password == legacy
+
+
+##########################################################
+# Bounded pool
+##########################################################
+
+def test_pool_saturated_returns_503(client, session):
+    """Test that a saturated hashing pool fails fast with 503."""
+    client.post("/create-account", json={"username": "busy", "password": "secret"})
+    passwords.configure({"PASSWORD_HASH_WORKERS": 1, "PASSWORD_HASH_MAX_PENDING": 0,
+                         "PASSWORD_HASH_QUEUE_TIMEOUT": 0.01})
+    started, release = threading.Event(), threading.Event()
+
+    def hold_slot():
+        started.set()
+        release.wait()
+
+    blocker = threading.Thread(target=passwords.run, args=(hold_slot,))
+    try:
+        blocker.start()
+        started.wait(timeout=5)  # the blocker now holds the only slot
+
+        response = client.post("/login", json={"username": "busy", "password": "secret"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        with pytest.raises(PasswordHasherBusy):
+            passwords.run(passwords.hash_password, "secret", SALT)
+    finally:
+        release.set()
+        blocker.join()
+        passwords.configure({"PASSWORD_HASH_WORKERS": 2, "PASSWORD_HASH_MAX_PENDING": 8,
+                             "PASSWORD_HASH_QUEUE_TIMEOUT": 2})
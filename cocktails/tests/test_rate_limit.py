@@ -0,0 +1,78 @@
+import pytest
+
+from app import create_app
+from cocktail_maker.db import db
+from cocktail_maker.utils.rate_limit import ClientRateLimiter, SQLiteTokenBucket
+from config import TestConfig
+
+
+class LimitedConfig(TestConfig):
+    AUTH_RATE_LIMIT_PER_MINUTE = 6
+    AUTH_RATE_LIMIT_BURST = 2
+
+
+@pytest.fixture
+def limited_client():
+    """A test client with the per-client limits on the password-hashing routes enabled."""
+    app = create_app(config_class=LimitedConfig)
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def test_sqlite_bucket_is_shared(tmp_path):
+    """Test that two handles on the same file draw from one budget that refills over time."""
+    now = [1000.0]
+    path = str(tmp_path / "buckets.db")
+    first = SQLiteTokenBucket(path, "cocktaildb", rate=2, capacity=2, timer=lambda: now[0])
+    second = SQLiteTokenBucket(path, "cocktaildb", rate=2, capacity=2, timer=lambda: now[0])
+    other = SQLiteTokenBucket(path, "other", rate=2, capacity=2, timer=lambda: now[0])
+
+    assert [first.try_acquire(), second.try_acquire(), first.try_acquire()] == [True, True, False]
+    assert second.wait_time() == pytest.approx(0.5)
+    assert other.try_acquire()
+
+    now[0] += 0.5
+    assert second.try_acquire()
+    assert first.stats()["tokens"] == 0
+
+
+def test_sqlite_bucket_fails_open(tmp_path):
+    """Test that an unusable file grants requests instead of failing them."""
+    bucket = SQLiteTokenBucket(str(tmp_path), "cocktaildb", rate=1, capacity=1)
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert bucket.stats()["errors"] == 2
+
+
+def test_client_limiter_tracks_clients_separately():
+    """Test that each client has its own budget and that idle clients are evicted."""
+    now = [0.0]
+    limiter = ClientRateLimiter(rate=1, capacity=1, max_clients=2, timer=lambda: now[0])
+
+    assert [limiter.try_acquire("a"), limiter.try_acquire("a"), limiter.try_acquire("b")] == [True, False, True]
+    assert limiter.wait_time("a") == pytest.approx(1)
+
+    limiter.try_acquire("c")
+    assert limiter.stats() == {"rate_per_second": 1, "burst": 1, "clients": 2, "allowed": 3, "limited": 1}
+
+
+def test_login_is_rate_limited_per_client(limited_client):
+    """Test that /login answers 429 with Retry-After once a client exceeds its burst."""
+    limited_client.post('/create-account', json={'username': 'drinker', 'password': 'secret'})
+    credentials = {'username': 'drinker', 'password': 'wrong'}
+
+    statuses = [limited_client.post('/login', json=credentials).status_code for _ in range(3)]
+    response = limited_client.post('/login', json=credentials, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+
+    assert statuses == [401, 401, 429]
+    assert response.status_code == 401
+    limited = limited_client.post('/login', json=credentials)
+    assert limited.headers['Retry-After'] == '10'
+
+    stats = limited_client.get('/rate-limit-stats').get_json()
+    assert stats['inbound']['login']['limited'] == 2
+    assert stats['inbound']['create_account']['allowed'] == 1
+    assert stats['upstream'] is None
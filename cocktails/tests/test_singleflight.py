@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cocktail_maker.utils.singleflight import SingleFlight
+
+
+def wait_for_coalesced(flight: SingleFlight, count: int, timeout: float = 5.0) -> None:
+    """Block until ``count`` callers are waiting on an in-flight call."""
+    deadline = time.monotonic() + timeout
+    while flight.stats()["coalesced"] < count:
+        assert time.monotonic() < deadline, "followers never joined the flight"
+        time.sleep(0.001)
+
+
+##########################################################
+# Threads
+##########################################################
+
+def test_concurrent_threads_share_one_call():
+    """Test that threads asking for the same key while it is in flight share one execution."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait()
+        return "Margarita"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("margarita", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    wait_for_coalesced(flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["Margarita"] * 5
+    assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_error_is_shared_with_followers():
+    """Test that the leader's exception is raised in every waiting thread."""
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fetch():
+        release.wait()
+        raise RuntimeError("upstream down")
+
+    def caller():
+        try:
+            flight.do("margarita", fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_for_coalesced(flight, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["upstream down"] * 3
+
+
+def test_sequential_calls_are_not_coalesced():
+    """Test that a finished call is forgotten and the next caller runs again."""
+    flight = SingleFlight()
+
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+##########################################################
+# asyncio
+##########################################################
+
+def test_concurrent_coroutines_share_one_call():
+    """Test that coroutines on one loop share a single awaited call."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "Mojito"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("mojito", fetch) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["Mojito"] * 10
+    assert calls == [1]
+    assert flight.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_coroutine_error_is_shared():
+    """Test that the leader's exception reaches every awaiting coroutine."""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("Drink with name 'nope' not found")
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("nope", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_leader_cancellation_cancels_followers():
+    """Test that followers do not hang when the leader is cancelled."""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(10)
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("slow", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("slow", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+
+    asyncio.run(main())
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,125 @@
+import time
+from pathlib import Path
+
+from cocktail_maker.db import db
+from cocktail_maker.models import drink_model
+from cocktail_maker.models.catalog_model import CatalogDrink, load_catalog_dump
+from cocktail_maker.models.drink_model import Drink, in_memory_data, revalidator, stale_served
+from cocktail_maker.utils.cache import normalize_key
+from cocktail_maker.utils.http_cache import STALE_WARNING
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+def expire(drink: Drink, seconds_past_ttl: float) -> None:
+    """Age a drink and its cache entry past the cache TTL."""
+    drink.fetched_at -= in_memory_data.ttl + seconds_past_ttl
+    in_memory_data.set(normalize_key(drink.name), drink, ttl=-seconds_past_ttl)
+
+
+def test_stale_drink_is_served_while_it_is_refetched(stub):
+    """Test that an expired drink is returned at once and replaced by a background refetch."""
+    drink = Drink.fetch_by_name("Margarita")
+    expire(drink, 60)
+
+    assert Drink.fetch_by_name("Margarita") is drink
+    revalidator.wait()
+
+    fresh = Drink.fetch_by_name("Margarita")
+    assert fresh is not drink and fresh.stale_age() is None
+    assert stub.stats() == {"search.php": 2}
+    assert stale_served["revalidating"] == 1
+
+
+def test_failed_revalidation_is_not_retried_on_every_request(stub):
+    """Test that a name whose refetch failed keeps being served stale without asking the upstream again."""
+    drink = Drink.fetch_by_name("Margarita")
+    expire(drink, 60)
+    stub.error_rate = 1.0
+
+    assert Drink.fetch_by_name("Margarita") is drink
+    revalidator.wait()
+    assert Drink.fetch_by_name("Margarita") is drink
+    revalidator.wait()
+
+    assert revalidator.stats()["scheduled"] == 1
+    assert revalidator.stats()["failures"] == 1
+    assert revalidator.stats()["backing_off"] == 1
+
+
+def test_drink_route_serves_stale_copy_when_upstream_fails(client, stub, monkeypatch):
+    """Test that a drink too old to serve without refetching is still served, flagged, when the refetch fails."""
+    monkeypatch.setattr(drink_model, "DRINK_STALE_WHILE_REVALIDATE", 0)
+    monkeypatch.setattr(drink_model, "DRINK_STALE_IF_ERROR", 3600)
+    first = client.get("/drink/Margarita")
+    expire(Drink.fetch_by_name("Margarita"), 60)
+    stub.error_rate = 1.0
+
+    response = client.get("/drink/Margarita")
+
+    assert response.status_code == 200
+    assert response.get_json() == dict(first.get_json(), stale=True)
+    assert response.headers["Warning"] == STALE_WARNING
+    assert int(response.headers["Age"]) >= in_memory_data.ttl
+    assert "Warning" not in first.headers
+    assert stale_served["upstream_error"] == 1
+
+
+def test_drink_route_fails_once_stale_copy_is_too_old(client, stub, monkeypatch):
+    """Test that a failed refetch is an error for drinks past DRINK_STALE_IF_ERROR."""
+    monkeypatch.setattr(drink_model, "DRINK_STALE_WHILE_REVALIDATE", 0)
+    monkeypatch.setattr(drink_model, "DRINK_STALE_IF_ERROR", 3600)
+    client.get("/drink/Margarita")
+    expire(Drink.fetch_by_name("Margarita"), 7200)
+    stub.error_rate = 1.0
+
+    response = client.get("/drink/Margarita")
+
+    assert response.status_code == 500
+
+
+def test_random_drink_falls_back_to_known_drinks(client, stub):
+    """Test that /random-drink serves a locally known drink when the upstream fails."""
+    stub.error_rate = 1.0
+    assert client.get("/random-drink").status_code == 500
+
+    stub.error_rate = 0.0
+    client.get("/drink/Margarita")
+    stub.error_rate = 1.0
+    response = client.get("/random-drink")
+
+    assert response.status_code == 200
+    assert response.get_json()["drink"]["name"] == "Margarita"
+    assert stale_served["random_fallback"] == 1
+
+
+def test_drink_deleted_upstream_is_not_served_stale(client, stub, monkeypatch):
+    """Test that a drink the upstream reports as not found loses its stale copy and its name index entry."""
+    monkeypatch.setattr(drink_model, "DRINK_STALE_WHILE_REVALIDATE", 0)
+    expire(Drink.fetch_by_name("Margarita"), 60)
+    stub.remove("Margarita")
+    assert client.get("/drink/Margarita").status_code == 404
+
+    in_memory_data.delete("margarita")  # the negative entry expires
+    stub.error_rate = 1.0
+
+    assert client.get("/drink/Margarita").status_code == 500
+    assert "Margarita" not in drink_model.name_index
+
+
+def test_old_mirror_rows_are_served_without_upstream_calls(app, stub):
+    """Test that a drink from the catalog mirror is never stale, however long ago its row was ingested."""
+    CatalogDrink.ingest(load_catalog_dump(FIXTURE_DUMP))
+    ingested_at = time.time() - 2 * 86400
+    db.session.query(CatalogDrink).update({"fetched_at": ingested_at})
+    db.session.commit()
+
+    drink = Drink.fetch_by_name("Mojito")
+    in_memory_data.clear()
+    again = Drink.fetch_by_name("Mojito")
+    revalidator.wait()
+
+    assert drink.fetched_at == again.fetched_at == ingested_at
+    assert again.stale_age() is None
+    assert stub.stats() == {}
+    assert stale_served["revalidating"] == 0
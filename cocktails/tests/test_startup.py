@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from cocktail_maker.utils.lazy import LazyModule
+
+
+def test_lazy_module_forwards_to_the_real_module():
+    """Test that a LazyModule imports its module on first use and sees later patches."""
+    json_module = LazyModule("json")
+    assert json_module.dumps([1]) == "[1]"
+
+    import json
+    original, json.dumps = json.dumps, lambda value: "patched"
+    try:
+        assert json_module.dumps([1]) == "patched"
+    finally:
+        json.dumps = original
+
+
+def test_app_import_leaves_heavy_modules_unloaded():
+    """Test that importing the app does not import the HTTP client stack, numpy or scipy, nor start threads."""
+    probe = ("import sys, threading, app; "
+             "print(sorted(m for m in ('requests', 'numpy', 'scipy', 'aiohttp') if m in sys.modules)); "
+             "print(threading.active_count())")
+    output = subprocess.run([sys.executable, "-c", probe], cwd=Path(__file__).parent.parent,
+                            capture_output=True, text=True, check=True).stdout.split("\n")
+
+    assert output[:2] == ["[]", "1"]
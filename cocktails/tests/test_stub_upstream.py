@@ -0,0 +1,47 @@
+import pytest
+import requests
+
+from benchmarks.stub_upstream import build_catalog, load_recorded
+from cocktail_maker.models.drink_model import Drink
+from cocktail_maker.utils import http_client
+
+
+def test_search_serves_recorded_drinks(stub):
+    """Test that drink lookups are answered from the recorded responses."""
+    drink = Drink.get_drink_by_name("margarita")
+
+    assert drink["name"] == "Margarita"
+    assert drink["ingredients"][:3] == ["Tequila", "Triple sec", "Lime juice"]
+    assert stub.stats() == {"search.php": 1}
+
+
+def test_unknown_names_are_not_found(stub):
+    """Test that names outside the catalog are answered like the real API."""
+    with pytest.raises(ValueError, match="not found"):
+        Drink.get_drink_by_name("Not A Drink")
+
+
+def test_filter_lists_follow_the_catalog(stub):
+    """Test that the alcoholic filter lists are derived from the recorded drinks."""
+    names = {d["strDrink"] for d in http_client.get("filter.php", params={"a": "Non_Alcoholic"}).json()["drinks"]}
+
+    assert names == {d["strDrink"] for d in load_recorded() if d["strAlcoholic"] == "Non alcoholic"}
+
+
+def test_error_rate_fails_requests(stub):
+    """Test that the configured error rate makes upstream calls fail after retries."""
+    stub.error_rate = 1.0
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        http_client.get("random.php")
+
+    assert stub.stats()["errors"] == http_client.MAX_RETRIES + 1
+
+
+def test_build_catalog_pads_recorded_drinks():
+    """Test that generated variants pad the catalog to the requested size."""
+    catalog = build_catalog(50, seed=1)
+
+    assert len(catalog) == 50
+    assert len({d["idDrink"] for d in catalog}) == 50
+    assert catalog == build_catalog(50, seed=1)
@@ -1,4 +1,9 @@
+import json
+
 import pytest
+from sqlalchemy import event
+
+from cocktail_maker.db import db
 from cocktail_maker.models.user_model import Users
 
 @pytest.fixture
@@ -25,7 +30,7 @@ def test_create_account_success(client, session, sample_user):
     user = session.query(Users).filter_by(username=sample_user["username"]).first()
     assert user is not None
     assert len(user.salt) == 32  # Salt should be 32 characters
-    assert len(user.password) == 64  # Password hash should be 64 characters
+    assert user.password.startswith("scrypt$")  # Self-describing KDF hash
 
 
 def test_create_account_duplicate_user(client, session, sample_user):
@@ -137,3 +142,215 @@ def test_update_password_missing_fields(client):
     assert response.status_code == 400
     json_data = response.get_json()
     assert json_data["error"] == "Username and new password are required"
+
+
+##########################################################
+# Credentials Cache
+##########################################################
+
+@pytest.fixture
+def statements(app):
+    """Count the SQL statements executed while the test runs."""
+    executed = []
+
+    def listener(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    yield executed
+    event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def test_login_uses_cached_credentials(client, session, sample_user, statements):
+    """Test that repeated logins select only the credential columns, once."""
+    client.post("/create-account", json=sample_user)
+    statements.clear()
+
+    for _ in range(3):
+        assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    assert Users.get_id_by_username(sample_user["username"]) == 1
+
+    assert len(statements) == 1
+    assert statements[0].startswith("SELECT users.id, users.salt, users.password")
+
+
+def test_update_password_invalidates_cache(client, session, sample_user, statements):
+    """Test that a password update is a single UPDATE and is seen by the next login."""
+    client.post("/create-account", json=sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    statements.clear()
+
+    Users.update_password(sample_user["username"], "newsecurepassword123")
+
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+    assert Users.check_password(sample_user["username"], "newsecurepassword123") is True
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is False
+
+
+def test_login_rechecks_stale_cached_hash(client, session, sample_user):
+    """Test that a password changed behind the cache's back is accepted straight away."""
+    client.post("/create-account", json=sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+
+    # Another worker changes the password; this worker's cache still holds the old hash
+    salt, hashed_password = Users._generate_hashed_password("changedelsewhere")
+    session.query(Users).filter_by(username=sample_user["username"]).update(
+        {"salt": salt, "password": hashed_password})
+    session.commit()
+
+    assert Users.check_password(sample_user["username"], "changedelsewhere") is True
+    assert Users.check_password(sample_user["username"], "wrongpassword") is False
+
+
+def test_unknown_user_is_negatively_cached(client, session, sample_user, statements):
+    """Test that unknown usernames are cached and that creating the user clears the entry."""
+    for _ in range(2):
+        with pytest.raises(ValueError, match="User testuser not found"):
+            Users.get_id_by_username(sample_user["username"])
+    assert len(statements) == 1
+
+    Users.create_user(sample_user["username"], sample_user["password"])
+    assert Users.get_id_by_username(sample_user["username"]) == 1
+
+
+def test_delete_user_invalidates_cache(client, session, sample_user):
+    """Test that a deleted user is no longer found through the cache."""
+    client.post("/create-account", json=sample_user)
+    assert Users.get_id_by_username(sample_user["username"]) == 1
+
+    Users.delete_user(sample_user["username"])
+
+    with pytest.raises(ValueError, match="User testuser not found"):
+        Users.get_id_by_username(sample_user["username"])
+
+
+##########################################################
+# Bulk Import / Export
+##########################################################
+
+BULK_AUTH = {"Authorization": "Bearer test-bulk-token"}
+
+
+def test_bulk_import_ndjson_reports_failed_rows(client, session, sample_user):
+    """Test that a bulk import creates every valid user and reports duplicates and bad rows."""
+    client.post("/create-account", json=sample_user)
+    lines = [
+        {"username": "alice", "password": "alicepassword"},
+        {"username": "testuser", "password": "taken"},
+        {"username": "bob", "password": "bobpassword"},
+        {"username": "alice", "password": "again"},
+        {"username": "carol"},
+        {"username": "dave", "password": "davepassword"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+
+    response = client.post("/users/bulk", data=body, content_type="application/x-ndjson", headers=BULK_AUTH)
+
+    assert response.status_code == 200
+    json_data = response.get_json()
+    assert json_data["created"] == 3
+    assert [(failure["row"], failure["username"]) for failure in json_data["failed"]] == [
+        (2, "testuser"), (4, "alice"), (5, "carol"), (7, None)]
+    assert json_data["failed"][0]["error"] == "User with username 'testuser' already exists"
+    assert Users.check_password("alice", "alicepassword") is True
+    assert Users.check_password("dave", "davepassword") is True
+
+
+def test_bulk_import_rejects_unusable_password_hashes(client, session):
+    """Test that imported hashes must be well formed and within the KDF cost bounds."""
+    salt = "00112233445566778899aabbccddeeff"
+    lines = [
+        {"username": "alice", "salt": salt, "password_hash": "foo"},
+        {"username": "bob", "salt": salt, "password_hash": "scrypt$garbage$x"},
+        {"username": "carol", "salt": salt, "password_hash": "scrypt$n=1073741824,r=8,p=1$" + "0" * 64},
+        {"username": "dave", "salt": salt, "password_hash": "pbkdf2_sha256$i=10000000000$" + "0" * 64},
+        {"username": "erin", "salt": salt, "password_hash": "pbkdf2_sha256$i=1000$" + "0" * 64},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    response = client.post("/users/bulk", data=body, content_type="application/x-ndjson", headers=BULK_AUTH)
+
+    json_data = response.get_json()
+    assert json_data["created"] == 1
+    assert [(failure["row"], failure["error"]) for failure in json_data["failed"]] == [
+        (1, "Invalid password_hash: Malformed password hash"),
+        (2, "Invalid password_hash: Malformed password hash"),
+        (3, "Invalid password_hash: Password hash cost is out of bounds"),
+        (4, "Invalid password_hash: Password hash cost is out of bounds"),
+    ]
+
+
+def test_bulk_import_rejects_non_string_passwords(client, session):
+    """Test that a password that is not a string fails its own row instead of the whole import."""
+    lines = [
+        {"username": "alice", "password": "alicepassword"},
+        {"username": "bob", "password": 123},
+        {"username": "carol", "password": "x" * 1025},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    response = client.post("/users/bulk", data=body, content_type="application/x-ndjson", headers=BULK_AUTH)
+
+    assert response.status_code == 200
+    json_data = response.get_json()
+    assert json_data["created"] == 1
+    assert [(failure["row"], failure["error"]) for failure in json_data["failed"]] == [
+        (2, "A password must be a string of at most 1024 characters"),
+        (3, "A password must be a string of at most 1024 characters"),
+    ]
+    assert Users.check_password("alice", "alicepassword") is True
+
+
+def test_bulk_import_csv(client, session):
+    """Test importing users from CSV."""
+    body = "username,password\nalice,alicepassword\nbob,bobpassword\n"
+
+    response = client.post("/users/bulk", data=body, content_type="text/csv", headers=BULK_AUTH)
+
+    assert response.get_json()["created"] == 2
+    assert Users.check_password("bob", "bobpassword") is True
+
+
+def test_bulk_endpoints_require_token(client):
+    """Test that the bulk endpoints reject requests without the configured token."""
+    assert client.get("/users/bulk").status_code == 401
+    response = client.post("/users/bulk", data="", content_type="text/csv",
+                           headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+
+
+def test_bulk_export_round_trip(client, session, sample_user):
+    """Test that an export re-imports with the same password hashes, in both formats."""
+    client.post("/create-account", json=sample_user)
+    client.post("/create-account", json={"username": "alice", "password": "alicepassword"})
+
+    for fmt, content_type in (("ndjson", "application/x-ndjson"), ("csv", "text/csv")):
+        exported = client.get(f"/users/bulk?format={fmt}", headers=BULK_AUTH)
+        assert exported.mimetype == content_type
+        body = exported.get_data(as_text=True)
+
+        session.query(Users).delete()
+        session.commit()
+        response = client.post("/users/bulk", data=body, content_type=content_type, headers=BULK_AUTH)
+
+        assert response.get_json()["created"] == 2
+        assert Users.check_password("alice", "alicepassword") is True
+        assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+
+
+def test_import_export_cli(app, session, tmp_path):
+    """Test the import-users and export-users commands."""
+    source = tmp_path / "users.csv"
+    source.write_text("username,password\nalice,alicepassword\nalice,again\n")
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["import-users", str(source)])
+    assert result.exit_code == 1
+    assert "Created 1 users, 1 rows failed." in result.output
+
+    export = tmp_path / "users.ndjson"
+    result = runner.invoke(args=["export-users", "--output", str(export)])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in export.read_text().splitlines()]
+    assert [record["username"] for record in records] == ["alice"]
+    assert set(records[0]) == {"username", "salt", "password_hash"}
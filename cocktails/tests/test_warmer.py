@@ -0,0 +1,172 @@
+from pathlib import Path
+
+import pytest
+
+from cocktail_maker.models.catalog_model import load_catalog_dump
+from cocktail_maker.models.drink_model import Drink, popular_drinks, random_pool
+from cocktail_maker.utils.cache import TTLCache
+from cocktail_maker.utils.popularity import CountMinSketch, PopularityTracker
+from cocktail_maker.utils.rate_limit import TokenBucket
+from cocktail_maker.utils.warmer import CacheWarmer, DrinkPool, Revalidator
+
+FIXTURE_DUMP = Path(__file__).parent / "fixtures" / "catalog_dump.json"
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_bursts_then_refills():
+    """Test that the bucket allows a burst of its capacity, then refills at its rate."""
+    timer = FakeTimer()
+    bucket = TokenBucket(rate=2, capacity=3, timer=timer)
+
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    timer.now = 0.5
+    assert bucket.try_acquire()
+    timer.now = 100
+    assert bucket.stats()["tokens"] == 3
+    assert (bucket.granted, bucket.refused) == (4, 1)
+
+
+def test_popularity_tracks_the_top_keys():
+    """Test that the sketch never undercounts and that the top keys survive eviction and decay."""
+    sketch = CountMinSketch(width=16, depth=2)
+    counts = {f"drink {i}": i % 7 + 1 for i in range(50)}
+    for key, count in counts.items():
+        for _ in range(count):
+            sketch.add(key)
+    assert all(sketch.estimate(key) >= count for key, count in counts.items())
+
+    tracker = PopularityTracker(capacity=3)
+    for key, count in [("a", 1), ("b", 1), ("c", 1), ("mojito", 6), ("margarita", 4)]:
+        for _ in range(count):
+            tracker.record(key)
+    assert tracker.top(2) == [("mojito", 6), ("margarita", 4)]
+
+    tracker.decay()
+    assert tracker.top(3) == [("mojito", 3), ("margarita", 2)]
+
+
+def test_pool_hands_out_each_item_once():
+    """Test that the pool is bounded and that taking from it asks for a refill."""
+    pool = DrinkPool(size=2)
+    assert [pool.put(item) for item in "abc"] == [True, True, False]
+
+    assert pool.pop() == "a"
+    assert pool.refill_needed.is_set()
+    assert pool.missing() == 1
+    assert [pool.pop(), pool.pop()] == ["b", None]
+    assert pool.stats() == {"size": 0, "target": 2, "hits": 2, "misses": 1}
+
+
+def test_warmer_fills_the_pool_and_refreshes_expiring_names():
+    """Test one warming cycle: the pool fills within budget, and only popular names about to expire are refetched."""
+    timer = FakeTimer()
+    cache = TTLCache(ttl=600, timer=timer)
+    cache.set("mojito", "cached")
+    timer.now = 400
+    cache.set("margarita", "cached")
+    popular = PopularityTracker()
+    for name in ["mojito", "mojito", "margarita", "negroni"]:
+        popular.record(name)
+    refreshed = []
+    warmer = CacheWarmer(
+        pool=DrinkPool(size=5),
+        fetch_random=iter(range(100)).__next__,
+        popular=popular,
+        refresh=refreshed.append,
+        expires_in=cache.expires_in,
+        budget=TokenBucket(rate=0.1, capacity=7, timer=timer),
+        refresh_ahead=300,
+    )
+
+    warmer.run_once()
+
+    # mojito expires in 200s, negroni is not cached and margarita has 600s left
+    assert refreshed == ["mojito", "negroni"]
+    assert len(warmer.pool) == 5
+    assert popular.top(3) == [("mojito", 1)]
+
+    # The budget is spent, so a drained pool waits for it to refill
+    warmer.pool.pop()
+    assert warmer.fill_pool() == 0
+    assert warmer.stats()["budget_exhausted"] == 1
+    timer.now += 10
+    assert warmer.fill_pool() == 1
+
+
+def test_warmer_skips_names_cached_as_not_found():
+    """Test that a popular name cached as not found is not refetched until its negative entry expires."""
+    timer = FakeTimer()
+    cache = TTLCache(ttl=600, negative_ttl=300, timer=timer)
+    cache.set_negative("unknown drink")
+    popular = PopularityTracker()
+    popular.record("unknown drink")
+    refreshed = []
+    warmer = CacheWarmer(
+        pool=DrinkPool(size=0),
+        fetch_random=iter(range(100)).__next__,
+        popular=popular,
+        refresh=refreshed.append,
+        expires_in=cache.expires_in,
+        is_negative=cache.is_negative,
+        budget=TokenBucket(rate=1, capacity=10, timer=timer),
+    )
+
+    assert warmer.refresh_popular() == 0
+    timer.now = 301
+    popular.record("unknown drink")
+    assert warmer.refresh_popular() == 1
+    assert refreshed == ["unknown drink"]
+
+
+def test_only_names_that_resolve_count_as_popular(stub):
+    """Test that names the upstream does not know are not tracked as popular."""
+    Drink.fetch_by_name("Margarita")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            Drink.fetch_by_name("No Such Drink")
+
+    assert popular_drinks.top(5) == [("margarita", 1)]
+
+
+def test_random_drink_is_served_from_the_pool(client, mocker):
+    """Test that /random-drink hands out a pooled drink without calling the upstream."""
+    upstream = mocker.patch("cocktail_maker.models.drink_model.fetch_random_drink_data",
+                            side_effect=RuntimeError("upstream down"))
+    random_pool.put(Drink.from_api(load_catalog_dump(FIXTURE_DUMP)[0]))
+
+    response = client.get('/random-drink')
+
+    assert response.status_code == 200
+    assert response.get_json()['drink']['name'] == 'Margarita'
+    upstream.assert_not_called()
+
+
+def test_revalidator_backs_off_after_a_failure():
+    """Test that a failed refresh is retried only after retry_after, and a success clears the backoff."""
+    timer = FakeTimer()
+    outcomes = [RuntimeError("API down"), None]
+
+    def refresh(name):
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    revalidator = Revalidator(refresh, retry_after=30, timer=timer)
+
+    assert revalidator.schedule("Margarita")
+    revalidator.wait()
+    assert not revalidator.schedule("margarita ")
+    timer.now = 31
+    assert revalidator.schedule("Margarita")
+    revalidator.wait()
+
+    assert revalidator.stats() == {"in_progress": 0, "scheduled": 2, "refreshed": 1, "failures": 1, "backing_off": 0}